@@ -0,0 +1,263 @@
+"""
+QuizCreatorのクイズ生成を、外部サービスを使わずに計測するベンチマーク
+
+ドキュメントの文字数と問題数の組み合わせごとにcreate_quizを実行し、
+各段階の処理時間とメモリの最大使用量を表示する。
+
+    cd backend && python -m benchmarks.bench_quiz_creator --sizes 2000 50000
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List
+
+
+# 設定は読み込み時に環境変数から決まるため、アプリのモジュールより先に設定する
+# キャッシュは同じ入力の2回目以降を計測できなくするため、既定では無効にする
+for _name, _value in {
+    "OPENAI_API_KEY": "benchmark",
+    "GPT_MODEL": "benchmark",
+    "TEXT_EMBEDDINGS_MODEL": "benchmark",
+    "LANGCHAIN_TRACING_V2": "false",
+    "PROMPT_FALLBACK_PATH": "",
+    "QUIZ_CACHE_ENABLED": "false",
+    "PAGE_CACHE_ENABLED": "false",
+    "EMBEDDING_CACHE_ENABLED": "false",
+    "INDEX_STORE_ENABLED": "false",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from pydantic import BaseModel, Field  # noqa: E402
+
+from src.api.models.quiz import (  # noqa: E402
+    Difficulty,
+    GenerationStrategy,
+    QuizType,
+)
+from src.application.service.prompt_cache import get_system_prompt_cache  # noqa: E402
+from src.application.usecase.quiz_creator import QuizCreator  # noqa: E402
+from src.infrastructure.llm.doc_loader import DocumentLoaderImpl  # noqa: E402
+from src.infrastructure.llm.usage_tracker import track_usage  # noqa: E402
+from src.infrastructure.monitoring.metrics import QUIZ_STAGE_DURATION  # noqa: E402
+
+from benchmarks.fakes import (  # noqa: E402
+    LOCAL_PROMPT,
+    FakeChatModel,
+    FakeEmbeddings,
+    FakePageLoader,
+    generate_document,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkQuizCreator(QuizCreator):
+    """URLの読み込みをFakePageLoaderに置き換えたQuizCreator"""
+
+    document_size: int = Field(default=10_000, description="読み込む文章の文字数")
+    loader_latency_seconds: float = Field(default=0.0, description="読み込みの待ち時間")
+
+    def _create_document_loader(self, url: str) -> DocumentLoaderImpl:
+        return DocumentLoaderImpl(
+            document_loader=FakePageLoader(
+                url, self.document_size, self.loader_latency_seconds
+            )
+        )
+
+
+class CaseResult(BaseModel):
+    """1つの組み合わせの計測結果"""
+
+    source: str
+    document_size: int
+    question_count: int
+    strategy: str
+    runs: int
+    total_ms: float = Field(..., description="1回あたりの処理時間の中央値")
+    stage_ms: Dict[str, float] = Field(..., description="段階ごとの平均処理時間")
+    llm_calls: int = Field(..., description="1回あたりのLLMの呼び出し回数")
+    peak_memory_mb: float = Field(..., description="1回の実行で確保したメモリの最大値")
+
+
+def _stage_totals() -> Dict[str, float]:
+    """これまでに記録された段階ごとの処理時間の合計（秒）"""
+    totals: Dict[str, float] = defaultdict(float)
+    for (stage, _, _), (total, _) in QUIZ_STAGE_DURATION.snapshot().items():
+        totals[stage] += total
+    return totals
+
+
+def run_case(
+    creator: BenchmarkQuizCreator,
+    source: QuizType,
+    question_count: int,
+    strategy: GenerationStrategy,
+    runs: int,
+    warmup: int,
+) -> CaseResult:
+    """1つの組み合わせを繰り返し実行し、処理時間とメモリ使用量を集計する"""
+    if source == QuizType.URL:
+        content = f"https://example.com/{creator.document_size}"
+    else:
+        content = generate_document(creator.document_size)
+
+    def create_quiz() -> None:
+        creator.create_quiz(
+            source, content, question_count, Difficulty.INTERMEDIATE, strategy
+        )
+
+    for _ in range(warmup):
+        create_quiz()
+
+    before = _stage_totals()
+    durations: List[float] = []
+    llm_calls = 0
+    for _ in range(runs):
+        with track_usage() as usage:
+            started = time.perf_counter()
+            create_quiz()
+            durations.append(time.perf_counter() - started)
+        llm_calls = usage.report().llm_calls
+    after = _stage_totals()
+
+    # メモリの計測は処理時間に影響するため、計測用に別途1回だけ実行する
+    tracemalloc.start()
+    try:
+        create_quiz()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return CaseResult(
+        source=source.value,
+        document_size=creator.document_size,
+        question_count=question_count,
+        strategy=strategy.value,
+        runs=runs,
+        total_ms=statistics.median(durations) * 1000,
+        stage_ms={
+            stage: (after[stage] - before.get(stage, 0.0)) / runs * 1000
+            for stage in after
+            if stage != "total" and after[stage] > before.get(stage, 0.0)
+        },
+        llm_calls=llm_calls,
+        peak_memory_mb=peak / 1024 / 1024,
+    )
+
+
+def use_local_prompt() -> None:
+    """LangSmithのhubではなく、ローカルのプロンプトを使うよう設定する"""
+    prompt_cache = get_system_prompt_cache()
+    prompt_cache.loader = lambda: LOCAL_PROMPT
+    prompt_cache.refresh()
+
+
+def print_results(results: List[CaseResult]) -> None:
+    stages = sorted({stage for result in results for stage in result.stage_ms})
+    header = ["source", "size", "q", "total_ms", "llm", "peak_mb"] + stages
+    rows = [
+        [
+            result.source,
+            str(result.document_size),
+            str(result.question_count),
+            f"{result.total_ms:.1f}",
+            str(result.llm_calls),
+            f"{result.peak_memory_mb:.1f}",
+        ]
+        + [f"{result.stage_ms.get(stage, 0.0):.1f}" for stage in stages]
+        for result in results
+    ]
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[2_000, 20_000, 200_000],
+        help="ドキュメントの文字数",
+    )
+    parser.add_argument(
+        "--question-counts",
+        type=int,
+        nargs="+",
+        default=[3, 5, 10],
+        help="生成する問題数（3〜10）",
+    )
+    parser.add_argument(
+        "--source",
+        choices=[quiz_type.value for quiz_type in QuizType],
+        default=QuizType.URL.value,
+        help="入力の種類。urlの場合はFakePageLoaderから読み込む",
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=[strategy.value for strategy in GenerationStrategy],
+        default=GenerationStrategy.SUPERVISOR.value,
+        help="クイズの生成方式",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="計測する回数")
+    parser.add_argument("--warmup", type=int, default=1, help="計測前に実行する回数")
+    parser.add_argument(
+        "--llm-latency-ms", type=float, default=0.0, help="LLMの1回の呼び出しの待ち時間"
+    )
+    parser.add_argument(
+        "--embedding-latency-ms",
+        type=float,
+        default=0.0,
+        help="埋め込みの1回の問い合わせの待ち時間",
+    )
+    parser.add_argument(
+        "--loader-latency-ms", type=float, default=0.0, help="ページの読み込みの待ち時間"
+    )
+    parser.add_argument("--json", help="結果をJSONで書き出すファイルのパス")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    use_local_prompt()
+
+    llm = FakeChatModel(latency_seconds=args.llm_latency_ms / 1000)
+    embeddings = FakeEmbeddings(latency_seconds=args.embedding_latency_ms / 1000)
+    results = []
+    for size in args.sizes:
+        creator = BenchmarkQuizCreator(
+            llm=llm,
+            embeddings=embeddings,
+            document_size=size,
+            loader_latency_seconds=args.loader_latency_ms / 1000,
+        )
+        for question_count in args.question_counts:
+            logger.warning(f"Running size={size} question_count={question_count}")
+            results.append(
+                run_case(
+                    creator,
+                    QuizType(args.source),
+                    question_count,
+                    GenerationStrategy(args.strategy),
+                    args.runs,
+                    args.warmup,
+                )
+            )
+
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([result.model_dump() for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+ベンチマーク用に、OpenAI・FireCrawl・LangSmithの代わりに使うローカルの部品
+
+どれも入力だけで結果が決まり、外部への通信を行わない。
+外部サービスの応答時間は、指定した秒数だけ待つことで再現する。
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from src.domain.entities.question import Question, QuizOption
+from src.infrastructure.llm.hashing_embeddings import HashingEmbeddings
+from src.infrastructure.llm.token_counter import estimate_tokens
+
+
+# hubのプロンプトと同じ変数を持つ、ベンチマーク用のプロンプト
+LOCAL_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "Create a multiple choice quiz from the context.\n"
+            "question_count={question_count}\n"
+            "difficulty={difficulty}\n\n"
+            "{context}",
+        ),
+        ("human", "{input}"),
+    ]
+)
+
+_WORDS = (
+    "読書",
+    "記憶",
+    "学習",
+    "理解",
+    "要約",
+    "知識",
+    "文章",
+    "著者",
+    "概念",
+    "reading",
+    "memory",
+    "context",
+    "retrieval",
+    "summary",
+    "chapter",
+    "argument",
+)
+
+# 問題文が呼び出しごとに重複しないよう、プロセス内で通し番号を振る
+_question_ids = itertools.count()
+
+
+def generate_document(size: int, seed: int = 0) -> str:
+    """指定した文字数の、日本語と英語が混ざった段落からなる文章を生成する"""
+    rng = random.Random(seed)
+    paragraphs: List[str] = []
+    length = 0
+    while length < size:
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = rng.choices(_WORDS, k=rng.randint(6, 16))
+            sentences.append(" ".join(words) + "。")
+        paragraph = "".join(sentences)
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:size]
+
+
+def build_questions(count: int, seed: str = "") -> List[Question]:
+    """検証を通過する、重複のない問題を生成する"""
+    questions = []
+    for index in range(count):
+        question_id = next(_question_ids)
+        questions.append(
+            Question(
+                question=f"Question {question_id} {seed} #{index + 1}",
+                options=QuizOption(
+                    A=f"Option A{question_id}",
+                    B=f"Option B{question_id}",
+                    C=f"Option C{question_id}",
+                    D=f"Option D{question_id}",
+                ),
+                answer="A",
+                explanation=f"A is correct for question {question_id}.",
+            )
+        )
+    return questions
+
+
+def _message_text(messages: Sequence[BaseMessage]) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+def _find_int(pattern: str, text: str, default: int) -> int:
+    match = re.search(pattern, text)
+    return int(match.group(1)) if match else default
+
+
+def _tool_name(tool: Any) -> str | None:
+    if isinstance(tool, dict):
+        return tool.get("name") or (tool.get("function") or {}).get("name")
+    return getattr(tool, "name", None) or getattr(tool, "__name__", None)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    クイズの生成・評価・supervisorの指示を決まった手順で返すチャットモデル
+
+    構造化出力ではスキーマに合うJSONを、ツールが渡された場合は
+    supervisorとRAGエージェントの手順どおりのツール呼び出しを返す。
+    """
+
+    latency_seconds: float = Field(default=0.0, description="1回の呼び出しの待ち時間")
+    structured_schema: Optional[type] = Field(
+        default=None, description="構造化出力のスキーマ"
+    )
+    tool_names: Tuple[str, ...] = Field(default=(), description="渡されたツールの名前")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "FakeChatModel":
+        names = tuple(name for name in map(_tool_name, tools) if name)
+        return self.model_copy(update={"tool_names": names})
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable:
+        model = self.model_copy(update={"structured_schema": schema})
+        return model | RunnableLambda(
+            lambda message: schema.model_validate_json(message.content)
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+        return self._result(messages)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_seconds > 0:
+            await asyncio.sleep(self.latency_seconds)
+        return self._result(messages)
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        message = self._respond(messages)
+        prompt = _message_text(messages)
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(str(message.content)) + 1
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        if self.structured_schema is not None:
+            return AIMessage(content=self._structured_output(messages))
+        if "generate_quiz_tool" in self.tool_names:
+            return self._rag_agent_step(messages)
+        if any(name.startswith("transfer_to_") for name in self.tool_names):
+            return self._supervisor_step(messages)
+        return AIMessage(content="The quiz looks good.")
+
+    def _structured_output(self, messages: List[BaseMessage]) -> str:
+        fields = getattr(self.structured_schema, "model_fields", {})
+        if "questions" not in fields:
+            # 評価結果など、既定値で問題のないスキーマ
+            return self.structured_schema().model_dump_json()
+
+        text = _message_text(messages)
+        count = _find_int(r"question_count=(\d+)", text, 5)
+        questions = build_questions(count, seed=f"{len(text)}")
+        return self.structured_schema(questions=questions).model_dump_json()
+
+    @staticmethod
+    def _rag_agent_step(messages: List[BaseMessage]) -> AIMessage:
+        last = messages[-1]
+        if isinstance(last, ToolMessage) and last.name == "generate_quiz_tool":
+            return AIMessage(content=str(last.content))
+
+        text = _message_text(messages)
+        args = {
+            "question_count": _find_int(r"Generate (\d+) quiz", text, 5),
+            "difficulty": "beginner",
+        }
+        return _tool_call("generate_quiz_tool", args)
+
+    @staticmethod
+    def _supervisor_step(messages: List[BaseMessage]) -> AIMessage:
+        names = [getattr(message, "name", None) for message in messages]
+        if "evaluate_agent" in names:
+            # RAGエージェントが返したクイズを、そのまま最終出力とする
+            quiz = next(
+                quiz
+                for quiz in map(_parse_quiz, reversed(messages))
+                if quiz is not None
+            )
+            return AIMessage(content=json.dumps({"quiz": quiz}))
+        if "rag_quiz_agent" in names:
+            return _tool_call("transfer_to_evaluate_agent")
+        return _tool_call("transfer_to_rag_quiz_agent")
+
+
+def _parse_quiz(message: BaseMessage) -> dict | None:
+    try:
+        data = json.loads(str(message.content))
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) and "questions" in data else None
+
+
+def _tool_call(name: str, args: dict | None = None) -> AIMessage:
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": name, "args": args or {}, "id": uuid.uuid4().hex}],
+    )
+
+
+class FakeEmbeddings(BaseModel, Embeddings):
+    """
+    ローカルのハッシュベクトルを、外部APIと同じ待ち時間を挟んで返す埋め込みモデル
+
+    ローカルの埋め込みとして扱われないため、本番と同じくスケジューラーを経由する。
+    """
+
+    latency_seconds: float = Field(default=0.0, description="1回の問い合わせの待ち時間")
+    embeddings: HashingEmbeddings = Field(default_factory=HashingEmbeddings)
+
+    model_config = ConfigDict(frozen=True)
+
+    @property
+    def model(self) -> str:
+        return f"fake-{self.embeddings.model}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds > 0:
+            await asyncio.sleep(self.latency_seconds)
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+class FakePageLoader(BaseLoader):
+    """URLのスクレイピングの代わりに、生成した文章を1ページとして返すローダー"""
+
+    def __init__(self, url: str, size: int, latency_seconds: float = 0.0):
+        self.url = url
+        self.size = size
+        self.latency_seconds = latency_seconds
+
+    def lazy_load(self) -> Iterator[Document]:
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+        yield self._document()
+
+    async def aload(self) -> List[Document]:
+        if self.latency_seconds > 0:
+            await asyncio.sleep(self.latency_seconds)
+        return [self._document()]
+
+    def _document(self) -> Document:
+        return Document(
+            page_content=generate_document(self.size),
+            metadata={"url": self.url},
+        )
@@ -19,6 +19,25 @@ class AppSettings(BaseModel):
     # LangGraphを用いてクイズを生成するかどうか
     USE_LANGGRAPH: ClassVar[bool] = os.getenv("USE_LANGGRAPH", "false") == "true"
 
+    # クイズの生成方式（chain / validated_chain / parallel / supervisor）。リクエストごとに上書きできる
+    GENERATION_STRATEGY: ClassVar[str] = os.getenv(
+        "GENERATION_STRATEGY", "supervisor" if USE_LANGGRAPH else "validated_chain"
+    )
+    # validated_chainで検証に失敗した問題を生成し直す回数の上限
+    VALIDATION_MAX_RETRIES: ClassVar[int] = int(os.getenv("VALIDATION_MAX_RETRIES", 2))
+    # parallelで同時に実行する問題生成の呼び出しの上限
+    PARALLEL_MAX_CONCURRENCY: ClassVar[int] = int(
+        os.getenv("PARALLEL_MAX_CONCURRENCY", 4)
+    )
+
+    # 同期処理（GCS、テキスト分割など）を実行するスレッドプールの上限
+    BLOCKING_WORKERS: ClassVar[int] = int(os.getenv("BLOCKING_WORKERS", 8))
+
+    # クイズ生成のレスポンスに、LLMの呼び出し回数とトークン数のヘッダーを付けるかどうか
+    USAGE_HEADER_ENABLED: ClassVar[bool] = (
+        os.getenv("USAGE_HEADER_ENABLED", "true" if ENV == "dev" else "false") == "true"
+    )
+
 
 # TODO: APIのバリデーションはあったほうがいい
 class LLMSettings(BaseModel):
@@ -38,6 +57,11 @@ class ModelSettings(BaseModel):
 
     GPT_MODEL: ClassVar[str] = os.getenv("GPT_MODEL")
     TEXT_EMBEDDINGS_MODEL: ClassVar[str] = os.getenv("TEXT_EMBEDDINGS_MODEL")
+    # 埋め込みモデルの提供元（openai: OpenAIのAPI、local: CPUで計算するハッシュベクトル）
+    EMBEDDINGS_PROVIDER: ClassVar[str] = os.getenv("EMBEDDINGS_PROVIDER", "openai")
+    LOCAL_EMBEDDINGS_SIZE: ClassVar[int] = int(
+        os.getenv("LOCAL_EMBEDDINGS_SIZE", 1024)
+    )
 
 
 class LangChainSettings(BaseModel):
@@ -47,6 +71,15 @@ class LangChainSettings(BaseModel):
     LANGCHAIN_TRACING_V2: ClassVar[str] = os.getenv("LANGCHAIN_TRACING_V2")
     LANGCHAIN_PROJECT: ClassVar[str] = os.getenv("LANGCHAIN_PROJECT")
 
+    # hubから取得したプロンプトを再取得するまでの秒数
+    PROMPT_CACHE_TTL_SECONDS: ClassVar[int] = int(
+        os.getenv("PROMPT_CACHE_TTL_SECONDS", 60 * 60)
+    )
+    # hubに接続できない場合に使うプロンプトのコピー
+    PROMPT_FALLBACK_PATH: ClassVar[str] = os.getenv(
+        "PROMPT_FALLBACK_PATH", "assets/tmp/cache/system_prompt.json"
+    )
+
 
 class EmbeddingsSettings(BaseModel):
     model_config = ConfigDict(frozen=True)
@@ -54,13 +87,165 @@ class EmbeddingsSettings(BaseModel):
     TMP_VECTORDB_PATH: ClassVar[str] = os.getenv("TMP_VECTORDB_PATH")
     VECTORDB_PROVIDER: ClassVar[str] = os.getenv("VECTORDB_PROVIDER")
     SEARCH_KWARGS: ClassVar[int] = int(os.getenv("SEARCH_KWARGS", 8))
+    # 検索結果としてプロンプトに含めるチャンクの合計トークン数の上限（0で無効）
+    CONTEXT_MAX_TOKENS: ClassVar[int] = int(os.getenv("CONTEXT_MAX_TOKENS", 4000))
+    # 合計トークン数がこの値以下のドキュメントは検索せず、全文をコンテキストとして使う（0で無効）
+    FULL_CONTEXT_MAX_TOKENS: ClassVar[int] = int(
+        os.getenv("FULL_CONTEXT_MAX_TOKENS", 4000)
+    )
+    # ベクトルストアをディスクに保存するかどうか（デフォルトはメモリ上のインデックスのみを使う）
+    PERSIST_VECTORDB: ClassVar[bool] = os.getenv("PERSIST_VECTORDB", "false") == "true"
+
+    # チャンクの埋め込みベクトルのキャッシュ
+    EMBEDDING_CACHE_ENABLED: ClassVar[bool] = (
+        os.getenv("EMBEDDING_CACHE_ENABLED", "true") == "true"
+    )
+    EMBEDDING_CACHE_PATH: ClassVar[str] = os.getenv(
+        "EMBEDDING_CACHE_PATH", "assets/tmp/cache/embeddings.sqlite3"
+    )
+    EMBEDDING_CACHE_MAX_BYTES: ClassVar[int] = int(
+        os.getenv("EMBEDDING_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+    )
+    # インデックスの作成時に1回で埋め込むチャンクの数
+    EMBEDDING_BATCH_SIZE: ClassVar[int] = int(os.getenv("EMBEDDING_BATCH_SIZE", 256))
+
+    # 複数のリクエストの埋め込みをまとめて問い合わせるスケジューラー
+    EMBEDDING_SCHEDULER_ENABLED: ClassVar[bool] = (
+        os.getenv("EMBEDDING_SCHEDULER_ENABLED", "true") == "true"
+    )
+    # 1回の問い合わせにまとめるチャンクの数とトークン数の上限
+    EMBEDDING_MAX_BATCH_SIZE: ClassVar[int] = int(
+        os.getenv("EMBEDDING_MAX_BATCH_SIZE", 512)
+    )
+    EMBEDDING_MAX_BATCH_TOKENS: ClassVar[int] = int(
+        os.getenv("EMBEDDING_MAX_BATCH_TOKENS", 100_000)
+    )
+    # 他のリクエストのチャンクをまとめるために待つミリ秒
+    EMBEDDING_BATCH_WAIT_MS: ClassVar[int] = int(
+        os.getenv("EMBEDDING_BATCH_WAIT_MS", 10)
+    )
+    EMBEDDING_MAX_CONCURRENCY: ClassVar[int] = int(
+        os.getenv("EMBEDDING_MAX_CONCURRENCY", 4)
+    )
+    # 1分あたりに埋め込むトークン数の上限（組織のレート制限に合わせる。0で無制限）
+    EMBEDDING_TOKENS_PER_MINUTE: ClassVar[int] = int(
+        os.getenv("EMBEDDING_TOKENS_PER_MINUTE", 1_000_000)
+    )
+    # レート制限（429）が返された場合の再試行回数
+    EMBEDDING_MAX_RETRIES: ClassVar[int] = int(os.getenv("EMBEDDING_MAX_RETRIES", 5))
+
+    # 作成したインデックスを入力の内容ごとに保持し、同じ入力では埋め込みを省略する
+    INDEX_STORE_ENABLED: ClassVar[bool] = (
+        os.getenv("INDEX_STORE_ENABLED", "true") == "true"
+    )
+    INDEX_STORE_PATH: ClassVar[str] = os.getenv(
+        "INDEX_STORE_PATH", "assets/tmp/cache/indexes"
+    )
+    INDEX_STORE_MAX_BYTES: ClassVar[int] = int(
+        os.getenv("INDEX_STORE_MAX_BYTES", 512 * 1024 * 1024)
+    )
+    # メモリに保持するインデックスの数の上限
+    INDEX_STORE_MEMORY_ENTRIES: ClassVar[int] = int(
+        os.getenv("INDEX_STORE_MEMORY_ENTRIES", 16)
+    )
+
+
+class QuizCacheSettings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    # 生成したクイズのキャッシュ（同じ入力に対して複数のクイズを保持する）
+    QUIZ_CACHE_ENABLED: ClassVar[bool] = (
+        os.getenv("QUIZ_CACHE_ENABLED", "false") == "true"
+    )
+    # 同じ入力に対して保持するクイズの数。揃うまでは新たに生成する
+    QUIZ_CACHE_VARIANTS: ClassVar[int] = int(os.getenv("QUIZ_CACHE_VARIANTS", 3))
+    QUIZ_CACHE_TTL_SECONDS: ClassVar[int] = int(
+        os.getenv("QUIZ_CACHE_TTL_SECONDS", 60 * 60 * 24)
+    )
+    # メモリに保持する入力の数の上限。QUIZ_CACHE_PATHが空の場合のみ使う
+    QUIZ_CACHE_MEMORY_ENTRIES: ClassVar[int] = int(
+        os.getenv("QUIZ_CACHE_MEMORY_ENTRIES", 256)
+    )
+    # ディスクの保存先。空の場合はメモリのみに保持する
+    QUIZ_CACHE_PATH: ClassVar[str] = os.getenv(
+        "QUIZ_CACHE_PATH", "assets/tmp/cache/quizzes.sqlite3"
+    )
+    QUIZ_CACHE_MAX_BYTES: ClassVar[int] = int(
+        os.getenv("QUIZ_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
+
+
+class PageCacheSettings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    # スクレイピングしたページのキャッシュ
+    PAGE_CACHE_ENABLED: ClassVar[bool] = (
+        os.getenv("PAGE_CACHE_ENABLED", "true") == "true"
+    )
+    # スクレイピングし直さずにページを使う秒数
+    PAGE_CACHE_TTL_SECONDS: ClassVar[int] = int(
+        os.getenv("PAGE_CACHE_TTL_SECONDS", 60 * 60)
+    )
+    PAGE_CACHE_PATH: ClassVar[str] = os.getenv(
+        "PAGE_CACHE_PATH", "assets/tmp/cache/pages.sqlite3"
+    )
+    PAGE_CACHE_MAX_BYTES: ClassVar[int] = int(
+        os.getenv("PAGE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
 
 
 class TextSplitterSettings(BaseModel):
     model_config = ConfigDict(frozen=True)
 
+    # トークン数でチャンクを区切るかどうか（無効な場合はCHUNK_SIZE文字ごとに区切る）
+    TOKEN_CHUNKING: ClassVar[bool] = os.getenv("TOKEN_CHUNKING", "true") == "true"
     CHUNK_SIZE: ClassVar[int] = int(os.getenv("CHUNK_SIZE", 2000))
     CHUNK_OVERLAP: ClassVar[int] = int(os.getenv("CHUNK_OVERLAP", 100))
+    # トークン数で区切る場合のチャンクの大きさ。ドキュメントの長さと問題数から
+    # CHUNK_MIN_TOKENS〜CHUNK_MAX_TOKENSの範囲で決め、不明な場合はCHUNK_TOKENSを使う
+    CHUNK_TOKENS: ClassVar[int] = int(os.getenv("CHUNK_TOKENS", 512))
+    CHUNK_MIN_TOKENS: ClassVar[int] = int(os.getenv("CHUNK_MIN_TOKENS", 256))
+    CHUNK_MAX_TOKENS: ClassVar[int] = int(os.getenv("CHUNK_MAX_TOKENS", 1024))
+    CHUNK_OVERLAP_RATIO: ClassVar[float] = float(
+        os.getenv("CHUNK_OVERLAP_RATIO", 0.1)
+    )
+
+
+class JobSettings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    # ジョブの保存先（memory or sqlite）
+    JOB_STORE: ClassVar[str] = os.getenv("JOB_STORE", "memory")
+    JOB_DB_PATH: ClassVar[str] = os.getenv("JOB_DB_PATH", "assets/tmp/jobs.sqlite3")
+    # 同時に実行するクイズ生成パイプラインの上限
+    JOB_MAX_WORKERS: ClassVar[int] = int(os.getenv("JOB_MAX_WORKERS", 4))
+    # 実行待ちにできるジョブの上限
+    JOB_MAX_PENDING: ClassVar[int] = int(os.getenv("JOB_MAX_PENDING", 100))
+    # 完了したジョブを保持する秒数
+    JOB_TTL_SECONDS: ClassVar[int] = int(os.getenv("JOB_TTL_SECONDS", 60 * 60 * 24))
+
+
+class StorageSettings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    # ユーザーの回答の保存先（gcs or sqlite）
+    STORAGE_BACKEND: ClassVar[str] = os.getenv("STORAGE_BACKEND", "gcs")
+    STORAGE_DB_PATH: ClassVar[str] = os.getenv(
+        "STORAGE_DB_PATH", "assets/tmp/results.sqlite3"
+    )
+    # 保存した回答のキャッシュ（回答は保存後に変わらないため期限は設けない）
+    RESULT_CACHE_ENABLED: ClassVar[bool] = (
+        os.getenv("RESULT_CACHE_ENABLED", "true") == "true"
+    )
+    # メモリに保持する回答の数の上限
+    RESULT_CACHE_MEMORY_ENTRIES: ClassVar[int] = int(
+        os.getenv("RESULT_CACHE_MEMORY_ENTRIES", 1024)
+    )
+    # ディスクの保存先。空の場合はメモリのみに保持する
+    RESULT_CACHE_PATH: ClassVar[str] = os.getenv("RESULT_CACHE_PATH", "")
+    RESULT_CACHE_MAX_BYTES: ClassVar[int] = int(
+        os.getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
 
 
 class TestSettings(BaseModel):
@@ -85,6 +270,10 @@ class Settings(BaseModel):
     embeddings: EmbeddingsSettings = Field(default_factory=EmbeddingsSettings)
     lang_chain: LangChainSettings = Field(default_factory=LangChainSettings)
     text_splitter: TextSplitterSettings = Field(default_factory=TextSplitterSettings)
+    quiz_cache: QuizCacheSettings = Field(default_factory=QuizCacheSettings)
+    page_cache: PageCacheSettings = Field(default_factory=PageCacheSettings)
+    job: JobSettings = Field(default_factory=JobSettings)
+    storage: StorageSettings = Field(default_factory=StorageSettings)
     test: TestSettings = Field(default_factory=TestSettings)
     third_party: ThirdPartySettings = Field(default_factory=ThirdPartySettings)
 
@@ -1,8 +1,13 @@
 import logging
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.endpoints import quiz_router, result_router
+from src.api.dependencies import create_quiz_job_runner
+from src.api.endpoints import metrics_router, quiz_router, result_router
+from src.application.service.executor import run_blocking
+from src.application.service.prompt_cache import get_system_prompt_cache
+from src.infrastructure.client_registry import create_client_registry
 from config.settings import settings
 
 load_dotenv()
@@ -15,7 +20,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 外部サービスのクライアントは起動時に一度だけ生成し、全リクエストで共有する
+    client_registry = await run_blocking(create_client_registry)
+    await run_blocking(get_system_prompt_cache().prefetch)
+    app.state.client_registry = client_registry
+    app.state.quiz_job_runner = create_quiz_job_runner(client_registry)
+    await run_blocking(app.state.quiz_job_runner.recover)
+    yield
+    await app.state.quiz_job_runner.ashutdown()
+    await client_registry.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +46,7 @@ app.add_middleware(
 
 app.include_router(quiz_router, prefix="/api/v1/quiz")
 app.include_router(result_router, prefix="/api/v1/result")
+app.include_router(metrics_router, prefix="/metrics")
 
 
 @app.get("/")
@@ -0,0 +1,45 @@
+from fastapi import Depends, Request
+
+from src.application.usecase.quiz_creator import QuizCreator
+from src.application.usecase.quiz_job_runner import QuizJobRunner
+from src.domain.repositories.storage_repository import StorageService
+from src.infrastructure.client_registry import ClientRegistry
+from src.infrastructure.db.quiz_job_repository import create_quiz_job_repository
+
+from config.settings import settings
+
+
+def create_quiz_job_runner(client_registry: ClientRegistry) -> QuizJobRunner:
+    """共有のクライアントを使うジョブランナーを生成する"""
+    return QuizJobRunner(
+        repository=create_quiz_job_repository(),
+        quiz_creator=QuizCreator(
+            llm=client_registry.llm, embeddings=client_registry.embeddings
+        ),
+        max_workers=settings.job.JOB_MAX_WORKERS,
+        max_pending=settings.job.JOB_MAX_PENDING,
+    )
+
+
+def get_client_registry(request: Request) -> ClientRegistry:
+    """起動時に生成した共有のクライアントを返す"""
+    return request.app.state.client_registry
+
+
+def get_quiz_job_runner(request: Request) -> QuizJobRunner:
+    """起動時に生成した共有のジョブランナーを返す"""
+    return request.app.state.quiz_job_runner
+
+
+def get_quiz_creator(
+    client_registry: ClientRegistry = Depends(get_client_registry),
+) -> QuizCreator:
+    """共有のクライアントを使うQuizCreatorを返す"""
+    return QuizCreator(llm=client_registry.llm, embeddings=client_registry.embeddings)
+
+
+def get_storage_client(
+    client_registry: ClientRegistry = Depends(get_client_registry),
+) -> StorageService:
+    """共有のストレージクライアントを返す"""
+    return client_registry.storage_client
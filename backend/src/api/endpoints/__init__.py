@@ -1,4 +1,5 @@
+from .metrics import router as metrics_router
 from .quiz import router as quiz_router
 from .result import router as result_router
 
-__all__ = ["quiz_router", "result_router"]
+__all__ = ["metrics_router", "quiz_router", "result_router"]
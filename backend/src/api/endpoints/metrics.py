@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.infrastructure.monitoring.metrics import CONTENT_TYPE, registry
+
+
+router = APIRouter()
+
+
+@router.get("", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    クイズ生成の各段階やストレージ操作の処理時間を、Prometheusのテキスト形式で返す
+    """
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
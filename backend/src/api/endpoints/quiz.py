@@ -1,10 +1,24 @@
+import json
 import logging
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import StreamingResponse
 
 from src.application.usecase.quiz_submitter import QuizSubmitter
 from src.api.exceptions.quiz_exceptions import handle_application_exception
 from src.application.usecase.quiz_creator import QuizCreator
-from src.api.models.quiz import QuizResponse, QuizRequest, UserAnswer
+from src.application.usecase.quiz_job_runner import QuizJobRunner
+from src.api.dependencies import (
+    get_quiz_creator,
+    get_quiz_job_runner,
+    get_storage_client,
+)
+from src.api.models.quiz import QuizJobResponse, QuizResponse, QuizRequest, UserAnswer
+from src.domain.entities.quiz_event import QuizEvent, QuizEventType
+from src.domain.entities.quiz_job import QuizJob
+from src.domain.repositories.storage_repository import StorageService
+from src.infrastructure.llm.usage_tracker import track_usage
+
+from config.settings import settings
 
 
 logger = logging.getLogger(__name__)
@@ -12,9 +26,16 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# LLMと埋め込みの使用量を返すデバッグ用のヘッダー
+USAGE_HEADER = "X-Readum-Usage"
+
 
 @router.post("/create_quiz", response_model=QuizResponse)
-async def create_quiz(quiz_request: QuizRequest):
+async def create_quiz(
+    quiz_request: QuizRequest,
+    response: Response,
+    quiz_creator: QuizCreator = Depends(get_quiz_creator),
+):
     """
     ユーザーが入力した条件をもとにクイズを生成する。
 
@@ -23,6 +44,7 @@ async def create_quiz(quiz_request: QuizRequest):
         content (str): 読書メモまたはURL
         difficulty (Difficulty): クイズの難易度
         question_count (int): クイズの数
+        strategy (GenerationStrategy | None): クイズの生成方式（省略時は設定値）
 
     Returns:
         QuizResponse: クイズのリスト（選択肢、解答、解説）
@@ -32,26 +54,168 @@ async def create_quiz(quiz_request: QuizRequest):
         InternalServerError: ドキュメント、ベクトルデータベース、RAGの処理中にエラーが発生した場合（500）
     """
     try:
-        quiz_creator = QuizCreator()
-        res: QuizResponse = quiz_creator.create_quiz(
+        with track_usage() as usage:
+            res: QuizResponse = await quiz_creator.acreate_quiz(
+                quiz_request.type,
+                quiz_request.content,
+                quiz_request.question_count,
+                quiz_request.difficulty,
+                strategy=quiz_request.strategy,
+            )
+        if settings.app.USAGE_HEADER_ENABLED:
+            # 調査用に、このリクエストで使用したLLMの呼び出し回数とトークン数を返す
+            response.headers[USAGE_HEADER] = usage.report().model_dump_json()
+        return res
+
+    except ValueError as e:
+        logger.error(f"Invalid input value: {str(e)}", exc_info=True)
+        raise handle_application_exception(e)
+
+    except Exception as e:
+        logger.error(f"Error creating quiz: {str(e)}", exc_info=True)
+        raise handle_application_exception(e)
+
+
+@router.post("/create_quiz/stream")
+async def create_quiz_stream(
+    quiz_request: QuizRequest,
+    quiz_creator: QuizCreator = Depends(get_quiz_creator),
+):
+    """
+    ユーザーが入力した条件をもとにクイズを生成し、途中経過をServer-Sent Eventsで返す。
+
+    Args:
+        type (QuizType): 入力タイプ（テキストorURL）
+        content (str): 読書メモまたはURL
+        difficulty (Difficulty): クイズの難易度
+        question_count (int): クイズの数
+        strategy (GenerationStrategy | None): クイズの生成方式（省略時は設定値）
+
+    Returns:
+        StreamingResponse: 以下のイベントを順に返すイベントストリーム
+            loaded / embedded / retrieved / generated / evaluated: 各処理段階の完了
+            question: 生成された問題（試行番号付き）
+            completed: QuizResponseと同じ形式の最終結果
+            error: 処理中に発生したエラー（status, detail）
+    """
+
+    async def event_stream():
+        try:
+            async for event in quiz_creator.astream_quiz(
+                quiz_request.type,
+                quiz_request.content,
+                quiz_request.question_count,
+                quiz_request.difficulty,
+                strategy=quiz_request.strategy,
+            ):
+                yield _format_sse(event)
+
+        except Exception as e:
+            logger.error(f"Error streaming quiz: {str(e)}", exc_info=True)
+            http_error = handle_application_exception(e)
+            yield _format_sse(
+                QuizEvent(
+                    type=QuizEventType.ERROR,
+                    data={
+                        "status": http_error.status_code,
+                        "detail": http_error.detail,
+                    },
+                )
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _format_sse(event: QuizEvent) -> str:
+    """イベントをServer-Sent Eventsの形式に変換する"""
+    data = json.dumps(event.data, ensure_ascii=False)
+    return f"event: {event.type.value}\ndata: {data}\n\n"
+
+
+@router.post(
+    "/jobs", response_model=QuizJobResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def create_quiz_job(
+    quiz_request: QuizRequest,
+    job_runner: QuizJobRunner = Depends(get_quiz_job_runner),
+):
+    """
+    クイズ生成ジョブを登録し、ジョブIDを即座に返す。
+    生成結果は GET /jobs/{job_id} で取得する。
+
+    Args:
+        type (QuizType): 入力タイプ（テキストorURL）
+        content (str): 読書メモまたはURL
+        difficulty (Difficulty): クイズの難易度
+        question_count (int): クイズの数
+        strategy (GenerationStrategy | None): クイズの生成方式（省略時は設定値）
+
+    Returns:
+        QuizJobResponse: 登録されたジョブ
+
+    Raises:
+        ServiceUnavailableError: 実行待ちのジョブが上限に達している場合（503）
+    """
+    try:
+        job = await job_runner.asubmit(
             quiz_request.type,
             quiz_request.content,
             quiz_request.question_count,
             quiz_request.difficulty,
+            strategy=quiz_request.strategy,
         )
-        return res
+        return _to_job_response(job)
 
-    except ValueError as e:
-        logger.error(f"Invalid input value: {str(e)}", exc_info=True)
+    except Exception as e:
+        logger.error(f"Error submitting quiz job: {str(e)}", exc_info=True)
         raise handle_application_exception(e)
 
+
+@router.get("/jobs/{job_id}", response_model=QuizJobResponse)
+async def get_quiz_job(
+    job_id: str, job_runner: QuizJobRunner = Depends(get_quiz_job_runner)
+):
+    """
+    クイズ生成ジョブの状態・進捗・結果を取得する。
+
+    Args:
+        job_id: ジョブID
+
+    Returns:
+        QuizJobResponse: ジョブの状態。完了していればresultに生成されたクイズを含む
+
+    Raises:
+        NotFoundError: ジョブが存在しない場合（404）
+    """
+    try:
+        job = await job_runner.aget(job_id)
+        return _to_job_response(job)
+
     except Exception as e:
-        logger.error(f"Error creating quiz: {str(e)}", exc_info=True)
+        logger.error(f"Error getting quiz job: {str(e)}", exc_info=True)
         raise handle_application_exception(e)
 
 
+def _to_job_response(job: QuizJob) -> QuizJobResponse:
+    """ジョブをAPIのレスポンスに変換する"""
+    return QuizJobResponse(
+        job_id=job.id,
+        status=job.status.value,
+        stage=job.stage,
+        result=job.result,
+        error=job.error,
+    )
+
+
 @router.post("/submit")
-async def submit_answer(user_answer: UserAnswer):
+async def submit_answer(
+    user_answer: UserAnswer,
+    storage_client: StorageService = Depends(get_storage_client),
+):
     """
     ユーザーの回答内容をGCSに保存する。
 
@@ -62,8 +226,8 @@ async def submit_answer(user_answer: UserAnswer):
         question_count (int): クイズの数
     """
     try:
-        quiz_submitter: QuizSubmitter = QuizSubmitter(user_answer)
-        quiz_submitter.save_object_to_storage()
+        quiz_submitter = QuizSubmitter(user_answer, storage_client)
+        await quiz_submitter.asave_object_to_storage()
         return {"uuid": user_answer.id}
 
     except ValueError as e:
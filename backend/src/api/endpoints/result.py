@@ -1,21 +1,35 @@
+import hashlib
+import json
 import logging
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from src.api.models.quiz import UserAnswer
 from src.api.exceptions.quiz_exceptions import handle_application_exception
+from src.api.dependencies import get_storage_client
 from src.application.usecase.get_result import ResultGetter
+from src.domain.repositories.storage_repository import StorageService
 
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 回答は一度だけ保存され上書きされないため、ブラウザやCDNに期限なくキャッシュさせる
+RESULT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 @router.get("/{uuid}", response_model=UserAnswer)
-async def get_result(uuid: str):
+async def get_result(
+    uuid: str,
+    request: Request,
+    response: Response,
+    storage_client: StorageService = Depends(get_storage_client),
+):
     """
     UUIDをもとにユーザーの回答を取得する
 
+    回答の内容から求めたETagを返し、If-None-Matchが一致する場合は304を返す。
+
     Args:
         uuid: UUID
 
@@ -23,9 +37,14 @@ async def get_result(uuid: str):
         UserAnswer: ユーザーの回答結果
     """
     try:
-        result_getter = ResultGetter(uuid)
-        res = result_getter.get_result_object_from_storage()
+        result_getter = ResultGetter(uuid, storage_client)
+        res = await result_getter.aget_result_object_from_storage()
 
+        headers = {"ETag": _result_etag(res), "Cache-Control": RESULT_CACHE_CONTROL}
+        if _etag_matches(request.headers.get("If-None-Match"), headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
         return res
 
     except ValueError as e:
@@ -35,3 +54,20 @@ async def get_result(uuid: str):
     except Exception as e:
         logger.error(f"Error creating quiz: {str(e)}", exc_info=True)
         raise handle_application_exception(e)
+
+
+def _result_etag(result: dict) -> str:
+    """回答の内容から強いETagを求める"""
+    data = json.dumps(result, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return f'"{hashlib.sha256(data.encode()).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-MatchのいずれかのETagが一致するかを返す（弱い比較）"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -24,6 +24,13 @@ class InternalServerError(HTTPException):
         )
 
 
+class ServiceUnavailableError(HTTPException):
+    """サーバーが一時的にリクエストを処理できない場合のエラー"""
+
+    def __init__(self, detail: str = "Service unavailable"):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
+
+
 # アプリケーション層の例外とHTTP例外のマッピング
 def handle_application_exception(exception):
     """アプリケーション層の例外をHTTP例外に変換する"""
@@ -40,6 +47,10 @@ def handle_application_exception(exception):
         ResultNotFoundError,
         GetResultObjectError,
     )
+    from src.application.exceptions.quiz_job_exceptions import (
+        QuizJobNotFoundError,
+        QuizJobQueueFullError,
+    )
 
     # 例外タイプとHTTP例外のマッピングを定義
     exception_mapping = {
@@ -47,6 +58,8 @@ def handle_application_exception(exception):
         InvalidInputError: lambda e: BadRequestError(str(e)),
         DocumentProcessingError: lambda e: BadRequestError(str(e)),
         ResultNotFoundError: lambda e: NotFoundError(str(e)),
+        QuizJobNotFoundError: lambda e: NotFoundError(str(e)),
+        QuizJobQueueFullError: lambda e: ServiceUnavailableError(str(e)),
         VectorStoreOperationError: lambda e: InternalServerError(str(e)),
         RAGProcessingError: lambda e: InternalServerError(str(e)),
         SaveObjectToStorageError: lambda e: InternalServerError(str(e)),
@@ -1,5 +1,5 @@
 import inspect
-from typing import List
+from typing import List, Optional
 from enum import Enum
 from urllib.parse import urlparse
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
@@ -18,6 +18,17 @@ class Difficulty(Enum):
     ADVANCED = "advanced"
 
 
+class GenerationStrategy(Enum):
+    # 構造化出力を1回呼び出すだけの方式
+    CHAIN = "chain"
+    # 生成後にローカルで検証し、失敗した問題だけを生成し直す方式
+    VALIDATED_CHAIN = "validated_chain"
+    # 文脈を分割し、分割ごとの問題を並列に生成してから検証する方式
+    PARALLEL = "parallel"
+    # Supervisorが生成と評価エージェントを繰り返す方式
+    SUPERVISOR = "supervisor"
+
+
 class QuizRequest(BaseModel):
     type: QuizType = Field(..., description="クイズのタイプ（テキスト or URL）")
     content: str = Field(
@@ -27,6 +38,9 @@ class QuizRequest(BaseModel):
     question_count: int = Field(
         ..., alias="questionCount", description="生成するクイズの数", ge=3, le=10
     )
+    strategy: Optional[GenerationStrategy] = Field(
+        default=None, description="クイズの生成方式。未指定の場合は設定値を使う"
+    )
 
     model_config = ConfigDict(populate_by_name=True, frozen=True)
 
@@ -119,3 +133,17 @@ class UserAnswer(BaseModel):
             )
 
         return v
+
+
+class QuizJobResponse(BaseModel):
+    job_id: str = Field(..., alias="jobId", description="ジョブを識別するための一意のID")
+    status: str = Field(..., description="ジョブの状態")
+    stage: Optional[str] = Field(
+        default=None, description="最後に完了したクイズ生成の処理段階"
+    )
+    result: Optional[QuizResponse] = Field(
+        default=None, description="生成されたクイズ（完了時のみ）"
+    )
+    error: Optional[str] = Field(default=None, description="失敗した場合のエラー内容")
+
+    model_config = ConfigDict(populate_by_name=True, frozen=True)
@@ -0,0 +1,18 @@
+class QuizJobBaseException(Exception):
+    """クイズ生成ジョブに関連する基底例外クラス"""
+
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(message)
+
+
+class QuizJobNotFoundError(QuizJobBaseException):
+    """ジョブが見つからない場合のエラー"""
+
+    pass
+
+
+class QuizJobQueueFullError(QuizJobBaseException):
+    """実行待ちのジョブが上限に達している場合のエラー"""
+
+    pass
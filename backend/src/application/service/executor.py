@@ -0,0 +1,31 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+from config.settings import settings
+
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=1)
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """同期処理をイベントループの外で実行するための共有スレッドプールを返す"""
+    return ThreadPoolExecutor(
+        max_workers=settings.app.BLOCKING_WORKERS,
+        thread_name_prefix="readum-blocking",
+    )
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    同期関数を上限付きのスレッドプールで実行し、結果を待つ
+
+    SDKが同期APIしか提供していない処理（GCS、テキスト分割など）で
+    イベントループを止めないために使う。
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_blocking_executor(), partial(func, *args, **kwargs)
+    )
@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from langchain_core.load import dumps, loads
+
+from src.application.service.executor import get_blocking_executor, run_blocking
+from src.application.service.llm_service import get_prompt_from_hub
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class PromptCache(BaseModel):
+    """
+    hubから取得したプロンプトをキャッシュするモデル
+
+    有効期限を過ぎたプロンプトは古いものを返しつつバックグラウンドで取得し直す。
+    hubに接続できない場合はディスクに保存したコピーを使う。
+    """
+
+    loader: Callable[[], Any] = Field(..., description="プロンプトを取得する関数")
+    ttl_seconds: int = Field(..., description="プロンプトを再取得するまでの秒数")
+    fallback_path: str | None = Field(
+        default=None, description="プロンプトのコピーを保存するファイルのパス"
+    )
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    _prompt: Any = PrivateAttr(default=None)
+    _fetched_at: float = PrivateAttr(default=0.0)
+    _refreshing: bool = PrivateAttr(default=False)
+    _version: tuple = PrivateAttr(default=(None, ""))
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def get(self) -> Any:
+        """
+        プロンプトを返す。期限切れの場合はバックグラウンドで再取得する
+
+        Raises:
+            Exception: hubからの取得に失敗し、ディスクのコピーもない場合
+        """
+        if self._prompt is None:
+            return self._load()
+
+        if self._is_expired():
+            self._schedule_refresh()
+        return self._prompt
+
+    async def aget(self) -> Any:
+        """プロンプトを返す。キャッシュがない場合のみスレッドプールで取得する"""
+        if self._prompt is None:
+            return await run_blocking(self._load)
+        return self.get()
+
+    async def aget_version(self) -> str:
+        """
+        現在のプロンプトのバージョン（内容のハッシュ値）を返す
+
+        プロンプトが更新された場合に、生成結果のキャッシュを区別するために使う。
+        """
+        prompt = await self.aget()
+        cached_prompt, version = self._version
+        if cached_prompt is not prompt:
+            try:
+                serialized = dumps(prompt)
+            except Exception:
+                serialized = repr(prompt)
+            version = hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+            self._version = (prompt, version)
+        return version
+
+    def prefetch(self) -> None:
+        """起動時にプロンプトを取得しておく。失敗してもアプリの起動は止めない"""
+        try:
+            self._load()
+        except Exception as e:
+            logger.warning(f"Failed to prefetch prompt: {str(e)}")
+
+    def refresh(self) -> Any:
+        """hubからプロンプトを取得し、キャッシュとディスクのコピーを更新する"""
+        prompt = self.loader()
+        with self._lock:
+            self._prompt = prompt
+            self._fetched_at = time.time()
+        self._save_fallback(prompt)
+        logger.info("Refreshed prompt from hub")
+        return prompt
+
+    def _load(self) -> Any:
+        """hubから取得し、失敗した場合はディスクのコピーを読み込む"""
+        try:
+            return self.refresh()
+        except Exception as e:
+            prompt = self._load_fallback()
+            if prompt is None:
+                raise
+            logger.warning(f"Using fallback prompt, failed to pull from hub: {e}")
+            with self._lock:
+                if self._prompt is None:
+                    # 次の呼び出しで再取得を試みるよう、取得時刻は更新しない
+                    self._prompt = prompt
+                return self._prompt
+
+    def _is_expired(self) -> bool:
+        return time.time() - self._fetched_at >= self.ttl_seconds
+
+    def _schedule_refresh(self) -> None:
+        """再取得をバックグラウンドで一度だけ実行する"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        get_blocking_executor().submit(self._background_refresh)
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            # 取得に失敗した場合は古いプロンプトを使い続け、期限まで再試行しない
+            logger.warning(f"Failed to refresh prompt, keeping cached one: {e}")
+            with self._lock:
+                self._fetched_at = time.time()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _save_fallback(self, prompt: Any) -> None:
+        if not self.fallback_path:
+            return
+        try:
+            dir_path = os.path.dirname(self.fallback_path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+            tmp_path = f"{self.fallback_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(dumps(prompt))
+            os.replace(tmp_path, self.fallback_path)
+        except Exception as e:
+            logger.warning(f"Failed to save fallback prompt: {str(e)}")
+
+    def _load_fallback(self) -> Any | None:
+        if not self.fallback_path or not os.path.exists(self.fallback_path):
+            return None
+        try:
+            with open(self.fallback_path, encoding="utf-8") as f:
+                return loads(f.read())
+        except Exception as e:
+            logger.warning(f"Failed to load fallback prompt: {str(e)}")
+            return None
+
+
+@lru_cache(maxsize=1)
+def get_system_prompt_cache() -> PromptCache:
+    """プロセス内で共有するシステムプロンプトのキャッシュを返す"""
+    return PromptCache(
+        loader=get_prompt_from_hub,
+        ttl_seconds=settings.lang_chain.PROMPT_CACHE_TTL_SECONDS,
+        fallback_path=settings.lang_chain.PROMPT_FALLBACK_PATH,
+    )
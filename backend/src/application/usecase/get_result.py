@@ -6,6 +6,8 @@ from src.application.exceptions.get_result_exceptions import (
     GetResultObjectError,
     ResultNotFoundError,
 )
+from src.application.service.executor import run_blocking
+from src.domain.repositories.storage_repository import StorageService
 from src.infrastructure.storage.gcs_client import GCSClient
 
 
@@ -18,13 +20,17 @@ class ResultGetter(BaseModel):
     """
 
     quiz_id: str
-    storage_client: GCSClient
+    storage_client: StorageService
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    def __init__(self, quiz_id: str):
-
-        storage_client = GCSClient()
+    def __init__(self, quiz_id: str, storage_client: StorageService | None = None):
+        """
+        Args:
+          quiz_id: クイズのID
+          storage_client: 共有のストレージクライアント。未指定の場合はGCSClientを生成する
+        """
+        storage_client = storage_client or GCSClient()
         super().__init__(quiz_id=quiz_id, storage_client=storage_client)
 
     def get_result_object_from_storage(self) -> UserAnswer:
@@ -43,3 +49,10 @@ class ResultGetter(BaseModel):
             error_msg = f"Failed to get object from storage: {str(e)}"
             logger.error(error_msg)
             raise GetResultObjectError(error_msg)
+
+    async def aget_result_object_from_storage(self) -> UserAnswer:
+        """
+        Storageからユーザーの回答結果を取得する。
+        GCSのSDKは同期APIのため、スレッドプールで実行してイベントループを止めない。
+        """
+        return await run_blocking(self.get_result_object_from_storage)
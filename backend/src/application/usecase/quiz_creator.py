@@ -1,16 +1,32 @@
+import asyncio
 import logging
-from typing import List, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 import uuid
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 from langchain_core.documents import Document
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+from langchain_text_splitters import TextSplitter
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.embeddings import Embeddings
+from langchain_openai import ChatOpenAI
 from langchain_community.document_loaders.firecrawl import FireCrawlLoader
 
 from src.infrastructure.llm.doc_translate import DocumentTranslateImpl
-from src.domain.repositories.vectordb_repository import VectorStoreHandler
+from src.domain.repositories.vectordb_repository import (
+    VectorIndexStore,
+    VectorStoreHandler,
+)
 from src.application.interface.database_file_handler import DBFileHandler
-from src.api.models.quiz import Difficulty, QuizResponse, QuizType
+from src.api.models.quiz import (
+    Difficulty,
+    GenerationStrategy,
+    QuizResponse,
+    QuizType,
+)
+from src.domain.entities.quiz import Quiz
+from src.domain.entities.quiz_event import QuizEvent, QuizEventHandler, QuizEventType
 from src.application.exceptions.quiz_creation_exceptions import (
     DocumentProcessingError,
     InsufficientContextError,
@@ -18,11 +34,32 @@ from src.application.exceptions.quiz_creation_exceptions import (
     RAGProcessingError,
     VectorStoreOperationError,
 )
-from src.application.service.llm_service import get_prompt_from_hub
+from src.application.service.executor import run_blocking
+from src.application.service.prompt_cache import get_system_prompt_cache
+from src.infrastructure.cache.cache_key import source_key
+from src.infrastructure.cache.embedding_cache import get_embeddings_model_name
+from src.infrastructure.cache.page_cache import with_page_cache
+from src.infrastructure.cache.quiz_cache import QuizResultCache, get_quiz_result_cache
+from src.infrastructure.cache.single_flight import SingleFlight
 from src.infrastructure.llm.rag_agent import RAGAgentModelImpl
-from src.infrastructure.db.vectordb import VectorStoreHandlerImpl, get_faiss_index
+from src.infrastructure.db.full_context_retriever import FullContextRetriever
+from src.infrastructure.db.vector_index_store import get_vector_index_store
+from src.infrastructure.db.vectordb import VectorStoreHandlerImpl, aget_faiss_index
 from src.infrastructure.file_system.database_file_handler import DBFileHandlerImpl
 from src.infrastructure.llm.doc_loader import DocumentLoaderImpl
+from src.infrastructure.llm.embeddings_provider import create_embeddings
+from src.infrastructure.llm.text_splitter import (
+    choose_chunk_tokens,
+    create_text_splitter,
+)
+from src.infrastructure.llm.token_counter import count_document_tokens
+from src.infrastructure.llm.usage_tracker import record_usage_metrics, track_usage
+from src.infrastructure.monitoring.metrics import (
+    QUIZ_CACHE_LOOKUPS,
+    QUIZ_REQUESTS,
+    bind_difficulty,
+    track_stage,
+)
 from src.infrastructure.exceptions.vectordb_exceptions import (
     VectorStoreCreationError,
     VectorStoreSaveError,
@@ -45,23 +82,64 @@ from config.settings import settings
 logger = logging.getLogger(__name__)
 
 
+# 同じ入力に対する同時リクエストで、ドキュメントとインデックスの作成を1回にまとめる
+# （QuizCreatorはリクエストごとに生成されるため、プロセス内で共有する）
+_artifact_flights = SingleFlight()
+
+
 # TODO: 初期値としてquizという値を受け取るようにする
 class QuizCreator(BaseModel):
+    llm: Optional[BaseChatModel] = Field(
+        default=None, description="共有のLLMモデル。未指定の場合は都度生成する"
+    )
+    embeddings: Optional[Embeddings] = Field(
+        default=None, description="共有の埋め込みモデル。未指定の場合は都度生成する"
+    )
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     def create_quiz(
         self,
         quiz_type: QuizType,
         content: str,
         question_count: int,
         difficulty: Difficulty,
+        strategy: GenerationStrategy | None = None,
+    ) -> QuizResponse:
+        """
+        クイズを生成する関数（同期版）
+
+        イベントループの外から呼び出すためのラッパー。
+        イベントループ内ではacreate_quizを直接awaitすること。
+        """
+        return asyncio.run(
+            self.acreate_quiz(
+                quiz_type, content, question_count, difficulty, strategy=strategy
+            )
+        )
+
+    async def acreate_quiz(
+        self,
+        quiz_type: QuizType,
+        content: str,
+        question_count: int,
+        difficulty: Difficulty,
+        strategy: GenerationStrategy | None = None,
+        on_event: QuizEventHandler | None = None,
     ) -> QuizResponse:
         """
         クイズを生成する関数
 
+        ドキュメントの読み込み、埋め込み、LLMの呼び出しは非同期で行い、
+        同期APIしかない処理は上限付きのスレッドプールで実行する。
+
         Args:
             quiz_type: クイズの種類（テキストまたはURL）
             content: クイズの元となるコンテンツ（テキストまたはURL）
             question_count: 生成する問題数
             difficulty: 難易度
+            strategy: クイズの生成方式。未指定の場合は設定値を使う
+            on_event: 各処理段階の完了を受け取るコールバック
 
         Returns:
             生成されたクイズのレスポンス
@@ -72,6 +150,41 @@ class QuizCreator(BaseModel):
             VectorStoreOperationError: ベクトルストア操作中にエラーが発生した場合
             RAGProcessingError: RAG処理中にエラーが発生した場合
         """
+        # 各段階の処理時間は難易度のラベルを付けて記録し、LLMの使用量を集計する
+        with bind_difficulty(difficulty.value), track_usage() as usage:
+            outcome = "error"
+            try:
+                with track_stage("total"):
+                    response = await self._acreate_quiz(
+                        quiz_type,
+                        content,
+                        question_count,
+                        difficulty,
+                        strategy=strategy,
+                        on_event=on_event,
+                    )
+                outcome = "success"
+                return response
+            finally:
+                QUIZ_REQUESTS.inc(outcome=outcome, difficulty=difficulty.value)
+                report = usage.report()
+                record_usage_metrics(report, difficulty.value)
+                logger.info(
+                    f"Quiz used {report.llm_calls} LLM calls, "
+                    f"{report.total_tokens} LLM tokens and "
+                    f"{report.embedding_tokens} embedding tokens"
+                )
+
+    async def _acreate_quiz(
+        self,
+        quiz_type: QuizType,
+        content: str,
+        question_count: int,
+        difficulty: Difficulty,
+        strategy: GenerationStrategy | None = None,
+        on_event: QuizEventHandler | None = None,
+    ) -> QuizResponse:
+        """クイズを生成するヘルパーメソッド"""
         # FIXME: API層でバリデーションは行ってもいいかも
         if not content:
             error_msg = "Content cannot be empty"
@@ -90,48 +203,75 @@ class QuizCreator(BaseModel):
             logger.error(error_msg)
             raise InvalidInputError(error_msg)
 
+        # 同じ入力に対して生成済みのクイズが揃っている場合はその中から返す
+        quiz_cache = get_quiz_result_cache()
+        cache_key = None
+        if quiz_cache is not None:
+            with track_stage("cache_lookup"):
+                cache_key, cached_quiz = await self._aget_cached_quiz(
+                    quiz_cache, quiz_type, content, question_count, difficulty
+                )
+            QUIZ_CACHE_LOOKUPS.inc(result="miss" if cached_quiz is None else "hit")
+            if cached_quiz is not None:
+                logger.info("Serving quiz from cache")
+                return QuizResponse(
+                    id=self._generate_uuid(),
+                    preview=cached_quiz,
+                    difficulty_value=difficulty.value,
+                )
+
         uuid = self._generate_uuid()
+        # チャンクの分割は問題数によって変わるため、問題数もキーに含める
+        artifact_key = f"{source_key(quiz_type, content)}:{question_count}"
 
         db_file_handler = DBFileHandlerImpl()
         directory_path = None
 
         try:
             # ドキュメント処理
+            # 同じ入力を処理中のリクエストがある場合は、その結果を待って共有する
             try:
-                splitted_doc = self._process_document(quiz_type, content)
+                splitted_doc = await _artifact_flights.do(
+                    f"document:{artifact_key}",
+                    lambda: self._aprocess_document(
+                        quiz_type, content, question_count
+                    ),
+                )
             except Exception as e:
                 error_msg = f"Failed to process document: {str(e)}"
                 logger.error(error_msg, exc_info=True)
                 raise DocumentProcessingError(error_msg) from e
+            self._emit(on_event, QuizEventType.LOADED, {"chunks": len(splitted_doc)})
 
-            # ベクトルストア操作
-            try:
-                vector_store_handler, directory_path = self._setup_vector_store(
-                    splitted_doc, db_file_handler, uuid
+            # 短いドキュメントは埋め込み・インデックスを作らず、全文をコンテキストとして使う
+            if await run_blocking(self._fits_full_context, splitted_doc):
+                logger.info("Using full document as context, skipping embeddings")
+                retriever = FullContextRetriever(documents=splitted_doc)
+                self._emit(
+                    on_event,
+                    QuizEventType.EMBEDDED,
+                    {"chunks": len(splitted_doc), "full_context": True},
+                )
+            else:
+                retriever, directory_path = await self._aprepare_retriever(
+                    splitted_doc, db_file_handler, uuid, artifact_key
+                )
+                self._emit(
+                    on_event, QuizEventType.EMBEDDED, {"chunks": len(splitted_doc)}
                 )
-            except (
-                VectorStoreCreationError,
-                VectorStoreSaveError,
-                InvalidDocumentError,
-                DirectoryCreationError,
-            ) as e:
-                error_msg = f"Vector store operation failed: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                raise VectorStoreOperationError(error_msg) from e
-            except Exception as e:
-                error_msg = f"Unexpected error during vector store operation: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                raise VectorStoreOperationError(error_msg) from e
 
             # RAG処理
+            strategy = strategy or GenerationStrategy(settings.app.GENERATION_STRATEGY)
             try:
-                return self._process_rag(
-                    vector_store_handler,
-                    directory_path,
-                    question_count,
-                    difficulty,
-                    uuid,
-                )
+                with track_stage("generate"):
+                    response = await self._aprocess_rag(
+                        retriever,
+                        question_count,
+                        difficulty,
+                        uuid,
+                        strategy,
+                        on_event,
+                    )
             except (
                 RAGChainSetupError,
                 RAGChainExecutionError,
@@ -148,69 +288,328 @@ class QuizCreator(BaseModel):
 
         finally:
             # リソース解放
-            self._cleanup_resources(directory_path, db_file_handler, uuid)
+            with track_stage("cleanup"):
+                await run_blocking(
+                    self._cleanup_resources, directory_path, db_file_handler, uuid
+                )
 
-    def _process_document(self, quiz_type: QuizType, content: str) -> List[Document]:
+        if cache_key is not None:
+            await self._astore_cached_quiz(quiz_cache, cache_key, response.preview)
+        return response
+
+    async def astream_quiz(
+        self,
+        quiz_type: QuizType,
+        content: str,
+        question_count: int,
+        difficulty: Difficulty,
+        strategy: GenerationStrategy | None = None,
+    ) -> AsyncIterator[QuizEvent]:
+        """
+        クイズ生成の途中経過をイベントとして逐次返す
+
+        読み込み・埋め込み・検索・生成・評価の各段階と、生成された問題を順に返し、
+        最後にCOMPLETEDイベントでクイズのレスポンスを返す。
+        問題は生成のたびに試行番号（attempt）付きで返されるため、
+        評価後に再生成された場合は後の試行の問題が優先される。
+        生成に失敗した場合はacreate_quizと同じ例外を送出する。
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[QuizEvent | None] = asyncio.Queue()
+
+        def on_event(event: QuizEvent) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        task = asyncio.create_task(
+            self.acreate_quiz(
+                quiz_type,
+                content,
+                question_count,
+                difficulty,
+                strategy=strategy,
+                on_event=on_event,
+            )
+        )
+        task.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(queue.put_nowait, None)
+        )
+
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+
+            response = await task
+            yield QuizEvent(
+                type=QuizEventType.COMPLETED,
+                data=response.model_dump(mode="json", by_alias=True),
+            )
+        finally:
+            # クライアントが切断した場合は生成を中断する
+            if not task.done():
+                task.cancel()
+
+    @staticmethod
+    async def _aget_cached_quiz(
+        quiz_cache: QuizResultCache,
+        quiz_type: QuizType,
+        content: str,
+        question_count: int,
+        difficulty: Difficulty,
+    ) -> Tuple[str | None, Quiz | None]:
+        """
+        キャッシュのキーと、キャッシュされたクイズを返す
+
+        キャッシュの参照に失敗した場合はクイズの生成を止めず、(None, None)を返す。
+        """
+        try:
+            prompt_version = await get_system_prompt_cache().aget_version()
+            cache_key = quiz_cache.build_key(
+                quiz_type, content, difficulty, question_count, prompt_version
+            )
+            return cache_key, await run_blocking(quiz_cache.get, cache_key)
+        except Exception as e:
+            logger.warning(f"Failed to read quiz cache: {str(e)}")
+            return None, None
+
+    @staticmethod
+    async def _astore_cached_quiz(
+        quiz_cache: QuizResultCache, cache_key: str, quiz: Quiz
+    ) -> None:
+        """生成したクイズをキャッシュに追加する。失敗してもレスポンスは返す"""
+        try:
+            await run_blocking(quiz_cache.add, cache_key, quiz)
+        except Exception as e:
+            logger.warning(f"Failed to write quiz cache: {str(e)}")
+
+    @staticmethod
+    def _emit(
+        on_event: QuizEventHandler | None, event_type: QuizEventType, data: dict
+    ) -> None:
+        """コールバックが指定されている場合のみイベントを通知する"""
+        if on_event is not None:
+            on_event(QuizEvent(type=event_type, data=data))
+
+    def _process_document(
+        self, quiz_type: QuizType, content: str, question_count: int | None = None
+    ) -> List[Document]:
         """ドキュメント処理を行うヘルパーメソッド"""
 
         if quiz_type == QuizType.TEXT:
-            document_translator = DocumentTranslateImpl()
-            document = document_translator.translate_str_into_doc(content)
-            splitted_doc = document_translator.split_document(document)
-        elif quiz_type == QuizType.URL:
-            document_loader = FireCrawlLoader(
-                url=content,
-                mode="scrape",
-                params={"onlyMainContent": True},
+            document_translator = DocumentTranslateImpl(
+                text_splitter=self._choose_text_splitter(
+                    [Document(page_content=content)], question_count
+                )
             )
-            document_loader = DocumentLoaderImpl(document_loader=document_loader)
+            # 文字列から直接チャンクを生成し、同じテキストを2回分割しない
+            splitted_doc = list(document_translator.iter_text_chunks(content))
+        elif quiz_type == QuizType.URL:
+            document_loader = self._create_document_loader(content)
             document = document_loader.load_document()
             splitted_doc = document_loader.split_document(document)
 
         return splitted_doc
 
-    def _setup_vector_store(
-        self, splitted_doc: List[Document], db_file_handler: DBFileHandler, uuid: str
-    ) -> Tuple[VectorStoreHandler, str]:
-        """ベクトルストアのセットアップを行うヘルパーメソッド"""
-        embeddings = OpenAIEmbeddings(model=settings.model.TEXT_EMBEDDINGS_MODEL)
+    async def _aprocess_document(
+        self, quiz_type: QuizType, content: str, question_count: int | None = None
+    ) -> List[Document]:
+        """ドキュメント処理を非同期で行うヘルパーメソッド"""
+        if quiz_type == QuizType.URL:
+            document_loader = self._create_document_loader(content)
+            with track_stage("load"):
+                document = await document_loader.aload_document()
+            with track_stage("split"):
+                text_splitter = await run_blocking(
+                    self._choose_text_splitter, document, question_count
+                )
+                document_loader = document_loader.model_copy(
+                    update={"text_splitter": text_splitter}
+                )
+                return await run_blocking(document_loader.split_document, document)
+
+        # テキストの分割はCPU処理のため、スレッドプールで実行する
+        with track_stage("split"):
+            return await run_blocking(
+                self._process_document, quiz_type, content, question_count
+            )
+
+    @staticmethod
+    def _choose_text_splitter(
+        document: List[Document], question_count: int | None
+    ) -> TextSplitter:
+        """ドキュメントの長さと問題数に応じた大きさでチャンクを区切るスプリッターを返す"""
+        if not settings.text_splitter.TOKEN_CHUNKING or not question_count:
+            return create_text_splitter()
+
+        chunk_tokens = choose_chunk_tokens(
+            count_document_tokens(document), question_count
+        )
+        logger.debug(f"Splitting document into chunks of {chunk_tokens} tokens")
+        return create_text_splitter(chunk_tokens)
+
+    @staticmethod
+    def _create_document_loader(url: str) -> DocumentLoaderImpl:
+        """URLのページを読み込むためのローダーを生成する"""
+        document_loader = FireCrawlLoader(
+            url=url,
+            mode="scrape",
+            params={"onlyMainContent": True},
+        )
+        return DocumentLoaderImpl(
+            document_loader=with_page_cache(url, document_loader)
+        )
+
+    @staticmethod
+    def _fits_full_context(splitted_doc: List[Document]) -> bool:
+        """検索せずに全文をコンテキストとして使えるほど短いドキュメントかどうか"""
+        max_tokens = settings.embeddings.FULL_CONTEXT_MAX_TOKENS
+        if max_tokens <= 0 or not splitted_doc:
+            return False
+        return count_document_tokens(splitted_doc) <= max_tokens
+
+    async def _aprepare_retriever(
+        self,
+        splitted_doc: List[Document],
+        db_file_handler: DBFileHandler,
+        uuid: str,
+        artifact_key: str | None = None,
+    ) -> Tuple[BaseRetriever, str | None]:
+        """ベクトルストアをセットアップし、リトリーバーを返すヘルパーメソッド"""
+        try:
+            vector_store_handler, directory_path = await self._asetup_vector_store(
+                splitted_doc, db_file_handler, uuid, artifact_key
+            )
+            # 保存済みのインデックスを読み直さず、メモリ上のFAISSから直接検索する
+            with track_stage("retriever"):
+                retriever = vector_store_handler.as_retriever()
+            return retriever, directory_path
+        except (
+            VectorStoreCreationError,
+            VectorStoreSaveError,
+            InvalidDocumentError,
+            DirectoryCreationError,
+        ) as e:
+            error_msg = f"Vector store operation failed: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise VectorStoreOperationError(error_msg) from e
+        except Exception as e:
+            error_msg = f"Unexpected error during vector store operation: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise VectorStoreOperationError(error_msg) from e
+
+    async def _asetup_vector_store(
+        self,
+        splitted_doc: List[Document],
+        db_file_handler: DBFileHandler,
+        uuid: str,
+        artifact_key: str | None = None,
+    ) -> Tuple[VectorStoreHandler, str | None]:
+        """
+        ベクトルストアのセットアップを行うヘルパーメソッド
+
+        保持済みのインデックスがあれば埋め込みを省略して再利用する。
+        artifact_keyが指定された場合、同じ入力・同じ埋め込みモデルのインデックスを
+        作成中のリクエストと埋め込み・インデックスを共有する。
+        ディスクへの保存はPERSIST_VECTORDBが有効な場合のみ行い、
+        保存しなかった場合のdirectory_pathはNoneとなる。
+        """
+        embeddings = self.embeddings or create_embeddings()
+        index_store = get_vector_index_store()
+        if artifact_key is None:
+            vectorstore = await self._aget_or_build_index(
+                splitted_doc, embeddings, index_store
+            )
+        else:
+            # 埋め込みモデルが異なるインデックスは共有できないため、モデル名もキーに含める
+            vectorstore = await _artifact_flights.do(
+                f"index:{artifact_key}:{get_embeddings_model_name(embeddings)}",
+                lambda: self._aget_or_build_index(
+                    splitted_doc, embeddings, index_store
+                ),
+            )
         vector_store_handler = VectorStoreHandlerImpl(
-            embeddings_model=embeddings,
-            vectorstore=get_faiss_index(splitted_doc, embeddings),
+            embeddings_model=embeddings, vectorstore=vectorstore
         )
 
-        directory_path = db_file_handler.create_unique_directory(uuid)
-        vector_store_handler.save_local(directory_path)
+        directory_path = None
+        if settings.embeddings.PERSIST_VECTORDB:
+            directory_path = await run_blocking(
+                db_file_handler.create_unique_directory, uuid
+            )
+            with track_stage("save"):
+                await run_blocking(vector_store_handler.save_local, directory_path)
 
         return vector_store_handler, directory_path
 
-    def _process_rag(
+    @staticmethod
+    async def _aget_or_build_index(
+        splitted_doc: List[Document],
+        embeddings: Embeddings,
+        index_store: VectorIndexStore | None,
+    ) -> VectorStore:
+        """保持済みのインデックスを返し、なければ作成してストアに保存する"""
+        if index_store is None:
+            with track_stage("embed"):
+                return await aget_faiss_index(splitted_doc, embeddings)
+
+        with track_stage("index_lookup"):
+            index_key = index_store.build_key(splitted_doc, embeddings)
+            vectorstore = await run_blocking(index_store.get, index_key, embeddings)
+        if vectorstore is not None:
+            logger.info("Reusing stored vector index")
+            return vectorstore
+
+        with track_stage("embed"):
+            vectorstore = await aget_faiss_index(splitted_doc, embeddings)
+        with track_stage("index_store"):
+            await run_blocking(index_store.put, index_key, vectorstore)
+        return vectorstore
+
+    async def _aprocess_rag(
         self,
-        vector_store_handler: VectorStoreHandler,
-        directory_path: str,
+        retriever: BaseRetriever,
         question_count: int,
         difficulty: QuizType,
         uuid: str,
+        strategy: GenerationStrategy = GenerationStrategy.SUPERVISOR,
+        on_event: QuizEventHandler | None = None,
     ) -> QuizResponse:
         """RAG処理を行うヘルパーメソッド"""
-        prompt = get_prompt_from_hub()
-        llm = ChatOpenAI(model_name=settings.model.GPT_MODEL)
-        retriever = vector_store_handler.as_retriever(directory_path)
+        with track_stage("prompt"):
+            prompt = await get_system_prompt_cache().aget()
+        llm = self.llm or ChatOpenAI(model_name=settings.model.GPT_MODEL)
         rag_agent = RAGAgentModelImpl(llm=llm, prompt=prompt, retriever=retriever)
 
-        # if settings.app.USE_LANGGRAPH:
-        rag_response = rag_agent.graph_run(
-            question_count=question_count,
-            difficulty=difficulty.value,
-        )
-        # else:
-        #     rag_response = rag_agent.invoke_chain(
-        #         question_count=question_count,
-        #         difficulty=difficulty.value,
-        #     )
+        logger.info(f"Generating quiz with {strategy.value} strategy")
+        if strategy == GenerationStrategy.SUPERVISOR:
+            rag_response = await rag_agent.agraph_run(
+                question_count=question_count,
+                difficulty=difficulty.value,
+                on_event=on_event,
+            )
+        elif strategy == GenerationStrategy.VALIDATED_CHAIN:
+            rag_response = await rag_agent.ainvoke_validated_chain(
+                question_count=question_count,
+                difficulty=difficulty.value,
+                max_retries=settings.app.VALIDATION_MAX_RETRIES,
+                on_event=on_event,
+            )
+        elif strategy == GenerationStrategy.PARALLEL:
+            rag_response = await rag_agent.ainvoke_parallel_chain(
+                question_count=question_count,
+                difficulty=difficulty.value,
+                max_retries=settings.app.VALIDATION_MAX_RETRIES,
+                max_concurrency=settings.app.PARALLEL_MAX_CONCURRENCY,
+                on_event=on_event,
+            )
+        else:
+            rag_response = await rag_agent.ainvoke_chain(
+                question_count=question_count,
+                difficulty=difficulty.value,
+                on_event=on_event,
+            )
 
         if rag_response is None:
-            logger.warning("Graph run returned None")
+            logger.warning("Quiz generation returned None")
             raise InsufficientContextError("Insufficient context to generate a quiz")
 
         return QuizResponse(
@@ -218,7 +617,7 @@ class QuizCreator(BaseModel):
         )
 
     def _cleanup_resources(
-        self, directory_path: str, db_file_handler: DBFileHandler, uuid: str
+        self, directory_path: str | None, db_file_handler: DBFileHandler, uuid: str
     ) -> None:
         """リソース解放を行うヘルパーメソッド"""
         if directory_path:
@@ -229,7 +628,7 @@ class QuizCreator(BaseModel):
             except Exception as e:
                 logger.warning(f"Unexpected error during cleanup: {str(e)}")
         else:
-            logger.error("directory_path is empty or None, cannot perform cleanup")
+            logger.debug("Vectorstore was not persisted, nothing to clean up")
 
     @staticmethod
     def _generate_uuid() -> str:
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import uuid
+from typing import Set
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from src.api.models.quiz import Difficulty, GenerationStrategy, QuizResponse, QuizType
+from src.application.exceptions.quiz_job_exceptions import (
+    QuizJobNotFoundError,
+    QuizJobQueueFullError,
+)
+from src.application.service.executor import run_blocking
+from src.application.usecase.quiz_creator import QuizCreator
+from src.domain.entities.quiz_event import QuizEventType
+from src.domain.entities.quiz_job import QuizJob, QuizJobStatus
+from src.domain.repositories.quiz_job_repository import QuizJobRepository
+
+
+logger = logging.getLogger(__name__)
+
+# 中断されたジョブに記録するエラー内容
+INTERRUPTED_ERROR = "Quiz job was interrupted before it finished"
+
+
+class QuizJobRunner(BaseModel):
+    """
+    クイズ生成をバックグラウンドのジョブとして実行するモデル
+
+    同時に実行するパイプラインの数をmax_workersで制限するため、
+    HTTPの同時接続数とは独立してLLMの呼び出しを抑えられる。
+    """
+
+    repository: QuizJobRepository = Field(..., description="ジョブの保存先")
+    quiz_creator: QuizCreator = Field(
+        default_factory=QuizCreator, description="クイズを生成するユースケース"
+    )
+    max_workers: int = Field(..., description="同時に実行するジョブの上限")
+    max_pending: int = Field(..., description="実行待ちにできるジョブの上限")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    _semaphore: asyncio.Semaphore = PrivateAttr()
+    _tasks: Set[asyncio.Task] = PrivateAttr(default_factory=set)
+    # 保存を待っている登録の数。保存の待機中に上限を超えて受け付けないよう数える
+    _submitting: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context) -> None:
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+
+    async def asubmit(
+        self,
+        quiz_type: QuizType,
+        content: str,
+        question_count: int,
+        difficulty: Difficulty,
+        strategy: GenerationStrategy | None = None,
+    ) -> QuizJob:
+        """
+        クイズ生成ジョブを登録し、バックグラウンドで実行を開始する
+
+        Returns:
+            登録されたジョブ
+
+        Raises:
+            QuizJobQueueFullError: 実行中・実行待ちのジョブが上限に達している場合
+        """
+        if len(self._tasks) + self._submitting >= self.max_workers + self.max_pending:
+            error_msg = "Too many quiz jobs are in progress. Please retry later."
+            logger.warning(error_msg)
+            raise QuizJobQueueFullError(error_msg)
+
+        self._submitting += 1
+        try:
+            job = await self._asave(QuizJob(id=uuid.uuid4().hex))
+        finally:
+            self._submitting -= 1
+
+        task = asyncio.create_task(
+            self._run(job, quiz_type, content, question_count, difficulty, strategy)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        logger.info(f"Submitted quiz job {job.id}")
+        return job
+
+    async def aget(self, job_id: str) -> QuizJob:
+        """
+        ジョブの状態を取得する
+
+        Raises:
+            QuizJobNotFoundError: ジョブが存在しない場合
+        """
+        job = await run_blocking(self.repository.get, job_id)
+        if job is None:
+            raise QuizJobNotFoundError(f"Quiz job {job_id} not found")
+        return job
+
+    def recover(self) -> int:
+        """
+        前回のプロセスで実行中・実行待ちのまま残ったジョブを失敗にする
+
+        Returns:
+            失敗にしたジョブの数
+        """
+        count = self.repository.fail_unfinished(INTERRUPTED_ERROR)
+        if count:
+            logger.warning(f"Marked {count} interrupted quiz jobs as failed")
+        return count
+
+    async def ashutdown(self) -> None:
+        """実行中・実行待ちのジョブを中断し、失敗として記録されるまで待つ"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(
+        self,
+        job: QuizJob,
+        quiz_type: QuizType,
+        content: str,
+        question_count: int,
+        difficulty: Difficulty,
+        strategy: GenerationStrategy | None,
+    ) -> None:
+        """ワーカーの空きを待ってクイズを生成し、結果をジョブに保存する"""
+        try:
+            async with self._semaphore:
+                job = await self._asave(job.update(status=QuizJobStatus.RUNNING))
+
+                result = None
+                async for event in self.quiz_creator.astream_quiz(
+                    quiz_type, content, question_count, difficulty, strategy=strategy
+                ):
+                    if event.type == QuizEventType.COMPLETED:
+                        response = QuizResponse.model_validate(event.data)
+                        result = response.model_dump(mode="json")
+                    # 問題ごとのイベントは処理段階の進捗ではないため記録しない
+                    elif event.type != QuizEventType.QUESTION:
+                        job = await self._asave(job.update(stage=event.type.value))
+
+                job = job.update(status=QuizJobStatus.SUCCEEDED, result=result)
+
+        except Exception as e:
+            logger.error(f"Quiz job {job.id} failed: {str(e)}", exc_info=True)
+            job = job.update(status=QuizJobStatus.FAILED, error=str(e))
+
+        except BaseException:
+            # シャットダウン時のキャンセルなどで中断された場合も、実行中のまま残さない
+            # 保存の待機中に再度キャンセルされても、スレッドプールでの保存は続く
+            logger.warning(f"Quiz job {job.id} was interrupted")
+            await run_blocking(
+                self._save_final,
+                job.update(status=QuizJobStatus.FAILED, error=INTERRUPTED_ERROR),
+            )
+            raise
+
+        await run_blocking(self._save_final, job)
+
+    async def _asave(self, job: QuizJob) -> QuizJob:
+        """ジョブをスレッドプールで保存し、保存したジョブを返す"""
+        await run_blocking(self.repository.save, job)
+        return job
+
+    def _save_final(self, job: QuizJob) -> None:
+        """完了したジョブを保存する。保存に失敗してもジョブの実行は止めない"""
+        try:
+            self.repository.save(job)
+        except Exception as e:
+            logger.error(f"Failed to save quiz job {job.id}: {str(e)}", exc_info=True)
@@ -5,6 +5,8 @@ from pydantic import BaseModel, ConfigDict
 from src.application.exceptions.quiz_submit_exceptions import (
     SaveObjectToStorageError,
 )
+from src.application.service.executor import run_blocking
+from src.domain.repositories.storage_repository import StorageService
 from src.infrastructure.storage.gcs_client import GCSClient
 from src.api.models.quiz import UserAnswer
 
@@ -14,19 +16,22 @@ logger = logging.getLogger(__name__)
 
 class QuizSubmitter(BaseModel):
     user_answer: UserAnswer
-    storage_client: GCSClient
+    storage_client: StorageService
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    def __init__(self, user_answer: UserAnswer):
+    def __init__(
+        self, user_answer: UserAnswer, storage_client: StorageService | None = None
+    ):
         """
         Storageにユーザーの回答を含むクイズオブジェクトを保存する。
 
         Args:
           user_answer: UserAnswer
+          storage_client: 共有のストレージクライアント。未指定の場合はGCSClientを生成する
         """
 
-        storage_client = GCSClient()
+        storage_client = storage_client or GCSClient()
         super().__init__(user_answer=user_answer, storage_client=storage_client)
 
     def save_object_to_storage(self):
@@ -42,3 +47,10 @@ class QuizSubmitter(BaseModel):
             error_msg = f"Failed to save object to storage: {str(e)}"
             logger.error(error_msg, exc_info=True)
             raise SaveObjectToStorageError(error_msg) from e
+
+    async def asave_object_to_storage(self):
+        """
+        Storageにuser_answerを保存する。
+        GCSのSDKは同期APIのため、スレッドプールで実行してイベントループを止めない。
+        """
+        await run_blocking(self.save_object_to_storage)
@@ -16,3 +16,11 @@ class Quiz(BaseModel):
         if len(self.questions) < 3 or len(self.questions) > 10:
             raise ValueError("質問は3問から10問の範囲である必要があります")
         return self
+
+
+class QuestionBatch(BaseModel):
+    """一部の問題だけを生成し直す際に使う、問題数の制約がない問題のリスト"""
+
+    questions: List[Question] = Field(description="生成されたQuestionのリスト")
+
+    model_config = ConfigDict(frozen=True)
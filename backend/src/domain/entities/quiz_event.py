@@ -0,0 +1,25 @@
+from enum import Enum
+from typing import Any, Callable, Dict
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class QuizEventType(Enum):
+    LOADED = "loaded"
+    EMBEDDED = "embedded"
+    RETRIEVED = "retrieved"
+    GENERATED = "generated"
+    EVALUATED = "evaluated"
+    QUESTION = "question"
+    COMPLETED = "completed"
+    ERROR = "error"
+
+
+class QuizEvent(BaseModel):
+    type: QuizEventType = Field(..., description="クイズ生成パイプラインのイベント種別")
+    data: Dict[str, Any] = Field(default_factory=dict, description="イベントの内容")
+
+    model_config = ConfigDict(frozen=True)
+
+
+# クイズ生成の途中経過を受け取るコールバック
+QuizEventHandler = Callable[[QuizEvent], None]
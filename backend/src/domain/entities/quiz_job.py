@@ -0,0 +1,37 @@
+import time
+from enum import Enum
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class QuizJobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class QuizJob(BaseModel):
+    id: str = Field(..., description="ジョブを識別するための一意のID")
+    status: QuizJobStatus = Field(
+        default=QuizJobStatus.PENDING, description="ジョブの状態"
+    )
+    stage: Optional[str] = Field(
+        default=None, description="最後に完了したクイズ生成の処理段階"
+    )
+    result: Optional[Dict[str, Any]] = Field(
+        default=None, description="生成されたクイズのレスポンス"
+    )
+    error: Optional[str] = Field(default=None, description="失敗した場合のエラー内容")
+    created_at: float = Field(default_factory=time.time, description="作成日時")
+    updated_at: float = Field(default_factory=time.time, description="更新日時")
+
+    model_config = ConfigDict(frozen=True)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (QuizJobStatus.SUCCEEDED, QuizJobStatus.FAILED)
+
+    def update(self, **changes: Any) -> "QuizJob":
+        """変更を反映した新しいジョブを返す"""
+        return self.model_copy(update={**changes, "updated_at": time.time()})
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+
+from pydantic import BaseModel, ConfigDict
+
+from src.domain.entities.quiz_job import QuizJob
+
+
+class QuizJobRepository(ABC, BaseModel):
+    """クイズ生成ジョブの状態を保存するリポジトリ"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    @abstractmethod
+    def save(self, job: QuizJob) -> None:
+        """
+        ジョブを保存する。同じIDのジョブが存在する場合は上書きする
+
+        Args:
+            job (QuizJob): 保存するジョブ
+        """
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> QuizJob | None:
+        """
+        IDをもとにジョブを取得する
+
+        Args:
+            job_id (str): ジョブのID
+
+        Returns:
+            QuizJob: ジョブ。見つからない場合はNone
+        """
+        pass
+
+    @abstractmethod
+    def fail_unfinished(self, error: str) -> int:
+        """
+        実行していたプロセスが終了し、実行中・実行待ちのまま残ったジョブを失敗にする
+
+        Args:
+            error (str): 失敗にしたジョブに記録するエラー内容
+
+        Returns:
+            int: 失敗にしたジョブの数
+        """
+        pass
@@ -16,6 +16,9 @@ class StorageService(ABC, BaseModel):
         """
         クイズの回答をGCSに保存し、保存先のパスを返す
 
+        回答は一度だけ保存する。同じIDの回答が保存済みの場合は上書きせず、
+        保存済みの回答を残す（結果のキャッシュが古い回答を返さないようにするため）。
+
         Args:
             quiz_id (str): クイズのID
             data_dict (Dict[str, Any]): 保存するデータ
@@ -37,3 +40,7 @@ class StorageService(ABC, BaseModel):
           UserAnswer: UserAnswer型のデータ。見つからない場合はNone
         """
         pass
+
+    def close(self) -> None:
+        """ストレージへの接続を閉じる。接続を持たない場合は何もしない"""
+        pass
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+from typing import List
 from pydantic import BaseModel, ConfigDict, Field
 
+from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import VectorStore, VectorStoreRetriever
 
@@ -26,8 +28,30 @@ class VectorStoreHandler(ABC, BaseModel):
         pass
 
     @abstractmethod
-    def as_retriever(self, dir_path: str) -> VectorStoreRetriever:
+    def as_retriever(self, dir_path: str | None = None) -> VectorStoreRetriever:
         """
         ベクトルストアからリトリーバー（検索機能）を返します。
+        dir_pathが指定されない場合はメモリ上のベクトルストアをそのまま使います。
         """
         pass
+
+
+class VectorIndexStore(ABC, BaseModel):
+    """作成済みのベクトルストアを入力の内容ごとに保持し、再利用するためのストア"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @abstractmethod
+    def build_key(self, documents: List[Document], embeddings: Embeddings) -> str:
+        """分割済みのドキュメントと埋め込みモデルからキーを生成する"""
+        pass
+
+    @abstractmethod
+    def get(self, key: str, embeddings: Embeddings) -> VectorStore | None:
+        """キーに対応するベクトルストアを返す。存在しない場合はNone"""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, vectorstore: VectorStore) -> None:
+        """ベクトルストアを保存する"""
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Final, List
+from typing import Final, Iterable, Iterator, List
 from pydantic import BaseModel, ConfigDict, Field
 
 from langchain_core.documents import Document
@@ -19,3 +19,8 @@ class DocumentCreator(ABC, BaseModel):
     def split_document(self, document: List[Document]) -> List[Document]:
         """受け取ったドキュメントを分割する関数"""
         pass
+
+    @abstractmethod
+    def iter_chunks(self, document: Iterable[Document]) -> Iterator[Document]:
+        """受け取ったドキュメントを分割し、チャンクを1つずつ順に返す関数"""
+        pass
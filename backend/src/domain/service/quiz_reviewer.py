@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from typing import List
+from pydantic import BaseModel, ConfigDict, Field
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from src.domain.entities.question import Question
+from src.domain.service.quiz_validator import QuizIssue
+
+
+class QuizReviewer(BaseModel, ABC):
+    """
+    ローカルの検証では判断できないクイズの問題点をLLMで確認するための抽象モデル
+
+    構造的な問題点はQuizValidatorで確定させ、確認が必要なもの（needs_review）だけを
+    LLMに渡すことで、LLMの呼び出しを最小限に抑える。
+    """
+
+    llm: BaseChatModel = Field(..., description="LLMモデル")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @abstractmethod
+    def review(
+        self, questions: List[Question], issues: List[QuizIssue]
+    ) -> List[QuizIssue]:
+        """確認が必要な問題点のうち、実際に問題があるものを返す"""
+        pass
+
+    @abstractmethod
+    async def areview(
+        self, questions: List[Question], issues: List[QuizIssue]
+    ) -> List[QuizIssue]:
+        """確認が必要な問題点のうち、実際に問題があるものを非同期で返す"""
+        pass
+
+    @abstractmethod
+    def review_output(self, output: str, question_count: int) -> str:
+        """クイズとして解釈できなかった出力をレビューし、フィードバックを返す"""
+        pass
+
+    @abstractmethod
+    async def areview_output(self, output: str, question_count: int) -> str:
+        """クイズとして解釈できなかった出力を非同期でレビューし、フィードバックを返す"""
+        pass
+
+    def confirm(
+        self, questions: List[Question], issues: List[QuizIssue]
+    ) -> List[QuizIssue]:
+        """確認が必要な問題点がある場合のみLLMに問い合わせ、確定した問題点を返す"""
+        definite = [issue for issue in issues if not issue.needs_review]
+        suspicious = [issue for issue in issues if issue.needs_review]
+        if not suspicious:
+            return definite
+        return definite + self.review(questions, suspicious)
+
+    async def aconfirm(
+        self, questions: List[Question], issues: List[QuizIssue]
+    ) -> List[QuizIssue]:
+        """confirmの非同期版"""
+        definite = [issue for issue in issues if not issue.needs_review]
+        suspicious = [issue for issue in issues if issue.needs_review]
+        if not suspicious:
+            return definite
+        return definite + await self.areview(questions, suspicious)
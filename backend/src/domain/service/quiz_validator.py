@@ -0,0 +1,127 @@
+import re
+from typing import List
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.domain.entities.question import Question
+
+
+VALID_ANSWERS = ("A", "B", "C", "D")
+
+
+class QuizIssue(BaseModel):
+    """検証で見つかったクイズの問題点"""
+
+    index: int | None = Field(
+        default=None, description="問題の番号。クイズ全体の問題点の場合はNone"
+    )
+    message: str = Field(..., description="問題点の内容")
+    needs_review: bool = Field(
+        default=False, description="ローカルでは判断できず、LLMによる確認が必要かどうか"
+    )
+
+    model_config = ConfigDict(frozen=True)
+
+
+class QuizValidator(BaseModel):
+    """生成されたクイズの構造をLLMを使わずに検証するモデル"""
+
+    model_config = ConfigDict(frozen=True)
+
+    def find_issues(
+        self, questions: List[Question], question_count: int
+    ) -> List[QuizIssue]:
+        """
+        問題数、正解の選択肢、解説、問題文と選択肢の重複を検証する
+
+        解説が正解の選択肢に触れていない場合は誤りとは限らないため、
+        needs_reviewを付けてLLMによる確認に回す。
+
+        Returns:
+            見つかった問題点のリスト。問題がなければ空のリスト
+        """
+        issues: List[QuizIssue] = []
+
+        if len(questions) != question_count:
+            issues.append(
+                QuizIssue(
+                    message=(
+                        f"The quiz has {len(questions)} questions, "
+                        f"but {question_count} were requested."
+                    )
+                )
+            )
+
+        seen = set()
+        for index, question in enumerate(questions):
+            answer = question.answer.strip().upper()
+            if answer not in VALID_ANSWERS:
+                issues.append(
+                    QuizIssue(
+                        index=index,
+                        message=(
+                            f"Question {index + 1} has an invalid answer "
+                            f"'{question.answer}'. It must be one of A, B, C or D."
+                        ),
+                    )
+                )
+            elif not self._explains_answer(question, answer):
+                issues.append(
+                    QuizIssue(
+                        index=index,
+                        message=(
+                            f"The explanation of question {index + 1} does not "
+                            f"mention the correct option {answer}."
+                        ),
+                        needs_review=True,
+                    )
+                )
+
+            options = [
+                self._normalize(getattr(question.options, key)) for key in VALID_ANSWERS
+            ]
+            if len(set(options)) != len(options):
+                issues.append(
+                    QuizIssue(
+                        index=index,
+                        message=f"Question {index + 1} has duplicate options.",
+                    )
+                )
+
+            # 後から出てきた方を重複として扱う
+            key = self._normalize(question.question)
+            if key in seen:
+                issues.append(
+                    QuizIssue(
+                        index=index,
+                        message=f"Question {index + 1} duplicates another question.",
+                    )
+                )
+            seen.add(key)
+
+        return issues
+
+    def deduplicate(self, questions: List[Question]) -> List[Question]:
+        """問題文が重複している問題を除き、最初に出てきたものだけを残す"""
+        seen = set()
+        unique = []
+        for question in questions:
+            key = self._normalize(question.question)
+            if key not in seen:
+                seen.add(key)
+                unique.append(question)
+        return unique
+
+    @classmethod
+    def _explains_answer(cls, question: Question, answer: str) -> bool:
+        """解説が正解の選択肢の記号または本文に触れているかどうか"""
+        explanation = question.explanation
+        if re.search(rf"(?<![A-Za-z]){answer}(?![A-Za-z])", explanation):
+            return True
+
+        option = cls._normalize(getattr(question.options, answer))
+        return bool(option) and option in cls._normalize(explanation)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """大文字・小文字や空白の違いを無視して比較するための文字列に変換する"""
+        return re.sub(r"\s+", " ", text).strip().casefold()
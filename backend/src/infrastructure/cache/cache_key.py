@@ -0,0 +1,51 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.api.models.quiz import QuizType
+
+
+# 取得するページの内容に影響しない計測用のクエリパラメータ
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "ref"}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    同じページを指すURLが同じ文字列になるよう正規化する
+
+    スキームとホストの小文字化、デフォルトポート・フラグメント・計測用パラメータの除去、
+    クエリパラメータの並び替え、末尾のスラッシュの除去を行う。
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith(TRACKING_PARAM_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def normalize_text(text: str) -> str:
+    """空白の違いだけのテキストが同じ文字列になるよう正規化する"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def content_hash(text: str) -> str:
+    """キャッシュキーに使うテキストのハッシュ値を返す"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def source_key(quiz_type: QuizType, content: str) -> str:
+    """入力の種類と正規化した内容から、同じ入力を指すキーを生成する"""
+    if quiz_type == QuizType.URL:
+        normalized = canonicalize_url(content)
+    else:
+        normalized = normalize_text(content)
+    return f"{quiz_type.value}:{content_hash(normalized)}"
@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import sqlite3
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+from langchain_core.embeddings import Embeddings
+
+from src.application.service.executor import run_blocking
+from src.infrastructure.cache.sqlite_store import SQLiteKVStore
+from src.infrastructure.llm.embeddings_provider import is_local_embeddings
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_embeddings_model_name(embeddings: Embeddings) -> str:
+    """キャッシュキーに使う埋め込みモデル名を返す"""
+    return getattr(embeddings, "model", None) or type(embeddings).__name__
+
+
+class CachedEmbeddings(BaseModel, Embeddings):
+    """
+    チャンクの埋め込みベクトルをキャッシュする埋め込みモデル
+
+    (埋め込みモデル名, チャンク本文のハッシュ)をキーとしてストアを参照し、
+    キャッシュにないチャンクだけを元の埋め込みモデルに問い合わせる。
+    """
+
+    embeddings: Embeddings = Field(..., description="元の埋め込みモデル")
+    store: SQLiteKVStore = Field(..., description="埋め込みベクトルの保存先")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    @property
+    def model(self) -> str:
+        return get_embeddings_model_name(self.embeddings)
+
+    def _cache_key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model}:{digest}"
+
+    def _lookup(self, texts: List[str]) -> Dict[str, List[float]]:
+        """キャッシュ済みのベクトルを本文ごとに返す"""
+        keys = {self._cache_key(text): text for text in texts}
+        try:
+            cached = self.store.get_many(keys.keys())
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read embedding cache: {str(e)}")
+            return {}
+
+        return {
+            keys[key]: np.frombuffer(value, dtype=np.float32).tolist()
+            for key, value in cached.items()
+        }
+
+    def _save(self, texts: List[str], vectors: List[List[float]]) -> None:
+        items = [
+            (self._cache_key(text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        try:
+            self.store.set_many(items)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write embedding cache: {str(e)}")
+
+    def _merge(
+        self, texts: List[str], found: Dict[str, List[float]]
+    ) -> List[List[float]]:
+        return [found[text] for text in texts]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        found = self._lookup(texts)
+        misses = [text for text in dict.fromkeys(texts) if text not in found]
+        logger.debug(
+            f"Embedding cache: {len(texts) - len(misses)} hits, {len(misses)} misses"
+        )
+
+        if misses:
+            vectors = self.embeddings.embed_documents(misses)
+            self._save(misses, vectors)
+            found.update(zip(misses, vectors))
+
+        return self._merge(texts, found)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # SQLiteの読み書きはイベントループを止めないよう、共有スレッドプールで行う
+        found = await run_blocking(self._lookup, texts)
+        misses = [text for text in dict.fromkeys(texts) if text not in found]
+        logger.debug(
+            f"Embedding cache: {len(texts) - len(misses)} hits, {len(misses)} misses"
+        )
+
+        if misses:
+            vectors = await self.embeddings.aembed_documents(misses)
+            await run_blocking(self._save, misses, vectors)
+            found.update(zip(misses, vectors))
+
+        return self._merge(texts, found)
+
+    def embed_query(self, text: str) -> List[float]:
+        # 検索クエリはリクエストごとに異なるため、キャッシュせずにそのまま問い合わせる
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embeddings.aembed_query(text)
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache_store() -> SQLiteKVStore:
+    """プロセス内で共有する埋め込みキャッシュのストアを返す"""
+    return SQLiteKVStore(
+        path=settings.embeddings.EMBEDDING_CACHE_PATH,
+        max_bytes=settings.embeddings.EMBEDDING_CACHE_MAX_BYTES,
+    )
+
+
+def with_embedding_cache(embeddings: Embeddings) -> Embeddings:
+    """設定に応じて埋め込みモデルをキャッシュ付きのものに包んで返す"""
+    if (
+        not settings.embeddings.EMBEDDING_CACHE_ENABLED
+        or isinstance(embeddings, CachedEmbeddings)
+        # ローカルで計算する埋め込みは、キャッシュを引くより計算し直す方が速い
+        or is_local_embeddings(embeddings)
+    ):
+        return embeddings
+
+    try:
+        store = get_embedding_cache_store()
+    except sqlite3.Error as e:
+        logger.warning(f"Embedding cache is unavailable: {str(e)}")
+        return embeddings
+
+    return CachedEmbeddings(embeddings=embeddings, store=store)
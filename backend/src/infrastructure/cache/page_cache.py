@@ -0,0 +1,140 @@
+import logging
+import sqlite3
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+from src.application.service.executor import run_blocking
+from src.infrastructure.cache.cache_key import canonicalize_url
+from src.infrastructure.cache.single_flight import SingleFlight
+from src.infrastructure.cache.sqlite_store import SQLiteKVStore
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPage(BaseModel):
+    fetched_at: float = Field(..., description="取得した時刻")
+    documents: List[Dict[str, Any]] = Field(
+        ..., description="取得したドキュメント（page_contentとmetadata）"
+    )
+
+    model_config = ConfigDict(frozen=True)
+
+    def to_documents(self) -> List[Document]:
+        return [Document(**document) for document in self.documents]
+
+
+class ScrapedPageCache(BaseModel):
+    """
+    スクレイピングしたページをURLごとにキャッシュするモデル
+
+    正規化したURLをキーとし、有効期限内であればスクレイピングせずに返す。
+    ページの取得はFireCrawlだけが行い、バックエンドからURLへ直接は通信しない。
+    同じURLへの同時リクエストは1回のスクレイピングにまとめる。
+    """
+
+    store: SQLiteKVStore = Field(..., description="取得したページの保存先")
+    ttl_seconds: int = Field(..., description="スクレイピングし直さずにページを使う秒数")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    _inflight: SingleFlight = PrivateAttr(default_factory=SingleFlight)
+
+    def load(self, url: str, loader: BaseLoader) -> List[Document]:
+        """キャッシュを参照し、必要な場合のみloaderでページを取得する"""
+        key = canonicalize_url(url)
+        page = self._get(key)
+        if page is not None and self._is_fresh(page):
+            logger.debug(f"Page cache hit: {key}")
+            return page.to_documents()
+
+        documents = loader.load()
+        self._save(
+            key,
+            CachedPage(
+                fetched_at=time.time(),
+                documents=[
+                    {"page_content": d.page_content, "metadata": d.metadata}
+                    for d in documents
+                ],
+            ),
+        )
+        return documents
+
+    async def aload(self, url: str, loader: BaseLoader) -> List[Document]:
+        """loadを非同期で実行する。同じURLへの同時リクエストは1回にまとめる"""
+        return await self._inflight.do(
+            canonicalize_url(url), lambda: run_blocking(self.load, url, loader)
+        )
+
+    def _is_fresh(self, page: CachedPage) -> bool:
+        return time.time() - page.fetched_at < self.ttl_seconds
+
+    def _get(self, key: str) -> CachedPage | None:
+        try:
+            value = self.store.get(key)
+            return CachedPage.model_validate_json(value) if value else None
+        except Exception as e:
+            logger.warning(f"Failed to read page cache: {str(e)}")
+            return None
+
+    def _save(self, key: str, page: CachedPage) -> None:
+        try:
+            self.store.set(key, page.model_dump_json().encode())
+        except Exception as e:
+            logger.warning(f"Failed to write page cache: {str(e)}")
+
+
+class CachedPageLoader(BaseLoader):
+    """ScrapedPageCacheを経由してページを読み込むローダー"""
+
+    def __init__(self, url: str, loader: BaseLoader, cache: ScrapedPageCache):
+        self.url = url
+        self.loader = loader
+        self.cache = cache
+
+    def lazy_load(self) -> Iterator[Document]:
+        yield from self.cache.load(self.url, self.loader)
+
+    def load(self) -> List[Document]:
+        return self.cache.load(self.url, self.loader)
+
+    async def aload(self) -> List[Document]:
+        return await self.cache.aload(self.url, self.loader)
+
+
+@lru_cache(maxsize=1)
+def get_scraped_page_cache() -> ScrapedPageCache | None:
+    """プロセス内で共有するページのキャッシュを返す。無効な場合はNone"""
+    if not settings.page_cache.PAGE_CACHE_ENABLED:
+        return None
+
+    try:
+        store = SQLiteKVStore(
+            path=settings.page_cache.PAGE_CACHE_PATH,
+            max_bytes=settings.page_cache.PAGE_CACHE_MAX_BYTES,
+            ttl_seconds=settings.page_cache.PAGE_CACHE_TTL_SECONDS,
+        )
+    except sqlite3.Error as e:
+        logger.warning(f"Page cache is unavailable: {str(e)}")
+        return None
+
+    return ScrapedPageCache(
+        store=store, ttl_seconds=settings.page_cache.PAGE_CACHE_TTL_SECONDS
+    )
+
+
+def with_page_cache(url: str, loader: BaseLoader) -> BaseLoader:
+    """設定に応じてローダーをキャッシュ付きのものに包んで返す"""
+    cache = get_scraped_page_cache()
+    if cache is None:
+        return loader
+    return CachedPageLoader(url=url, loader=loader, cache=cache)
@@ -0,0 +1,152 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from src.api.models.quiz import Difficulty, QuizType
+from src.domain.entities.quiz import Quiz
+from src.infrastructure.cache.cache_key import source_key
+from src.infrastructure.cache.sqlite_store import SQLiteKVStore
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class QuizVariant(BaseModel):
+    created_at: float = Field(..., description="生成した時刻")
+    quiz: Quiz = Field(..., description="生成したクイズ")
+
+    model_config = ConfigDict(frozen=True)
+
+
+class QuizResultCache(BaseModel):
+    """
+    生成したクイズをキャッシュするモデル
+
+    同じ入力に対して最大variants個のクイズを保持し、揃うまでは新たに生成させ、
+    揃った後はその中から無作為に返すことで、利用者ごとに異なるクイズを出題する。
+    ディスク（SQLite）がある場合はディスクのみに保持し、毎回ディスクを参照する。
+    メモリに写しを持つと、他のワーカーが追加したクイズを見落としたり、
+    古い写しで上書きしたりするため、メモリはディスクがない場合にのみ使う。
+    """
+
+    variants: int = Field(..., description="同じ入力に対して保持するクイズの数")
+    ttl_seconds: int = Field(..., description="生成したクイズを保持する秒数")
+    memory_entries: int = Field(
+        ..., description="メモリに保持する入力の数の上限。ディスクがない場合のみ使う"
+    )
+    store: Optional[SQLiteKVStore] = Field(
+        default=None, description="ディスクの保存先。Noneの場合はメモリのみ"
+    )
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    _memory: "OrderedDict[str, List[QuizVariant]]" = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @staticmethod
+    def build_key(
+        quiz_type: QuizType,
+        content: str,
+        difficulty: Difficulty,
+        question_count: int,
+        prompt_version: str,
+    ) -> str:
+        """正規化した入力、難易度、問題数、プロンプトのバージョンからキーを生成する"""
+        return ":".join(
+            [
+                source_key(quiz_type, content),
+                difficulty.value,
+                str(question_count),
+                prompt_version,
+            ]
+        )
+
+    def get(self, key: str) -> Quiz | None:
+        """
+        保持しているクイズを無作為に1つ返す
+
+        保持しているクイズがvariants個に満たない場合は、新たに生成させるためNoneを返す。
+        """
+        with self._lock:
+            variants = self._get_variants(key)
+        if len(variants) < self.variants:
+            return None
+        return random.choice(variants).quiz
+
+    def add(self, key: str, quiz: Quiz) -> None:
+        """生成したクイズを追加する。variants個を超えた場合は古いものから削除する"""
+        with self._lock:
+            variants = self._get_variants(key)
+            variants.append(QuizVariant(created_at=time.time(), quiz=quiz))
+            variants = variants[-self.variants :]
+            if self.store is not None:
+                self.store.set(key, self._serialize(variants))
+            else:
+                self._set_memory(key, variants)
+
+    def _get_variants(self, key: str) -> List[QuizVariant]:
+        """有効期限内のクイズを、ディスクがあればディスク、なければメモリから返す"""
+        if self.store is not None:
+            value = self.store.get(key)
+            variants = self._deserialize(value) if value is not None else []
+        else:
+            variants = self._memory.get(key)
+            self._touch(key)
+
+        threshold = time.time() - self.ttl_seconds
+        return [v for v in variants or [] if v.created_at >= threshold]
+
+    def _set_memory(self, key: str, variants: List[QuizVariant]) -> None:
+        self._memory[key] = variants
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _touch(self, key: str) -> None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+
+    @staticmethod
+    def _serialize(variants: List[QuizVariant]) -> bytes:
+        return json.dumps([v.model_dump(mode="json") for v in variants]).encode()
+
+    @staticmethod
+    def _deserialize(value: bytes) -> List[QuizVariant]:
+        try:
+            return [QuizVariant.model_validate(v) for v in json.loads(value)]
+        except Exception as e:
+            logger.warning(f"Failed to load cached quiz: {str(e)}")
+            return []
+
+
+@lru_cache(maxsize=1)
+def get_quiz_result_cache() -> QuizResultCache | None:
+    """プロセス内で共有するクイズのキャッシュを返す。無効な場合はNone"""
+    if not settings.quiz_cache.QUIZ_CACHE_ENABLED:
+        return None
+
+    store = None
+    if settings.quiz_cache.QUIZ_CACHE_PATH:
+        store = SQLiteKVStore(
+            path=settings.quiz_cache.QUIZ_CACHE_PATH,
+            max_bytes=settings.quiz_cache.QUIZ_CACHE_MAX_BYTES,
+            ttl_seconds=settings.quiz_cache.QUIZ_CACHE_TTL_SECONDS,
+        )
+
+    return QuizResultCache(
+        variants=settings.quiz_cache.QUIZ_CACHE_VARIANTS,
+        ttl_seconds=settings.quiz_cache.QUIZ_CACHE_TTL_SECONDS,
+        memory_entries=settings.quiz_cache.QUIZ_CACHE_MEMORY_ENTRIES,
+        store=store,
+    )
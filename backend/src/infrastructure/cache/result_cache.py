@@ -0,0 +1,117 @@
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from pydantic import Field, PrivateAttr
+
+from src.domain.entities.results import UserAnswer
+from src.domain.repositories.storage_repository import StorageService
+from src.infrastructure.cache.sqlite_store import SQLiteKVStore
+from src.infrastructure.monitoring.metrics import RESULT_CACHE_LOOKUPS
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class CachedStorageService(StorageService):
+    """
+    保存した回答をキャッシュするストレージ
+
+    回答は一度だけ保存され変わらないため、初回の取得時にキャッシュへ入れ、
+    以降はストレージに問い合わせずに返す。保存済みのIDへの保存は無視されるため、
+    保存時のデータはキャッシュせず、実際に保存されている回答を取得時に読み込む。
+    メモリ（LRU）とディスク（SQLite）の2段で保持し、メモリにない場合はディスクを参照する。
+    ディスクはプロセス間で共有できる。
+    """
+
+    storage: StorageService = Field(..., description="元のストレージ")
+    memory_entries: int = Field(..., description="メモリに保持する回答の数の上限")
+    store: Optional[SQLiteKVStore] = Field(
+        default=None, description="ディスクの保存先。Noneの場合はメモリのみ"
+    )
+
+    # 呼び出し側での変更がキャッシュに残らないよう、JSONのまま保持する
+    _memory: "OrderedDict[str, bytes]" = PrivateAttr(default_factory=OrderedDict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def save_quiz(self, quiz_id: str, data_dict: Dict[str, Any]) -> str:
+        return self.storage.save_quiz(quiz_id, data_dict)
+
+    def get_result(self, quiz_id: str) -> UserAnswer | None:
+        with self._lock:
+            value = self._memory.get(quiz_id)
+            if value is not None:
+                self._memory.move_to_end(quiz_id)
+        if value is not None:
+            RESULT_CACHE_LOOKUPS.inc(result="memory")
+            return json.loads(value)
+
+        value = self._get_disk(quiz_id)
+        if value is not None:
+            RESULT_CACHE_LOOKUPS.inc(result="disk")
+            self._set_memory(quiz_id, value)
+            return json.loads(value)
+
+        RESULT_CACHE_LOOKUPS.inc(result="miss")
+        result = self.storage.get_result(quiz_id)
+        # 存在しない回答は後から保存される可能性があるため、キャッシュしない
+        if result is not None:
+            self._save(quiz_id, json.dumps(result, ensure_ascii=False).encode())
+        return result
+
+    def close(self) -> None:
+        self.storage.close()
+
+    def _save(self, quiz_id: str, value: bytes) -> None:
+        self._set_memory(quiz_id, value)
+        if self.store is None:
+            return
+        try:
+            self.store.set(quiz_id, value)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write result cache: {str(e)}")
+
+    def _get_disk(self, quiz_id: str) -> bytes | None:
+        if self.store is None:
+            return None
+        try:
+            return self.store.get(quiz_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read result cache: {str(e)}")
+            return None
+
+    def _set_memory(self, quiz_id: str, value: bytes) -> None:
+        with self._lock:
+            self._memory[quiz_id] = value
+            self._memory.move_to_end(quiz_id)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+
+def with_result_cache(storage: StorageService) -> StorageService:
+    """設定に応じてストレージをキャッシュ付きのものに包んで返す"""
+    if not settings.storage.RESULT_CACHE_ENABLED or isinstance(
+        storage, CachedStorageService
+    ):
+        return storage
+
+    store = None
+    if settings.storage.RESULT_CACHE_PATH:
+        try:
+            store = SQLiteKVStore(
+                path=settings.storage.RESULT_CACHE_PATH,
+                max_bytes=settings.storage.RESULT_CACHE_MAX_BYTES,
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Result disk cache is unavailable: {str(e)}")
+
+    return CachedStorageService(
+        storage=storage,
+        memory_entries=settings.storage.RESULT_CACHE_MEMORY_ENTRIES,
+        store=store,
+    )
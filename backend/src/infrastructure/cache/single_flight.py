@@ -0,0 +1,46 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from pydantic import BaseModel, PrivateAttr
+
+
+logger = logging.getLogger(__name__)
+
+
+T = TypeVar("T")
+
+
+class SingleFlight(BaseModel):
+    """
+    同じキーに対する同時実行中の非同期処理を1回にまとめるモデル
+
+    実行中の処理がある場合は新たに実行せず、その結果（または例外）を共有する。
+    処理が終わるとキーは解放され、次の呼び出しでは再び実行される。
+    """
+
+    _calls: Dict[str, asyncio.Task] = PrivateAttr(default_factory=dict)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """キーに対する処理を実行する。実行中の処理があればその結果を待つ"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._finish(key, task))
+        else:
+            logger.debug(f"Joining in-flight call: {key}")
+
+        # 待っている呼び出し元がキャンセルされても、共有している処理は止めない
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        """キーに対する処理が実行中かどうかを返す"""
+        return key in self._calls
+
+    def _finish(self, key: str, task: Any) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 待っていた呼び出し元が全てキャンセルされた場合も、例外を取得済みにして記録する
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"In-flight call failed: {key}: {str(task.exception())}")
@@ -0,0 +1,151 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteKVStore(BaseModel):
+    """
+    ローカルディスク上のSQLiteを使ったキーバリューストア
+
+    最終アクセス時刻を記録し、合計サイズがmax_bytesを超えた場合は
+    最も長く参照されていないエントリから削除する（LRU）。
+    読み込みのたびに書き込みが発生しないよう、最終アクセス時刻は
+    touch_interval_seconds以上経過したエントリのみ更新する。
+    """
+
+    path: str = Field(..., description="SQLiteファイルのパス")
+    max_bytes: int = Field(..., description="保存する値の合計サイズの上限")
+    ttl_seconds: Optional[int] = Field(
+        default=None, description="エントリの有効期限（秒）。Noneの場合は無期限"
+    )
+    touch_interval_seconds: float = Field(
+        default=60.0, description="最終アクセス時刻を更新する最小の間隔（秒）"
+    )
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    _conn: sqlite3.Connection = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context) -> None:
+        dir_path = os.path.dirname(self.path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS kv_last_access ON kv (last_access)")
+        conn.commit()
+        self._conn = conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        """キーに対応する値を返す。存在しない場合はNone"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """複数のキーに対応する値をまとめて取得する"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        now = time.time()
+        found: Dict[str, bytes] = {}
+        touched: List[Tuple[float, str]] = []
+        with self._lock:
+            # SQLiteのバインド変数の上限を超えないように分割して問い合わせる
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT key, value, created_at, last_access FROM kv "
+                    f"WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, value, created_at, last_access in rows:
+                    if self._is_expired(created_at, now):
+                        continue
+                    found[key] = value
+                    if now - last_access >= self.touch_interval_seconds:
+                        touched.append((now, key))
+
+            if touched:
+                self._conn.executemany(
+                    "UPDATE kv SET last_access = ? WHERE key = ?", touched
+                )
+                self._conn.commit()
+
+        return found
+
+    def set(self, key: str, value: bytes) -> None:
+        """値を保存する"""
+        self.set_many([(key, value)])
+
+    def set_many(self, items: List[Tuple[str, bytes]]) -> None:
+        """複数の値をまとめて保存し、必要に応じて古いエントリを削除する"""
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO kv (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key, value, len(value), now, now) for key, value in items],
+            )
+            self._conn.commit()
+            self._evict(now)
+
+    def delete(self, key: str) -> None:
+        """キーに対応するエントリを削除する"""
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        """保存されている値の合計サイズを返す"""
+        with self._lock:
+            return self._total_bytes()
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM kv").fetchone()[0]
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self, now: float) -> None:
+        """期限切れのエントリと、上限を超えた分の古いエントリを削除する"""
+        if self.ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM kv WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+
+        total = self._total_bytes()
+        if total > self.max_bytes:
+            # 削除を頻発させないよう、上限の9割まで空ける
+            to_free = total - int(self.max_bytes * 0.9)
+            # 古い順の累積サイズが空ける量に達するまでのエントリを、SQLite内で削除する
+            cursor = self._conn.execute(
+                "DELETE FROM kv WHERE key IN ("
+                "SELECT key FROM ("
+                "SELECT key, size, SUM(size) OVER ("
+                "ORDER BY last_access, key ROWS UNBOUNDED PRECEDING) AS freed "
+                "FROM kv) WHERE freed - size < ?)",
+                (to_free,),
+            )
+            logger.debug(f"Evicted {cursor.rowcount} entries from {self.path}")
+
+        self._conn.commit()
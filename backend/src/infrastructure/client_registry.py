@@ -0,0 +1,82 @@
+import logging
+from typing import Any, Optional
+
+import openai
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+
+from src.domain.repositories.storage_repository import StorageService
+from src.infrastructure.cache.result_cache import with_result_cache
+from src.infrastructure.llm.embeddings_provider import create_embeddings
+from src.infrastructure.storage.storage_provider import create_storage_client
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class ClientRegistry(BaseModel):
+    """
+    プロセス全体で共有する外部サービスのクライアントをまとめたモデル
+
+    アプリケーションの起動時に一度だけ生成し、各リクエストで使い回すことで
+    接続プールを共有し、リクエストごとの初期化や通信を省く。
+    """
+
+    llm: BaseChatModel = Field(..., description="LLMモデル")
+    embeddings: Embeddings = Field(..., description="埋め込みモデル")
+    storage_client: StorageService = Field(..., description="ストレージクライアント")
+    # langchain-openaiの既定の接続プールはプロセス全体で共有されるため、
+    # 終了時に閉じられるよう、このレジストリ専用の接続プールを持つ
+    http_client: Optional[Any] = Field(
+        default=None, description="OpenAIの同期APIの接続プール"
+    )
+    http_async_client: Optional[Any] = Field(
+        default=None, description="OpenAIの非同期APIの接続プール"
+    )
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    async def aclose(self) -> None:
+        """
+        共有のクライアントの接続を閉じる
+
+        アプリケーションの終了時に呼び出す。終了処理を止めないよう、失敗は記録のみ行う。
+        """
+        try:
+            if self.http_async_client is not None:
+                await self.http_async_client.aclose()
+            if self.http_client is not None:
+                self.http_client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close HTTP clients: {str(e)}")
+
+        try:
+            self.storage_client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close storage client: {str(e)}")
+
+
+def create_client_registry() -> ClientRegistry:
+    """設定をもとにクライアントを生成する。GCSを使う場合はバケット取得で通信が発生する"""
+    logger.info("Creating shared clients")
+    http_client = openai.DefaultHttpxClient()
+    http_async_client = openai.DefaultAsyncHttpxClient()
+    return ClientRegistry(
+        llm=ChatOpenAI(
+            model_name=settings.model.GPT_MODEL,
+            http_client=http_client,
+            http_async_client=http_async_client,
+        ),
+        embeddings=create_embeddings(
+            http_client=http_client, http_async_client=http_async_client
+        ),
+        storage_client=with_result_cache(create_storage_client()),
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
@@ -0,0 +1,21 @@
+from typing import List
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+
+class FullContextRetriever(BaseRetriever):
+    """
+    検索を行わず、保持している全てのドキュメントを返すリトリーバー
+
+    検索しても全文が返るような短いドキュメントで、埋め込みとインデックスの作成を
+    省略するために使う。
+    """
+
+    documents: List[Document]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return list(self.documents)
@@ -0,0 +1,166 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+from pydantic import Field, PrivateAttr
+
+from src.domain.entities.quiz_job import QuizJob, QuizJobStatus
+from src.domain.repositories.quiz_job_repository import QuizJobRepository
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryQuizJobRepository(QuizJobRepository):
+    """プロセス内のメモリにジョブを保存するリポジトリ"""
+
+    ttl_seconds: int = Field(..., description="完了したジョブを保持する秒数")
+
+    _jobs: Dict[str, QuizJob] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def save(self, job: QuizJob) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._purge_expired()
+
+    def get(self, job_id: str) -> QuizJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def fail_unfinished(self, error: str) -> int:
+        # メモリ上のジョブはプロセスと共に消えるため、残っているのはこのプロセスのジョブ
+        with self._lock:
+            unfinished = [job for job in self._jobs.values() if not job.is_finished]
+            for job in unfinished:
+                self._jobs[job.id] = job.update(
+                    status=QuizJobStatus.FAILED, error=error
+                )
+        return len(unfinished)
+
+    def _purge_expired(self) -> None:
+        """保持期限を過ぎた完了済みのジョブを削除する"""
+        threshold = time.time() - self.ttl_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.is_finished and job.updated_at < threshold
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class SQLiteQuizJobRepository(QuizJobRepository):
+    """
+    ローカルのSQLiteにジョブを保存するリポジトリ
+
+    同じホスト上の複数のワーカープロセスからジョブの状態を参照できる。
+    ジョブを実行しているプロセスのIDを記録し、終了したプロセスのジョブを判別する。
+    """
+
+    path: str = Field(..., description="SQLiteファイルのパス")
+    ttl_seconds: int = Field(..., description="完了したジョブを保持する秒数")
+
+    _conn: sqlite3.Connection = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context) -> None:
+        dir_path = os.path.dirname(self.path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS quiz_jobs ("
+            "id TEXT PRIMARY KEY, data TEXT NOT NULL, "
+            "finished INTEGER NOT NULL, updated_at REAL NOT NULL, owner INTEGER)"
+        )
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(quiz_jobs)")]
+        if "owner" not in columns:
+            conn.execute("ALTER TABLE quiz_jobs ADD COLUMN owner INTEGER")
+        conn.commit()
+        self._conn = conn
+
+    def save(self, job: QuizJob) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quiz_jobs "
+                "(id, data, finished, updated_at, owner) VALUES (?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    job.model_dump_json(),
+                    int(job.is_finished),
+                    job.updated_at,
+                    os.getpid(),
+                ),
+            )
+            self._conn.execute(
+                "DELETE FROM quiz_jobs WHERE finished = 1 AND updated_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> QuizJob | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM quiz_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return QuizJob.model_validate_json(row[0])
+
+    def fail_unfinished(self, error: str) -> int:
+        # 他のワーカープロセスが実行中のジョブは対象にしない
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, owner FROM quiz_jobs WHERE finished = 0"
+            ).fetchall()
+            orphaned = [
+                QuizJob.model_validate_json(data).update(
+                    status=QuizJobStatus.FAILED, error=error
+                )
+                for data, owner in rows
+                if not _is_process_alive(owner)
+            ]
+            self._conn.executemany(
+                "UPDATE quiz_jobs SET data = ?, finished = 1, updated_at = ? "
+                "WHERE id = ?",
+                [(job.model_dump_json(), job.updated_at, job.id) for job in orphaned],
+            )
+            self._conn.commit()
+        return len(orphaned)
+
+
+def _is_process_alive(pid: int | None) -> bool:
+    """同じホスト上でプロセスが実行中かどうかを返す"""
+    if not pid or pid == os.getpid():
+        # このプロセスは起動直後のため、記録済みのジョブは前回のプロセスのもの
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def create_quiz_job_repository() -> QuizJobRepository:
+    """設定に応じたジョブのリポジトリを生成する"""
+    if settings.job.JOB_STORE == "sqlite":
+        logger.info(f"Using SQLite job store: {settings.job.JOB_DB_PATH}")
+        return SQLiteQuizJobRepository(
+            path=settings.job.JOB_DB_PATH, ttl_seconds=settings.job.JOB_TTL_SECONDS
+        )
+
+    if settings.job.JOB_STORE != "memory":
+        raise ValueError(f"Unknown JOB_STORE: {settings.job.JOB_STORE}")
+
+    return InMemoryQuizJobRepository(ttl_seconds=settings.job.JOB_TTL_SECONDS)
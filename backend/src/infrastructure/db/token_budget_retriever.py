@@ -0,0 +1,51 @@
+from typing import Any, List
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStoreRetriever
+
+from src.infrastructure.llm.token_counter import count_tokens
+
+
+class TokenBudgetRetriever(VectorStoreRetriever):
+    """
+    検索結果を関連度の高い順に、合計トークン数が上限に収まるまで返すリトリーバー
+
+    上限を超える場合でも、最も関連度の高いドキュメントは必ず返す。
+    """
+
+    max_tokens: int
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun, **kwargs: Any
+    ) -> List[Document]:
+        documents = super()._get_relevant_documents(
+            query, run_manager=run_manager, **kwargs
+        )
+        return self._fit_budget(documents)
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: AsyncCallbackManagerForRetrieverRun,
+        **kwargs: Any,
+    ) -> List[Document]:
+        documents = await super()._aget_relevant_documents(
+            query, run_manager=run_manager, **kwargs
+        )
+        return self._fit_budget(documents)
+
+    def _fit_budget(self, documents: List[Document]) -> List[Document]:
+        selected = []
+        total = 0
+        for document in documents:
+            tokens = count_tokens(document.page_content)
+            if selected and total + tokens > self.max_tokens:
+                break
+            selected.append(document)
+            total += tokens
+        return selected
@@ -0,0 +1,205 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List
+
+import faiss
+from pydantic import Field, PrivateAttr
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from src.domain.repositories.vectordb_repository import VectorIndexStore
+from src.infrastructure.cache.embedding_cache import get_embeddings_model_name
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "index.pkl"
+
+
+class FAISSIndexStoreImpl(VectorIndexStore):
+    """
+    作成したFAISSインデックスをローカルディスクに保持するストア
+
+    インデックスはメモリマップで読み込み、最近使ったものはメモリにも保持する。
+    ディスク上の合計サイズがmax_bytesを超えた場合は、最も長く使われていない
+    インデックスから削除する（LRU）。
+    """
+
+    root_path: str = Field(..., description="インデックスを保存するディレクトリ")
+    max_bytes: int = Field(..., description="保存するインデックスの合計サイズの上限")
+    memory_entries: int = Field(
+        default=16, description="メモリに保持するインデックスの数の上限"
+    )
+
+    _memory: "OrderedDict[str, FAISS]" = PrivateAttr(default_factory=OrderedDict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context) -> None:
+        os.makedirs(self.root_path, exist_ok=True)
+
+    def build_key(self, documents: List[Document], embeddings: Embeddings) -> str:
+        digest = hashlib.sha256(get_embeddings_model_name(embeddings).encode("utf-8"))
+        for document in documents:
+            digest.update(b"\0")
+            digest.update(document.page_content.encode("utf-8"))
+            digest.update(
+                json.dumps(document.metadata, sort_keys=True, default=str).encode()
+            )
+        return digest.hexdigest()
+
+    def get(self, key: str, embeddings: Embeddings) -> FAISS | None:
+        with self._lock:
+            vectorstore = self._memory.get(key)
+            if vectorstore is not None:
+                self._memory.move_to_end(key)
+                self._touch(key)
+                logger.debug(f"Index store memory hit: {key}")
+                return self._bind(vectorstore, embeddings)
+
+        dir_path = self._dir_path(key)
+        if not os.path.isdir(dir_path):
+            return None
+
+        try:
+            vectorstore = self._load(dir_path, embeddings)
+        except Exception as e:
+            logger.warning(f"Failed to load index {key}: {str(e)}")
+            return None
+
+        with self._lock:
+            self._set_memory(key, vectorstore)
+            self._touch(key)
+        logger.debug(f"Index store disk hit: {key}")
+        return vectorstore
+
+    def put(self, key: str, vectorstore: VectorStore) -> None:
+        dir_path = self._dir_path(key)
+        # 書き込み途中のインデックスを読まないよう、一時ディレクトリに保存してから置き換える
+        tmp_path = os.path.join(self.root_path, f".tmp-{uuid.uuid4().hex}")
+        try:
+            vectorstore.save_local(tmp_path)
+            if os.path.isdir(dir_path):
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            else:
+                os.replace(tmp_path, dir_path)
+        except Exception as e:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            logger.warning(f"Failed to save index {key}: {str(e)}")
+            return
+
+        with self._lock:
+            self._set_memory(key, vectorstore)
+            self._evict()
+
+    def total_bytes(self) -> int:
+        """保存されているインデックスの合計サイズを返す"""
+        return sum(size for _, _, size in self._list_entries())
+
+    def _dir_path(self, key: str) -> str:
+        return os.path.join(self.root_path, key)
+
+    @staticmethod
+    def _bind(vectorstore: FAISS, embeddings: Embeddings) -> FAISS:
+        """
+        インデックスと文書を共有したまま、呼び出し元の埋め込みモデルを使うFAISSを返す
+
+        保持しているFAISSを書き換えると、同時に検索中の他のリクエストに影響するため複製する。
+        """
+        bound = copy.copy(vectorstore)
+        bound.embedding_function = embeddings
+        return bound
+
+    @staticmethod
+    def _load(dir_path: str, embeddings: Embeddings) -> FAISS:
+        """インデックスをメモリマップで読み込む"""
+        index = faiss.read_index(
+            os.path.join(dir_path, INDEX_FILE),
+            faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY,
+        )
+        # 自身が保存したファイルのみを読み込む
+        with open(os.path.join(dir_path, DOCSTORE_FILE), "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+    def _set_memory(self, key: str, vectorstore: FAISS) -> None:
+        self._memory[key] = vectorstore
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _touch(self, key: str) -> None:
+        """最終利用時刻としてディレクトリの更新時刻を使う"""
+        try:
+            os.utime(self._dir_path(key))
+        except OSError:
+            pass
+
+    def _list_entries(self) -> List[tuple]:
+        """(キー, 最終利用時刻, サイズ)のリストを返す"""
+        entries = []
+        for key in os.listdir(self.root_path):
+            dir_path = self._dir_path(key)
+            if key.startswith(".") or not os.path.isdir(dir_path):
+                continue
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(dir_path, name))
+                    for name in os.listdir(dir_path)
+                )
+                entries.append((key, os.path.getmtime(dir_path), size))
+            except OSError:
+                continue
+        return entries
+
+    def _evict(self) -> None:
+        """上限を超えた分の古いインデックスを削除する"""
+        entries = self._list_entries()
+        total = sum(size for _, _, size in entries)
+        if total <= self.max_bytes:
+            return
+
+        # 削除を頻発させないよう、上限の9割まで空ける
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for key, _, size in sorted(entries, key=lambda entry: entry[1]):
+            if total <= target:
+                break
+            shutil.rmtree(self._dir_path(key), ignore_errors=True)
+            self._memory.pop(key, None)
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} indexes from {self.root_path}")
+
+
+@lru_cache(maxsize=1)
+def get_vector_index_store() -> FAISSIndexStoreImpl | None:
+    """プロセス内で共有するインデックスのストアを返す。無効な場合はNone"""
+    if not settings.embeddings.INDEX_STORE_ENABLED:
+        return None
+
+    try:
+        return FAISSIndexStoreImpl(
+            root_path=settings.embeddings.INDEX_STORE_PATH,
+            max_bytes=settings.embeddings.INDEX_STORE_MAX_BYTES,
+            memory_entries=settings.embeddings.INDEX_STORE_MEMORY_ENTRIES,
+        )
+    except OSError as e:
+        logger.warning(f"Index store is unavailable: {str(e)}")
+        return None
@@ -1,11 +1,12 @@
 import logging
 import os
-from typing import List, Optional
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
 
 from langchain_community.vectorstores import FAISS
 from langchain_core.vectorstores import VectorStoreRetriever
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 
 from src.infrastructure.exceptions.vectordb_exceptions import (
     InvalidDocumentError,
@@ -15,6 +16,9 @@ from src.infrastructure.exceptions.vectordb_exceptions import (
     VectorStoreSaveError,
 )
 from src.domain.repositories.vectordb_repository import VectorStoreHandler
+from src.infrastructure.cache.embedding_cache import with_embedding_cache
+from src.infrastructure.db.token_budget_retriever import TokenBudgetRetriever
+from src.infrastructure.llm.embedding_scheduler import with_embedding_scheduler
 
 from config.settings import settings
 
@@ -22,9 +26,63 @@ from config.settings import settings
 logger = logging.getLogger(__name__)
 
 
-def get_faiss_index(doc: List[Document], embeddings: OpenAIEmbeddings) -> FAISS:
+def get_faiss_index(doc: List[Document], embeddings: Embeddings) -> FAISS:
     """FAISSインデックスのインスタンスを返す関数"""
-    return FAISS.from_documents(doc, embeddings)
+    return FAISS.from_documents(doc, with_embedding_cache(embeddings))
+
+
+async def aget_faiss_index(
+    doc: Iterable[Document], embeddings: Embeddings
+) -> FAISS:
+    """
+    FAISSインデックスのインスタンスを非同期で生成して返す関数
+
+    チャンクをEMBEDDING_BATCH_SIZE件ずつ埋め込んでインデックスに追加するため、
+    ジェネレーターを渡した場合も全てのチャンクをまとめてリストにしない。
+    """
+    # 埋め込みはキャッシュを参照し、キャッシュにないものだけをスケジューラー経由で問い合わせる
+    cached_embeddings = with_embedding_cache(with_embedding_scheduler(embeddings))
+    vectorstore = None
+    for batch in iter_batches(doc, settings.embeddings.EMBEDDING_BATCH_SIZE):
+        texts = [document.page_content for document in batch]
+        vectors = await cached_embeddings.aembed_documents(texts)
+        metadatas = [document.metadata for document in batch]
+        if vectorstore is None:
+            vectorstore = FAISS.from_embeddings(
+                zip(texts, vectors), cached_embeddings, metadatas=metadatas
+            )
+        else:
+            vectorstore.add_embeddings(zip(texts, vectors), metadatas=metadatas)
+
+    if vectorstore is None:
+        error_msg = "Cannot create vectorstore from empty document list"
+        logger.error(error_msg)
+        raise InvalidDocumentError(error_msg)
+    return vectorstore
+
+
+def iter_batches(doc: Iterable[Document], batch_size: int) -> Iterator[List[Document]]:
+    """ドキュメントをbatch_size件ずつのリストに分けて順に返す関数"""
+    iterator = iter(doc)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def create_retriever(vectorstore: FAISS) -> VectorStoreRetriever:
+    """
+    ベクトルストアからリトリーバーを生成する関数
+
+    CONTEXT_MAX_TOKENSが設定されている場合、検索結果の合計トークン数をその値までに抑える。
+    """
+    search_kwargs = {"k": settings.embeddings.SEARCH_KWARGS}
+    if settings.embeddings.CONTEXT_MAX_TOKENS <= 0:
+        return vectorstore.as_retriever(search_kwargs=search_kwargs)
+
+    return TokenBudgetRetriever(
+        vectorstore=vectorstore,
+        search_kwargs=search_kwargs,
+        max_tokens=settings.embeddings.CONTEXT_MAX_TOKENS,
+    )
 
 
 class VectorStoreHandlerImpl(VectorStoreHandler):
@@ -32,7 +90,7 @@ class VectorStoreHandlerImpl(VectorStoreHandler):
     FAISSインデックスを操作するために必要なメソッドの実態をここで定義する
     """
 
-    embeddings_model: OpenAIEmbeddings
+    embeddings_model: Embeddings
     vectorstore: Optional[FAISS] = None
 
     def set_vectorstore(self, document: List[Document]) -> "VectorStoreHandlerImpl":
@@ -42,7 +100,9 @@ class VectorStoreHandlerImpl(VectorStoreHandler):
             raise InvalidDocumentError(error_msg)
 
         try:
-            vectorstore = FAISS.from_documents(document, self.embeddings_model)
+            vectorstore = FAISS.from_documents(
+                document, with_embedding_cache(self.embeddings_model)
+            )
 
             return VectorStoreHandlerImpl(
                 embeddings_model=self.embeddings_model,
@@ -87,11 +147,15 @@ class VectorStoreHandlerImpl(VectorStoreHandler):
             logger.error(error_msg, exc_info=True)
             raise VectorStoreSaveError(error_msg)
 
-    def as_retriever(self, dir_path: str) -> VectorStoreRetriever:
+    def as_retriever(self, dir_path: str | None = None) -> VectorStoreRetriever:
         """
         ベクトルストアからリトリーバー（検索機能）を返します。
+        dir_pathが指定されない場合はメモリ上のベクトルストアをそのまま使います。
         """
 
+        if dir_path is None:
+            return self._as_in_memory_retriever()
+
         if not dir_path:
             error_msg = "Directory path cannot be empty"
             logger.error(error_msg)
@@ -106,9 +170,7 @@ class VectorStoreHandlerImpl(VectorStoreHandler):
             vectorstore = FAISS.load_local(
                 dir_path, self.embeddings_model, allow_dangerous_deserialization=True
             )
-            retriever = vectorstore.as_retriever(
-                search_kwargs={"k": settings.embeddings.SEARCH_KWARGS}
-            )
+            retriever = create_retriever(vectorstore)
             logger.info(
                 f"Successfully loaded vectorstore from {dir_path} and created retriever"
             )
@@ -123,3 +185,14 @@ class VectorStoreHandlerImpl(VectorStoreHandler):
             error_msg = f"Failed to load vectorstore from {dir_path}: {str(e)}"
             logger.error(error_msg, exc_info=True)
             raise VectorStoreLoadError(error_msg)
+
+    def _as_in_memory_retriever(self) -> VectorStoreRetriever:
+        """メモリ上のベクトルストアからリトリーバーを生成する"""
+        if not self.vectorstore:
+            error_msg = "Vectorstore instance is not initialized"
+            logger.error(error_msg)
+            raise VectorStoreNotInitializedError(error_msg)
+
+        retriever = create_retriever(self.vectorstore)
+        logger.info("Created retriever from in-memory vectorstore")
+        return retriever
@@ -1,19 +1,18 @@
 import logging
-from typing import List
+from typing import Iterable, Iterator, List
 from pydantic import Field
 
-from langchain_text_splitters import CharacterTextSplitter, TextSplitter
+from langchain_text_splitters import TextSplitter
 from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents import Document
 
 from src.domain.service.doc_creator import DocumentCreator
+from src.infrastructure.llm.text_splitter import create_text_splitter
 from src.infrastructure.exceptions.llm_exceptions import (
     DocumentLoadError,
     DocumentSplitException,
 )
 
-from config.settings import settings
-
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +24,7 @@ class DocumentLoaderImpl(DocumentCreator):
         ..., description="ドキュメントロードインスタンス"
     )
     text_splitter: TextSplitter = Field(
-        default_factory=lambda: CharacterTextSplitter(
-            chunk_size=settings.text_splitter.CHUNK_SIZE,
-            chunk_overlap=settings.text_splitter.CHUNK_OVERLAP,
-        ),
+        default_factory=create_text_splitter,
         description="テキストスプリッターインスタンス",
     )
 
@@ -42,16 +38,34 @@ class DocumentLoaderImpl(DocumentCreator):
             logger.error(error_msg, exc_info=True)
             raise DocumentLoadError(error_msg)
 
+    async def aload_document(self) -> List[Document]:
+        """対象のドキュメントを非同期で読み込む関数"""
+        try:
+            documents = await self.document_loader.aload()
+            return documents
+        except Exception as e:
+            error_msg = f"Failed to load document: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise DocumentLoadError(error_msg)
+
     def split_document(self, document: List[Document]) -> List[Document]:
         """受け取ったドキュメントを分割する関数"""
         if not document:
             logger.warning("Empty document list provided for splitting")
             return []
 
-        try:
-            splitted_document = self.text_splitter.split_documents(document)
+        return list(self.iter_chunks(document))
 
-            return splitted_document
+    def iter_chunks(self, document: Iterable[Document]) -> Iterator[Document]:
+        """
+        受け取ったドキュメントを分割し、チャンクを1つずつ順に返す関数
+
+        全てのチャンクのリストを作らずに、ドキュメントごとに分割して返す。
+        """
+        try:
+            for doc in document:
+                for text in self.text_splitter.split_text(doc.page_content):
+                    yield Document(page_content=text, metadata=dict(doc.metadata))
         except ValueError as e:
             error_msg = f"Invalid document format for splitting: {str(e)}"
             logger.error(error_msg, exc_info=True)
@@ -1,18 +1,17 @@
 import logging
-from typing import List
+from typing import Iterable, Iterator, List
 from pydantic import Field
 
-from langchain_text_splitters import CharacterTextSplitter, TextSplitter
+from langchain_text_splitters import TextSplitter
 from langchain_core.documents import Document
 
 from src.domain.service.doc_creator import DocumentCreator
+from src.infrastructure.llm.text_splitter import create_text_splitter
 from src.infrastructure.exceptions.llm_exceptions import (
     DocumentSplitException,
     TranslationError,
 )
 
-from config.settings import settings
-
 
 logger = logging.getLogger(__name__)
 
@@ -21,21 +20,23 @@ class DocumentTranslateImpl(DocumentCreator):
     """ドキュメントの翻訳を行うクラスの抽象クラス"""
 
     text_splitter: TextSplitter = Field(
-        default_factory=lambda: CharacterTextSplitter(
-            chunk_size=settings.text_splitter.CHUNK_SIZE,
-            chunk_overlap=settings.text_splitter.CHUNK_OVERLAP,
-        ),
+        default_factory=create_text_splitter,
         description="テキストスプリッターインスタンス",
     )
 
     def translate_str_into_doc(self, text: str) -> List[Document]:
         """str型の文字列をDocument型に変換する関数"""
+        return list(self.iter_text_chunks(text))
+
+    def iter_text_chunks(self, text: str) -> Iterator[Document]:
+        """
+        str型の文字列を分割し、チャンクごとのDocument型を順に返す関数
+
+        分割は1回だけ行うため、返されたチャンクをsplit_documentで再度分割する必要はない。
+        """
         try:
-            texts = self.text_splitter.split_text(text)
-            documents = [
-                Document(page_content=txt, metadata={"source": "text"}) for txt in texts
-            ]
-            return documents
+            for txt in self.text_splitter.split_text(text):
+                yield Document(page_content=txt, metadata={"source": "text"})
         except Exception as e:
             error_msg = f"Failed to translate string to document: {str(e)}"
             logger.error(error_msg, exc_info=True)
@@ -47,10 +48,18 @@ class DocumentTranslateImpl(DocumentCreator):
             logger.warning("Empty document list provided for splitting")
             return []
 
-        try:
-            splitted_document = self.text_splitter.split_documents(document)
+        return list(self.iter_chunks(document))
+
+    def iter_chunks(self, document: Iterable[Document]) -> Iterator[Document]:
+        """
+        受け取ったドキュメントを分割し、チャンクを1つずつ順に返す関数
 
-            return splitted_document
+        全てのチャンクのリストを作らずに、ドキュメントごとに分割して返す。
+        """
+        try:
+            for doc in document:
+                for text in self.text_splitter.split_text(doc.page_content):
+                    yield Document(page_content=text, metadata=dict(doc.metadata))
         except ValueError as e:
             error_msg = f"Invalid document format for splitting: {str(e)}"
             logger.error(error_msg, exc_info=True)
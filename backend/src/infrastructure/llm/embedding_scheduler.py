@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, List, Set, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from langchain_core.embeddings import Embeddings
+
+from src.application.service.executor import run_blocking
+from src.infrastructure.cache.embedding_cache import get_embeddings_model_name
+from src.infrastructure.llm.embeddings_provider import is_local_embeddings
+from src.infrastructure.llm.token_counter import count_tokens
+from src.infrastructure.llm.usage_tracker import record_embedding_usage
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# レート制限（429）の再試行間隔の上限（秒）
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class _EmbeddingRequest(BaseModel):
+    texts: List[str]
+    tokens: int
+    future: asyncio.Future
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+def _sum_tokens(texts: List[str]) -> int:
+    """チャンクの合計トークン数を返す"""
+    return sum(count_tokens(text) for text in texts)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """プロバイダーのレート制限（HTTP 429）によるエラーかどうかを返す"""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code == 429
+
+
+def get_retry_after(error: Exception) -> float | None:
+    """エラーのレスポンスにRetry-Afterが含まれていれば、その秒数を返す"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class EmbeddingScheduler(BaseModel):
+    """
+    複数のリクエストの埋め込みをまとめてプロバイダーに問い合わせるスケジューラー
+
+    同時に届いたチャンクを最大max_batch_size件のバッチにまとめ、
+    max_concurrency件まで並行して問い合わせる。1分あたりのトークン数が
+    tokens_per_minuteを超えないよう待機し、429が返された場合は間隔を空けて再試行する。
+    """
+
+    embeddings: Embeddings = Field(..., description="元の埋め込みモデル")
+    max_batch_size: int = Field(default=512, description="1回で埋め込むチャンクの数")
+    max_batch_tokens: int = Field(
+        default=100_000, description="1回で埋め込むチャンクの合計トークン数"
+    )
+    batch_wait_seconds: float = Field(
+        default=0.01, description="他のリクエストのチャンクを待つ秒数"
+    )
+    max_concurrency: int = Field(default=4, description="並行して問い合わせる数")
+    tokens_per_minute: int = Field(
+        default=0, description="1分あたりのトークン数の上限。0の場合は無制限"
+    )
+    max_retries: int = Field(default=5, description="429が返された場合の再試行回数")
+    initial_backoff_seconds: float = Field(
+        default=1.0, description="429が返された場合の最初の再試行間隔"
+    )
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    _loop: asyncio.AbstractEventLoop | None = PrivateAttr(default=None)
+    _queue: asyncio.Queue | None = PrivateAttr(default=None)
+    _worker: asyncio.Task | None = PrivateAttr(default=None)
+    _semaphore: asyncio.Semaphore | None = PrivateAttr(default=None)
+    _usage_lock: asyncio.Lock | None = PrivateAttr(default=None)
+    _usage: Deque[Tuple[float, int]] = PrivateAttr(default_factory=deque)
+    _tasks: Set[asyncio.Task] = PrivateAttr(default_factory=set)
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """チャンクを埋め込みのキューに追加し、結果を待つ"""
+        if not texts:
+            return []
+
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for start in range(0, len(texts), self.max_batch_size):
+            chunk = texts[start : start + self.max_batch_size]
+            # トークナイザーによる計算はチャンク数に比例するため、イベントループの外で行う
+            tokens = await run_blocking(_sum_tokens, chunk)
+            future = loop.create_future()
+            await self._queue.put(
+                _EmbeddingRequest(texts=chunk, tokens=tokens, future=future)
+            )
+            futures.append(future)
+            # バッチは他のリクエストとまとめられるため、呼び出し元のリクエストの使用量として記録する
+            record_embedding_usage(1, tokens)
+
+        results = await asyncio.gather(*futures)
+        return [vector for vectors in results for vector in vectors]
+
+    def _ensure_worker(self) -> None:
+        """実行中のイベントループでキューを処理するタスクを起動する"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker is not None and not self._worker.done():
+            return
+
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._usage_lock = asyncio.Lock()
+        self._worker = loop.create_task(self._run_worker())
+
+    async def _run_worker(self) -> None:
+        carry: _EmbeddingRequest | None = None
+        while True:
+            first = carry or await self._queue.get()
+            carry = None
+            if self.batch_wait_seconds > 0:
+                # 同時に届く他のリクエストのチャンクを少しだけ待ってまとめる
+                await asyncio.sleep(self.batch_wait_seconds)
+
+            batch = [first]
+            size, tokens = len(first.texts), first.tokens
+            while not self._queue.empty():
+                request = self._queue.get_nowait()
+                if (
+                    size + len(request.texts) > self.max_batch_size
+                    or tokens + request.tokens > self.max_batch_tokens
+                ):
+                    carry = request
+                    break
+                batch.append(request)
+                size += len(request.texts)
+                tokens += request.tokens
+
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._run_batch(batch, tokens))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[_EmbeddingRequest], tokens: int) -> None:
+        texts = [text for request in batch for text in request.texts]
+        try:
+            await self._acquire_tokens(tokens)
+            logger.debug(
+                f"Embedding batch of {len(texts)} chunks from {len(batch)} requests"
+            )
+            vectors = await self._aembed_with_retry(texts)
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        finally:
+            self._semaphore.release()
+
+        offset = 0
+        for request in batch:
+            if not request.future.done():
+                request.future.set_result(
+                    vectors[offset : offset + len(request.texts)]
+                )
+            offset += len(request.texts)
+
+    async def _acquire_tokens(self, tokens: int) -> None:
+        """直近1分間のトークン数が上限を超えないよう、必要なら待機する"""
+        if self.tokens_per_minute <= 0:
+            return
+
+        async with self._usage_lock:
+            while True:
+                now = time.monotonic()
+                while self._usage and now - self._usage[0][0] >= 60:
+                    self._usage.popleft()
+
+                used = sum(used_tokens for _, used_tokens in self._usage)
+                # 1回で上限を超えるバッチは、直近の使用がない場合に限り実行する
+                if not self._usage or used + tokens <= self.tokens_per_minute:
+                    self._usage.append((now, tokens))
+                    return
+
+                wait_seconds = self._usage[0][0] + 60 - now
+                logger.info(
+                    f"Embedding token budget reached, waiting {wait_seconds:.1f}s"
+                )
+                await asyncio.sleep(wait_seconds)
+
+    async def _aembed_with_retry(self, texts: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.embeddings.aembed_documents(texts)
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+
+                delay = get_retry_after(e) or min(
+                    self.initial_backoff_seconds * 2**attempt * (1 + random.random()),
+                    MAX_BACKOFF_SECONDS,
+                )
+                logger.warning(
+                    f"Embedding rate limited, retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{self.max_retries})"
+                )
+                await asyncio.sleep(delay)
+
+
+class ScheduledEmbeddings(BaseModel, Embeddings):
+    """非同期の埋め込みをEmbeddingSchedulerを経由して行う埋め込みモデル"""
+
+    scheduler: EmbeddingScheduler = Field(..., description="埋め込みのスケジューラー")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    @property
+    def model(self) -> str:
+        return get_embeddings_model_name(self.scheduler.embeddings)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.scheduler.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.scheduler.aembed(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.scheduler.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.scheduler.embeddings.aembed_query(text)
+
+
+# 埋め込みモデルごとに共有するスケジューラー（キーは埋め込みモデルのid）
+_schedulers: "OrderedDict[int, Tuple[Embeddings, EmbeddingScheduler]]" = OrderedDict()
+_schedulers_lock = threading.Lock()
+_SCHEDULERS_MAX_SIZE = 4
+
+
+def get_embedding_scheduler(embeddings: Embeddings) -> EmbeddingScheduler:
+    """埋め込みモデルに対応する、プロセス内で共有するスケジューラーを返す"""
+    key = id(embeddings)
+    with _schedulers_lock:
+        cached = _schedulers.get(key)
+        if cached is not None and cached[0] is embeddings:
+            _schedulers.move_to_end(key)
+            return cached[1]
+
+        scheduler = EmbeddingScheduler(
+            embeddings=embeddings,
+            max_batch_size=settings.embeddings.EMBEDDING_MAX_BATCH_SIZE,
+            max_batch_tokens=settings.embeddings.EMBEDDING_MAX_BATCH_TOKENS,
+            batch_wait_seconds=settings.embeddings.EMBEDDING_BATCH_WAIT_MS / 1000,
+            max_concurrency=settings.embeddings.EMBEDDING_MAX_CONCURRENCY,
+            tokens_per_minute=settings.embeddings.EMBEDDING_TOKENS_PER_MINUTE,
+            max_retries=settings.embeddings.EMBEDDING_MAX_RETRIES,
+        )
+        _schedulers[key] = (embeddings, scheduler)
+        while len(_schedulers) > _SCHEDULERS_MAX_SIZE:
+            _schedulers.popitem(last=False)
+        return scheduler
+
+
+def with_embedding_scheduler(embeddings: Embeddings) -> Embeddings:
+    """設定に応じて埋め込みモデルをスケジューラー経由のものに包んで返す"""
+    if (
+        not settings.embeddings.EMBEDDING_SCHEDULER_ENABLED
+        or isinstance(embeddings, ScheduledEmbeddings)
+        # ローカルで計算する埋め込みはレート制限がなく、まとめる必要もない
+        or is_local_embeddings(embeddings)
+    ):
+        return embeddings
+    return ScheduledEmbeddings(scheduler=get_embedding_scheduler(embeddings))
@@ -0,0 +1,46 @@
+import logging
+from typing import Any, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+from src.infrastructure.llm.hashing_embeddings import HashingEmbeddings
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def create_embeddings(
+    http_client: Optional[Any] = None,
+    http_async_client: Optional[Any] = None,
+) -> Embeddings:
+    """
+    設定に応じた埋め込みモデルを生成する
+
+    Args:
+        http_client: OpenAIの同期APIで使う接続プール。省略時は既定の接続プールを使う
+        http_async_client: OpenAIの非同期APIで使う接続プール
+
+    Returns:
+        Embeddings: 埋め込みモデル
+    """
+    provider = settings.model.EMBEDDINGS_PROVIDER
+    if provider == "local":
+        logger.info("Using local hashing embeddings")
+        return HashingEmbeddings(size=settings.model.LOCAL_EMBEDDINGS_SIZE)
+
+    if provider != "openai":
+        raise ValueError(f"Unknown EMBEDDINGS_PROVIDER: {provider}")
+
+    return OpenAIEmbeddings(
+        model=settings.model.TEXT_EMBEDDINGS_MODEL,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+
+
+def is_local_embeddings(embeddings: Embeddings) -> bool:
+    """外部APIを呼び出さない埋め込みモデルかどうかを返す"""
+    return isinstance(embeddings, HashingEmbeddings)
@@ -0,0 +1,64 @@
+import re
+import unicodedata
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+from langchain_core.embeddings import Embeddings
+
+
+class HashingEmbeddings(BaseModel, Embeddings):
+    """
+    ネットワークを使わずCPUだけで計算する埋め込みモデル
+
+    正規化したテキストの文字n-gramを、ハッシュ値で固定次元のベクトルに割り当てる
+    （feature hashing）。単語の区切りがない日本語にもそのまま使える。
+    """
+
+    size: int = Field(default=1024, description="ベクトルの次元数")
+    ngram_range: Tuple[int, int] = Field(
+        default=(2, 3), description="使用する文字n-gramの長さの範囲"
+    )
+
+    model_config = ConfigDict(frozen=True)
+
+    @property
+    def model(self) -> str:
+        min_n, max_n = self.ngram_range
+        return f"hashing-{self.size}-{min_n}-{max_n}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    def _embed(self, text: str) -> List[float]:
+        normalized = re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text).lower())
+        normalized = normalized.strip()
+
+        vector = np.zeros(self.size, dtype=np.float32)
+        for gram in self._ngrams(normalized):
+            hashed = zlib.crc32(gram.encode("utf-8"))
+            # 衝突による偏りを打ち消すよう、ハッシュ値の最上位ビットで符号を決める
+            sign = -1.0 if hashed >> 31 else 1.0
+            vector[hashed % self.size] += sign
+
+        # 繰り返し出現するn-gramの影響を抑える
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def _ngrams(self, text: str) -> List[str]:
+        min_n, max_n = self.ngram_range
+        if 0 < len(text) < min_n:
+            return [text]
+        return [
+            text[i : i + n]
+            for n in range(min_n, max_n + 1)
+            for i in range(len(text) - n + 1)
+        ]
@@ -0,0 +1,127 @@
+import json
+import logging
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+
+from src.domain.entities.question import Question
+from src.domain.service.quiz_reviewer import QuizReviewer
+from src.domain.service.quiz_validator import QuizIssue
+
+
+logger = logging.getLogger(__name__)
+
+
+REVIEW_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You are EvaluateAgent that reviews quizzes. "
+            "An automatic check found possible issues in some questions. "
+            "For each suspected issue, read the question, options, answer and "
+            "explanation, and decide whether it is a real problem. "
+            "Return only the issues that are real problems, with a short "
+            "description of what must be fixed. Return an empty list if none are.",
+        ),
+        ("human", "Questions:\n{questions}\n\nSuspected issues:\n{issues}"),
+    ]
+)
+
+OUTPUT_REVIEW_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "You are EvaluateAgent that reviews quizzes. Your task is to analyze a quiz and identify any issues.\n\n"
+            "Review Process:\n"
+            "1. Check if the quiz has EXACTLY the specified number of questions.\n"
+            "2. Verify each question has a valid answer (must be one of: A, B, C, or D).\n"
+            "3. Ensure the explanation for each question correctly matches the chosen answer.\n"
+            "4. Check for any inconsistencies or errors in the content.\n\n"
+            "If issues are found, explain them in detail. If no issues are found, simply state 'The quiz looks good.'\n"
+            "Your role is to provide feedback - you don't need to directly modify the quiz.",
+        ),
+        ("human", "Requested number of questions: {question_count}\n\n{output}"),
+    ]
+)
+
+
+class ReviewedIssue(BaseModel):
+    index: int = Field(..., description="問題の番号（0始まり）")
+    message: str = Field(..., description="修正が必要な内容")
+
+
+class ReviewResult(BaseModel):
+    issues: List[ReviewedIssue] = Field(
+        default_factory=list, description="実際に問題があると判断した問題点のリスト"
+    )
+
+
+class QuizReviewerImpl(QuizReviewer):
+    """LLMを用いてクイズの意味的な問題点を確認するモデル"""
+
+    def review(
+        self, questions: List[Question], issues: List[QuizIssue]
+    ) -> List[QuizIssue]:
+        result = self._create_review_chain().invoke(
+            self._build_review_input(questions, issues)
+        )
+        return self._to_issues(result, issues)
+
+    async def areview(
+        self, questions: List[Question], issues: List[QuizIssue]
+    ) -> List[QuizIssue]:
+        result = await self._create_review_chain().ainvoke(
+            self._build_review_input(questions, issues)
+        )
+        return self._to_issues(result, issues)
+
+    def review_output(self, output: str, question_count: int) -> str:
+        return self._create_output_review_chain().invoke(
+            {"output": output, "question_count": question_count}
+        )
+
+    async def areview_output(self, output: str, question_count: int) -> str:
+        return await self._create_output_review_chain().ainvoke(
+            {"output": output, "question_count": question_count}
+        )
+
+    def _create_review_chain(self) -> Runnable:
+        chain = REVIEW_PROMPT | self.llm.with_structured_output(ReviewResult)
+        return chain.with_config(metadata={"llm_role": "reviewer"})
+
+    def _create_output_review_chain(self) -> Runnable:
+        chain = OUTPUT_REVIEW_PROMPT | self.llm | StrOutputParser()
+        return chain.with_config(metadata={"llm_role": "reviewer"})
+
+    @staticmethod
+    def _build_review_input(
+        questions: List[Question], issues: List[QuizIssue]
+    ) -> dict:
+        return {
+            "questions": json.dumps(
+                [
+                    {"index": index, **question.model_dump()}
+                    for index, question in enumerate(questions)
+                ],
+                ensure_ascii=False,
+            ),
+            "issues": "\n".join(
+                f"- index {issue.index}: {issue.message}" for issue in issues
+            ),
+        }
+
+    @staticmethod
+    def _to_issues(result: ReviewResult, issues: List[QuizIssue]) -> List[QuizIssue]:
+        """LLMが問題ありと判断したものを、確認を依頼した問題点の中から返す"""
+        suspected = {issue.index for issue in issues}
+        confirmed = [
+            QuizIssue(index=reviewed.index, message=reviewed.message)
+            for reviewed in result.issues
+            if reviewed.index in suspected
+        ]
+        logger.info(f"LLM confirmed {len(confirmed)} of {len(issues)} suspected issues")
+        return confirmed
@@ -1,17 +1,29 @@
 import logging
 import json
+import threading
+from collections import OrderedDict
 from operator import itemgetter
-from typing import Any
+from typing import Any, List, Tuple
 
-from langchain_core.tools import tool
+from pydantic import Field
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
 from langchain_core.vectorstores import VectorStoreRetriever
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.runnables import Runnable
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langgraph.config import get_stream_writer
+from langgraph.graph import END, START, MessagesState, StateGraph
 from langgraph_supervisor import create_supervisor
 from langgraph.prebuilt import create_react_agent
 
-from src.domain.entities.quiz import Quiz
+from src.domain.entities.question import Question
+from src.domain.entities.quiz import QuestionBatch, Quiz
+from src.domain.entities.quiz_event import QuizEvent, QuizEventHandler, QuizEventType
+from src.domain.service.quiz_validator import QuizIssue, QuizValidator
 from src.domain.service.rag_agent import RAGAgentModel
+from src.infrastructure.llm.quiz_reviewer import QuizReviewerImpl
 from src.infrastructure.exceptions.llm_exceptions import (
     LLMResponseParsingError,
     RAGChainExecutionError,
@@ -22,37 +34,104 @@ from src.infrastructure.exceptions.llm_exceptions import (
 logger = logging.getLogger(__name__)
 
 
+# コンパイル済みのグラフをLLMごとに共有する（キーはLLMインスタンスのid）
+_GRAPH_CACHE_SIZE = 4
+_graph_cache: "OrderedDict[int, Tuple[BaseChatModel, Any]]" = OrderedDict()
+_graph_cache_lock = threading.Lock()
+
+
+def _write_stream_event(payload: dict) -> None:
+    """LangGraphのカスタムストリームにイベントを書き込む。グラフ外では何もしない"""
+    try:
+        writer = get_stream_writer()
+    except (RuntimeError, KeyError):
+        # グラフ外での呼び出しは、LangGraphのバージョンによって例外の種類が異なる
+        return
+    writer(payload)
+
+
+def _notify_retrieved(
+    documents: List[Document], config: RunnableConfig
+) -> List[Document]:
+    """
+    検索結果の件数を通知し、検索結果をそのまま返す
+
+    configにon_eventが渡されている場合（Chainの直接実行）はコールバックに、
+    それ以外（グラフの実行）はLangGraphのカスタムストリームに通知する。
+    """
+    on_event = (config.get("configurable") or {}).get("on_event")
+    if on_event is not None:
+        on_event(
+            QuizEvent(type=QuizEventType.RETRIEVED, data={"documents": len(documents)})
+        )
+    else:
+        _write_stream_event({"stage": "retrieved", "documents": len(documents)})
+    return documents
+
+
+def _format_feedback(issues: List[QuizIssue]) -> str:
+    """検証で見つかった問題点を評価エージェントのフィードバックの形式にする"""
+    if not issues:
+        return "The quiz looks good."
+    return " ".join(issue.message for issue in issues)
+
+
+def _get_rag_chain(config: RunnableConfig) -> Runnable:
+    """グラフの実行時に渡されたRAG Chainを取り出す"""
+    rag_chain = (config.get("configurable") or {}).get("rag_chain")
+    if rag_chain is None:
+        raise RAGChainExecutionError("RAG chain is not given to the graph config")
+    return rag_chain
+
+
 class RAGAgentModelImpl(RAGAgentModel):
     """RAG Agentを実装し、クイズを生成するモデル"""
 
+    retriever: Any = Field(default=None, description="文脈を検索するRetriever")
+    batch_chain: Any = Field(
+        default=None, description="問題数の制約なしに問題を生成するChain"
+    )
+    slice_chain: Any = Field(
+        default=None, description="与えられた文脈から問題を生成するChain"
+    )
+
     def __init__(
         self, llm: BaseChatModel, prompt: Any, retriever: VectorStoreRetriever
     ):
         super().__init__(llm=llm, prompt=prompt)
         # rag を実行するchainの作成
         self.rag_chain = self._set_rag_chain(retriever=retriever)
+        self.batch_chain = self._set_rag_chain(
+            retriever=retriever, output_schema=QuestionBatch
+        )
+        # 並列生成では検索を一度だけ行い、分割した文脈をChainに直接渡す
+        self.retriever = retriever
+        self.slice_chain = self.prompt | self.llm.with_structured_output(QuestionBatch)
 
-        # create_graph()の中でToolsからtoolを取得し、グラフを生成する
-        self.graph = self._create_graph()
-
-    def _create_chain(self, retriever: VectorStoreRetriever) -> Runnable:
+    def _create_chain(
+        self, retriever: VectorStoreRetriever, output_schema: type = Quiz
+    ) -> Runnable:
         """RAGを実行するためのChainを生成する"""
         rag_chain = (
             {
                 "question_count": itemgetter("question_count"),
                 "difficulty": itemgetter("difficulty"),
                 "input": itemgetter("input"),
-                "context": itemgetter("input") | retriever,
+                "context": itemgetter("input")
+                | retriever
+                | RunnableLambda(_notify_retrieved),
             }
             | self.prompt
-            | self.llm.with_structured_output(Quiz)
+            | self.llm.with_structured_output(output_schema)
         )
         return rag_chain
 
-    def _set_rag_chain(self, retriever: VectorStoreRetriever) -> Runnable:
+    def _set_rag_chain(
+        self, retriever: VectorStoreRetriever, output_schema: type = Quiz
+    ) -> Runnable:
         """RAGを実行するためのChainをクラスに設定する"""
         try:
-            rag_chain = self._create_chain(retriever)
+            rag_chain = self._create_chain(retriever, output_schema)
             return rag_chain
 
         except Exception as e:
@@ -88,23 +167,384 @@ class RAGAgentModelImpl(RAGAgentModel):
             logger.error(error_msg, exc_info=True)
             raise RAGChainExecutionError(error_msg)
 
-    def _create_graph(self):
+    async def ainvoke_chain(
+        self,
+        question_count: int,
+        difficulty: str,
+        on_event: QuizEventHandler | None = None,
+    ) -> "Quiz":
+        """RAG Chainの非同期実行"""
+        if not self.rag_chain:
+            error_msg = "RAG chain is not initialized. Call set_rag_chain first."
+            logger.error(error_msg)
+            raise RAGChainExecutionError(error_msg)
+
+        try:
+            response = await self._ainvoke_generation(
+                self.rag_chain,
+                {
+                    "input": f"Generate {question_count} quiz questions of difficulty '{difficulty}'.",
+                    "question_count": question_count,
+                    "difficulty": difficulty,
+                },
+                on_event,
+            )
+            logger.info(response)
+            self._emit_generated(on_event, 1, response.questions)
+            return response
+
+        except ValueError as e:
+            error_msg = f"Failed to parse LLM response: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise LLMResponseParsingError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Error while invoking RAG Chain with question_count={question_count} and difficulty={difficulty}: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise RAGChainExecutionError(error_msg)
+
+    async def ainvoke_validated_chain(
+        self,
+        question_count: int,
+        difficulty: str,
+        max_retries: int,
+        on_event: QuizEventHandler | None = None,
+    ) -> "Quiz":
+        """
+        RAG Chainでクイズを生成し、ローカルで検証する
+
+        LLMによる確認はローカルで判断できない問題点がある場合のみ行い、
+        検証に失敗した問題だけを最大max_retries回まで生成し直す。
+        上限に達しても問題が残る場合は、その時点のクイズを返す。
+        問題数が足りない場合はクイズにできないため、LLMResponseParsingErrorを送出する。
+        """
+        if not self.batch_chain:
+            error_msg = "RAG chain is not initialized. Call set_rag_chain first."
+            logger.error(error_msg)
+            raise RAGChainExecutionError(error_msg)
+
+        try:
+            # 問題数が指定と異なる場合も検証・再生成で補えるよう、
+            # 最初の生成から問題数の制約がないスキーマで出力させる
+            batch = await self._ainvoke_generation(
+                self.batch_chain,
+                {
+                    "input": f"Generate {question_count} quiz questions of difficulty '{difficulty}'.",
+                    "question_count": question_count,
+                    "difficulty": difficulty,
+                },
+                on_event,
+            )
+            # 指定より多く生成された分は検証の前に切り捨てる
+            questions = list(batch.questions)[:question_count]
+            self._emit_generated(on_event, 1, questions)
+
+            questions = await self._arepair_questions(
+                questions, question_count, difficulty, max_retries, on_event
+            )
+            return self._build_quiz(questions, question_count)
+
+        except (LLMResponseParsingError, RAGChainExecutionError):
+            raise
+
+        except ValueError as e:
+            error_msg = f"Failed to parse LLM response: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise LLMResponseParsingError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Error while invoking validated RAG Chain with question_count={question_count} and difficulty={difficulty}: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise RAGChainExecutionError(error_msg)
+
+    async def ainvoke_parallel_chain(
+        self,
+        question_count: int,
+        difficulty: str,
+        max_retries: int,
+        max_concurrency: int,
+        on_event: QuizEventHandler | None = None,
+    ) -> "Quiz":
+        """
+        検索した文脈を分割し、分割ごとの問題を並列に生成してクイズにまとめる
+
+        1回の呼び出しで全問を出力させる場合に比べ、出力トークン数に比例する待ち時間を
+        分割数で割ることができる。同時に実行する呼び出しはmax_concurrencyまでとし、
+        まとめた後はvalidated_chainと同じく検証して不足分を生成し直す。
+        """
+        if not self.retriever or not self.slice_chain or not self.batch_chain:
+            error_msg = "RAG chain is not initialized. Call set_rag_chain first."
+            logger.error(error_msg)
+            raise RAGChainExecutionError(error_msg)
+
+        try:
+            documents = await self.retriever.ainvoke(
+                f"Generate {question_count} quiz questions "
+                f"of difficulty '{difficulty}'."
+            )
+            if on_event is not None:
+                on_event(
+                    QuizEvent(
+                        type=QuizEventType.RETRIEVED,
+                        data={"documents": len(documents)},
+                    )
+                )
+
+            slices = self._split_context(documents, question_count)
+            logger.info(
+                f"Generating {question_count} questions in {len(slices)} slices"
+            )
+            results = await self.slice_chain.abatch(
+                [
+                    {
+                        "input": (
+                            f"Generate {count} quiz questions of difficulty "
+                            f"'{difficulty}' about the given context."
+                        ),
+                        "question_count": count,
+                        "difficulty": difficulty,
+                        "context": context,
+                    }
+                    for context, count in slices
+                ],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True,
+            )
+
+            questions: List[Question] = []
+            for result in results:
+                # 失敗した分割の問題は、検証後の再生成で補う
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to generate questions: {str(result)}")
+                    continue
+                questions.extend(result.questions)
+            # 指定より多く生成された分は検証の前に切り捨てる
+            questions = QuizValidator().deduplicate(questions)[:question_count]
+            self._emit_generated(on_event, 1, questions)
+
+            questions = await self._arepair_questions(
+                questions, question_count, difficulty, max_retries, on_event
+            )
+            return self._build_quiz(questions, question_count)
+
+        except (LLMResponseParsingError, RAGChainExecutionError):
+            raise
+
+        except ValueError as e:
+            error_msg = f"Failed to parse LLM response: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise LLMResponseParsingError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Error while invoking parallel RAG Chain with question_count={question_count} and difficulty={difficulty}: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise RAGChainExecutionError(error_msg)
+
+    @staticmethod
+    def _split_context(
+        documents: List[Document], question_count: int
+    ) -> List[Tuple[List[Document], int]]:
+        """
+        検索結果を連続した分割に分け、分割ごとに生成する問題数を割り当てる
+
+        Returns:
+            分割した文脈と、その文脈から生成する問題数の組のリスト
+        """
+        slice_count = max(1, min(question_count, len(documents)))
+        slices = []
+        for i in range(slice_count):
+            start = i * len(documents) // slice_count
+            end = (i + 1) * len(documents) // slice_count
+            count = question_count // slice_count + (
+                1 if i < question_count % slice_count else 0
+            )
+            slices.append((documents[start:end], count))
+        return slices
+
+    @staticmethod
+    def _build_quiz(questions: List[Question], question_count: int) -> Quiz:
+        """指定した問題数が揃っている場合のみ、問題をクイズにまとめる"""
+        if len(questions) < question_count:
+            error_msg = (
+                f"Only {len(questions)} of {question_count} questions were generated "
+                "after retries"
+            )
+            logger.error(error_msg)
+            raise LLMResponseParsingError(error_msg)
+        return Quiz(questions=questions[:question_count])
+
+    async def _arepair_questions(
+        self,
+        questions: List[Question],
+        question_count: int,
+        difficulty: str,
+        max_retries: int,
+        on_event: QuizEventHandler | None,
+    ) -> List[Question]:
+        """
+        問題をローカルで検証し、失敗した問題だけを最大max_retries回まで生成し直す
+
+        LLMによる確認はローカルで判断できない問題点がある場合のみ行う。
+        上限に達しても問題が残る場合は、その時点の問題を返す。
+        """
+        validator = QuizValidator()
+        reviewer = QuizReviewerImpl(llm=self.llm)
+
+        attempt = 1
+        while True:
+            issues = await reviewer.aconfirm(
+                questions, validator.find_issues(questions, question_count)
+            )
+            self._emit_evaluated(on_event, attempt, issues)
+            if not issues:
+                return questions
+            if attempt > max_retries:
+                logger.warning(
+                    f"Quiz still has {len(issues)} issues after {max_retries} retries"
+                )
+                return questions
+
+            attempt += 1
+            questions = await self._aregenerate_questions(
+                questions, issues, question_count, difficulty, on_event
+            )
+            self._emit_generated(on_event, attempt, questions)
+
+    async def _aregenerate_questions(
+        self,
+        questions: List[Question],
+        issues: List[QuizIssue],
+        question_count: int,
+        difficulty: str,
+        on_event: QuizEventHandler | None,
+    ) -> List[Question]:
+        """検証に失敗した問題を除き、足りない分の問題だけを生成し直す"""
+        failed = {issue.index for issue in issues if issue.index is not None}
+        kept = [q for i, q in enumerate(questions) if i not in failed]
+        kept = kept[:question_count]
+        missing = question_count - len(kept)
+        if missing <= 0:
+            return kept
+
+        logger.info(f"Regenerating {missing} of {question_count} questions")
+        instruction = (
+            f"Generate {missing} new quiz questions of difficulty '{difficulty}'. "
+            "Each answer must be exactly one of A, B, C or D. "
+            "Fix these issues found in the previous attempt: "
+            + " ".join(issue.message for issue in issues)
+        )
+        if kept:
+            instruction += " Do not repeat these questions: " + " / ".join(
+                q.question for q in kept
+            )
+
+        batch = await self._ainvoke_generation(
+            self.batch_chain,
+            {
+                "input": instruction,
+                "question_count": missing,
+                "difficulty": difficulty,
+            },
+            on_event,
+        )
+        return kept + list(batch.questions)[:missing]
+
+    @staticmethod
+    async def _ainvoke_generation(
+        chain: Runnable, chain_input: dict, on_event: QuizEventHandler | None
+    ) -> Any:
+        """検索結果の件数をon_eventに通知しながらChainを実行する"""
+        return await chain.ainvoke(
+            chain_input, config={"configurable": {"on_event": on_event}}
+        )
+
+    @staticmethod
+    def _emit_generated(
+        on_event: QuizEventHandler | None,
+        attempt: int,
+        questions: List[Question] | List[dict],
+    ) -> None:
+        """生成された問題数と各問題をイベントとして通知する"""
+        if on_event is None:
+            return
+
+        questions = [
+            q.model_dump() if isinstance(q, Question) else q for q in questions
+        ]
+        on_event(
+            QuizEvent(
+                type=QuizEventType.GENERATED,
+                data={"attempt": attempt, "questionCount": len(questions)},
+            )
+        )
+        for index, question in enumerate(questions):
+            on_event(
+                QuizEvent(
+                    type=QuizEventType.QUESTION,
+                    data={"attempt": attempt, "index": index, "question": question},
+                )
+            )
+
+    @staticmethod
+    def _emit_evaluated(
+        on_event: QuizEventHandler | None, attempt: int, issues: List[QuizIssue]
+    ) -> None:
+        """検証結果をイベントとして通知する"""
+        if on_event is None:
+            return
+
+        on_event(
+            QuizEvent(
+                type=QuizEventType.EVALUATED,
+                data={"attempt": attempt, "feedback": _format_feedback(issues)},
+            )
+        )
+
+    def _get_graph(self) -> Any:
+        """
+        コンパイル済みのグラフを返す
+
+        グラフはリクエストに依存しないため、同じLLMに対して一度だけ構築して共有する。
+        リクエストごとのRAG Chainは実行時にconfigから渡す。
+        """
+        if self.graph is not None:
+            return self.graph
+
+        key = id(self.llm)
+        with _graph_cache_lock:
+            cached = _graph_cache.get(key)
+            # idが再利用された別インスタンスのグラフは使わない
+            if cached is not None and cached[0] is self.llm:
+                _graph_cache.move_to_end(key)
+                self.graph = cached[1]
+                return self.graph
+
+            graph = self._create_graph(self.llm)
+            _graph_cache[key] = (self.llm, graph)
+            while len(_graph_cache) > _GRAPH_CACHE_SIZE:
+                _graph_cache.popitem(last=False)
+
+        self.graph = graph
+        return graph
+
+    def _graph_config(self, question_count: int) -> RunnableConfig:
+        """グラフの実行時に渡すconfigを生成する"""
+        return {
+            "configurable": {
+                "rag_chain": self.rag_chain,
+                "question_count": question_count,
+            }
+        }
+
+    @staticmethod
+    def _create_graph(llm: BaseChatModel):
         """LangGraphを用いてAIエージェントを構築する"""
         try:
             logger.info("Creating LangGraph with Supervisor architecture")
 
-            @tool
-            def generate_quiz_tool(
-                question_count: int,
-                difficulty: str,
-                instruction: str | None = None,
-            ) -> Quiz | None:
-                """
-                文脈を取得し、クイズを生成するツール
-                1. retrieverで文脈を取得
-                2. 文脈が短すぎるとNoneを返す
-                3. RAG Chainを呼び出し、Quizを生成する
-                """
+            def build_quiz_input(
+                question_count: int, difficulty: str, instruction: str | None
+            ) -> dict:
                 quiz_input = {
                     "input": instruction
                     or f"Generate {question_count} quiz questions of difficulty '{difficulty}'.",
@@ -112,21 +552,68 @@ class RAGAgentModelImpl(RAGAgentModel):
                     "difficulty": difficulty,
                 }
                 logger.debug(f"Invoking chain with parameters: {quiz_input}")
+                return quiz_input
+
+            def generate_quiz(
+                question_count: int,
+                difficulty: str,
+                config: RunnableConfig,
+                instruction: str | None = None,
+            ) -> dict | None:
+                try:
+                    result = _get_rag_chain(config).invoke(
+                        build_quiz_input(question_count, difficulty, instruction)
+                    )
+                    logger.debug(
+                        f"Generated quiz with {len(result.questions)} questions"
+                    )
+                    _write_stream_event(
+                        {"stage": "generated", "quiz": result.model_dump()}
+                    )
+                    # 評価エージェントが解析できるよう、JSONとしてエージェントに返す
+                    return result.model_dump()
+                except Exception as e:
+                    logger.error(f"Error Generating quiz: {str(e)}")
+                    return None
 
+            async def agenerate_quiz(
+                question_count: int,
+                difficulty: str,
+                config: RunnableConfig,
+                instruction: str | None = None,
+            ) -> dict | None:
                 try:
-                    result = self.rag_chain.invoke(quiz_input)
+                    result = await _get_rag_chain(config).ainvoke(
+                        build_quiz_input(question_count, difficulty, instruction)
+                    )
                     logger.debug(
                         f"Generated quiz with {len(result.questions)} questions"
                     )
-                    return result
+                    _write_stream_event(
+                        {"stage": "generated", "quiz": result.model_dump()}
+                    )
+                    return result.model_dump()
                 except Exception as e:
                     logger.error(f"Error Generating quiz: {str(e)}")
                     return None
 
+            # graph.invoke / graph.ainvoke のどちらから呼ばれても動くよう同期・非同期の両方を登録する
+            generate_quiz_tool = StructuredTool.from_function(
+                func=generate_quiz,
+                coroutine=agenerate_quiz,
+                name="generate_quiz_tool",
+                description=(
+                    "文脈を取得し、クイズを生成するツール\n"
+                    "1. retrieverで文脈を取得\n"
+                    "2. 文脈が短すぎるとNoneを返す\n"
+                    "3. RAG Chainを呼び出し、Quizを生成する"
+                ),
+            )
+
             # RAGエージェント定義
             logger.info("Creating RAG quiz agent")
-            self.rag_agent = create_react_agent(
-                model=self.llm,
+            rag_agent = create_react_agent(
+                model=llm,
                 # tools=[generate_quiz_tool, output_schema],
                 tools=[generate_quiz_tool],
                 name="rag_quiz_agent",
@@ -142,27 +629,13 @@ class RAGAgentModelImpl(RAGAgentModel):
 
             # 評価エージェント定義
             logger.info("Creating evaluation agent")
-            self.evaluate_agent = create_react_agent(
-                model=self.llm,
-                tools=[],
-                name="evaluate_agent",
-                prompt=(
-                    "You are EvaluateAgent that reviews quizzes. Your task is to analyze a quiz and identify any issues.\n\n"
-                    "Review Process:\n"
-                    "1. Check if the quiz has EXACTLY the specified number of questions.\n"
-                    "2. Verify each question has a valid answer (must be one of: A, B, C, or D).\n"
-                    "3. Ensure the explanation for each question correctly matches the chosen answer.\n"
-                    "4. Check for any inconsistencies or errors in the content.\n\n"
-                    "If issues are found, explain them in detail. If no issues are found, simply state 'The quiz looks good.'\n"
-                    "Your role is to provide feedback - you don't need to directly modify the quiz."
-                ),
-            )
+            evaluate_agent = RAGAgentModelImpl._create_evaluate_agent(llm)
 
             # Supervisor定義
             logger.info("Creating supervisor agent")
             supervisor = create_supervisor(
-                agents=[self.rag_agent, self.evaluate_agent],
-                model=self.llm,
+                agents=[rag_agent, evaluate_agent],
+                model=llm,
                 prompt=(
                     "You are RAGQuizAgent. Follow these steps STRICTLY IN THIS ORDER: "
                     "1. FIRST, generate a quiz based on the stored context using generate_quiz_tool(question_count, difficulty, instruction). "
@@ -191,6 +664,112 @@ class RAGAgentModelImpl(RAGAgentModel):
             logger.error(error_msg, exc_info=True)
             raise RAGChainSetupError(error_msg)
 
+    @staticmethod
+    def _create_evaluate_agent(llm: BaseChatModel) -> Any:
+        """
+        生成されたクイズを評価するエージェントを構築する
+
+        構造的な検証はローカルで行い、LLMはローカルで判断できない問題点がある場合と
+        出力をクイズとして解釈できなかった場合にのみ呼び出す。
+        """
+        validator = QuizValidator()
+        reviewer = QuizReviewerImpl(llm=llm)
+
+        def build_feedback(feedback: str) -> dict:
+            logger.debug(f"Evaluation feedback: {feedback}")
+            return {"messages": [AIMessage(content=feedback, name="evaluate_agent")]}
+
+        def evaluate(state: MessagesState, config: RunnableConfig) -> dict:
+            output, questions, question_count = (
+                RAGAgentModelImpl._get_evaluation_target(state, config)
+            )
+            if questions is None:
+                return build_feedback(reviewer.review_output(output, question_count))
+
+            issues = reviewer.confirm(
+                questions, validator.find_issues(questions, question_count)
+            )
+            return build_feedback(_format_feedback(issues))
+
+        async def aevaluate(state: MessagesState, config: RunnableConfig) -> dict:
+            output, questions, question_count = (
+                RAGAgentModelImpl._get_evaluation_target(state, config)
+            )
+            if questions is None:
+                return build_feedback(
+                    await reviewer.areview_output(output, question_count)
+                )
+
+            issues = await reviewer.aconfirm(
+                questions, validator.find_issues(questions, question_count)
+            )
+            return build_feedback(_format_feedback(issues))
+
+        graph = StateGraph(MessagesState)
+        graph.add_node("evaluate", RunnableLambda(evaluate, afunc=aevaluate))
+        graph.add_edge(START, "evaluate")
+        graph.add_edge("evaluate", END)
+        return graph.compile(name="evaluate_agent")
+
+    @staticmethod
+    def _get_evaluation_target(
+        state: MessagesState, config: RunnableConfig
+    ) -> Tuple[str, List[Question] | None, int]:
+        """
+        評価対象となるRAGエージェントの出力を取り出す
+
+        Returns:
+            出力の文字列、解析した問題のリスト（解析できない場合はNone）、要求された問題数
+        """
+        messages = state["messages"]
+        # 引き継ぎ用のツール呼び出しを除いた、RAGエージェント自身の応答を対象にする
+        target = next(
+            (
+                m
+                for m in reversed(messages)
+                if isinstance(m, AIMessage)
+                and m.name == "rag_quiz_agent"
+                and not m.tool_calls
+            ),
+            messages[-1],
+        )
+        output = target.content if isinstance(target.content, str) else ""
+        questions = RAGAgentModelImpl._parse_questions(output)
+
+        question_count = (config.get("configurable") or {}).get("question_count")
+        if question_count is None:
+            question_count = len(questions) if questions is not None else 0
+        return output, questions, question_count
+
+    @staticmethod
+    def _parse_questions(output: str) -> List[Question] | None:
+        """エージェントの出力をQuestionのリストとして解析する。失敗した場合はNone"""
+        try:
+            data = json.loads(output)
+        except (json.JSONDecodeError, TypeError):
+            return None
+
+        # {"quiz": {"questions": [...]}}, {"quiz": [...]}, {"questions": [...]} に対応
+        if isinstance(data, dict) and "quiz" in data:
+            data = data["quiz"]
+        if isinstance(data, dict):
+            data = data.get("questions")
+        if not isinstance(data, list):
+            return None
+
+        try:
+            return [
+                Question.model_validate(
+                    {
+                        **q,
+                        "answer": q.get("answer", q.get("correctAnswer")),
+                    }
+                )
+                for q in data
+            ]
+        except Exception:
+            return None
+
     def graph_run(
         self,
         question_count: int,
@@ -198,70 +777,42 @@ class RAGAgentModelImpl(RAGAgentModel):
     ) -> Quiz | None:
         """LangGraphを用いてクイズを生成する"""
         try:
-            result = self.graph.invoke(
-                {
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": f"Generate {question_count} quiz questions of difficulty '{difficulty}'.",
-                        }
-                    ]
-                }
+            result = self._get_graph().invoke(
+                self._build_graph_input(question_count, difficulty),
+                config=self._graph_config(question_count),
             )
+            return self._parse_graph_result(result)
 
-            for item in result["messages"]:
-                print(f"Name: {item.name}")
-                print(item.content)
-                print("================")
-
-            # supervisorからの最終出力を処理
-            supervisor_data = None
-            for message in reversed(result["messages"]):
-                if hasattr(message, "name") and message.name == "supervisor":
-                    content = message.content
-                    if (
-                        content
-                        and isinstance(content, str)
-                        and content.strip() not in ["None", ""]
-                    ):
-                        try:
-                            data = json.loads(content)
-                            if "quiz" in data:
-                                quiz_data = data["quiz"]
-                                # 両方の形式に対応
-                                if (
-                                    isinstance(quiz_data, dict)
-                                    and "questions" in quiz_data
-                                ):
-                                    supervisor_data = quiz_data["questions"]
-                                    logger.info(
-                                        f"Found questions from supervisor in nested structure"
-                                    )
-                                elif isinstance(quiz_data, list):
-                                    supervisor_data = quiz_data
-                                    logger.info(
-                                        f"Found questions from supervisor in direct list"
-                                    )
-                        except json.JSONDecodeError:
-                            logger.warning(
-                                f"Failed to parse supervisor content as JSON"
-                            )
-
-                questions = supervisor_data
-                if questions:
-                    # フィールド名を修正する
-                    # AIが誤ったフィールド名で生成する場合があるため
-                    for q in questions:
-                        # correctAnswerフィールドをanswerに変換
-                        if "correctAnswer" in q and "answer" not in q:
-                            q["answer"] = q.pop("correctAnswer")
-
-                logger.info(f"Using valid quiz data with {len(questions)} questions")
-                return Quiz(questions=questions)
-
-            # 有効なクイズデータが見つからなかった場合
-            logger.warning("No valid quiz data found from any source")
-            return None
+        except ValueError as e:
+            error_msg = f"Failed to parse LLM response: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise LLMResponseParsingError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Error while running LangGraph: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise RAGChainExecutionError(error_msg)
+
+    async def agraph_run(
+        self,
+        question_count: int,
+        difficulty: str,
+        on_event: QuizEventHandler | None = None,
+    ) -> Quiz | None:
+        """
+        LangGraphを用いて非同期でクイズを生成する
+
+        on_eventが指定された場合はグラフをストリーミング実行し、
+        検索・生成・評価の途中経過をイベントとして通知する。
+        """
+        try:
+            graph_input = self._build_graph_input(question_count, difficulty)
+            config = self._graph_config(question_count)
+            if on_event is None:
+                result = await self._get_graph().ainvoke(graph_input, config=config)
+            else:
+                result = await self._astream_graph(graph_input, config, on_event)
+            return self._parse_graph_result(result)
 
         except ValueError as e:
             error_msg = f"Failed to parse LLM response: {str(e)}"
@@ -272,3 +823,128 @@ class RAGAgentModelImpl(RAGAgentModel):
             error_msg = f"Error while running LangGraph: {str(e)}"
             logger.error(error_msg, exc_info=True)
             raise RAGChainExecutionError(error_msg)
+
+    async def _astream_graph(
+        self, graph_input: dict, config: RunnableConfig, on_event: QuizEventHandler
+    ) -> dict | None:
+        """グラフをストリーミング実行してイベントを通知し、最終的な状態を返す"""
+        result = None
+        attempt = 0
+        async for namespace, mode, chunk in self._get_graph().astream(
+            graph_input,
+            config=config,
+            stream_mode=["custom", "updates", "values"],
+            subgraphs=True,
+        ):
+            # ツールが書き込んだイベントはサブグラフ内から届く
+            if mode == "custom":
+                stage = chunk.get("stage")
+                if stage == "retrieved":
+                    on_event(
+                        QuizEvent(
+                            type=QuizEventType.RETRIEVED,
+                            data={"documents": chunk["documents"]},
+                        )
+                    )
+                elif stage == "generated":
+                    attempt += 1
+                    self._emit_generated(
+                        on_event, attempt, chunk["quiz"]["questions"]
+                    )
+                continue
+
+            # サブグラフ内の状態更新は無視し、トップレベルのものだけを扱う
+            if namespace:
+                continue
+
+            if mode == "updates" and chunk.get("evaluate_agent"):
+                messages = chunk["evaluate_agent"].get("messages") or []
+                # 引き継ぎ用のツール呼び出しを除いた、評価エージェント自身の応答を取り出す
+                feedback = [
+                    message.content
+                    for message in messages
+                    if isinstance(message, AIMessage)
+                    and message.name == "evaluate_agent"
+                    and not message.tool_calls
+                    and message.content
+                ]
+                on_event(
+                    QuizEvent(
+                        type=QuizEventType.EVALUATED,
+                        data={
+                            "attempt": attempt,
+                            "feedback": feedback[-1] if feedback else "",
+                        },
+                    )
+                )
+            elif mode == "values":
+                result = chunk
+
+        return result
+
+    @staticmethod
+    def _build_graph_input(question_count: int, difficulty: str) -> dict:
+        """グラフに渡す初期メッセージを生成する"""
+        return {
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f"Generate {question_count} quiz questions of difficulty '{difficulty}'.",
+                }
+            ]
+        }
+
+    @staticmethod
+    def _parse_graph_result(result: dict) -> Quiz | None:
+        """グラフの実行結果からsupervisorの最終出力を取り出し、Quizに変換する"""
+        for item in result["messages"]:
+            logger.debug(f"Name: {item.name}\n{item.content}")
+
+        # supervisorからの最終出力を処理
+        supervisor_data = None
+        for message in reversed(result["messages"]):
+            if hasattr(message, "name") and message.name == "supervisor":
+                content = message.content
+                if (
+                    content
+                    and isinstance(content, str)
+                    and content.strip() not in ["None", ""]
+                ):
+                    try:
+                        data = json.loads(content)
+                        if "quiz" in data:
+                            quiz_data = data["quiz"]
+                            # 両方の形式に対応
+                            if (
+                                isinstance(quiz_data, dict)
+                                and "questions" in quiz_data
+                            ):
+                                supervisor_data = quiz_data["questions"]
+                                logger.info(
+                                    f"Found questions from supervisor in nested structure"
+                                )
+                            elif isinstance(quiz_data, list):
+                                supervisor_data = quiz_data
+                                logger.info(
+                                    f"Found questions from supervisor in direct list"
+                                )
+                    except json.JSONDecodeError:
+                        logger.warning(
+                            f"Failed to parse supervisor content as JSON"
+                        )
+
+            questions = supervisor_data
+            if questions:
+                # フィールド名を修正する
+                # AIが誤ったフィールド名で生成する場合があるため
+                for q in questions:
+                    # correctAnswerフィールドをanswerに変換
+                    if "correctAnswer" in q and "answer" not in q:
+                        q["answer"] = q.pop("correctAnswer")
+
+            logger.info(f"Using valid quiz data with {len(questions)} questions")
+            return Quiz(questions=questions)
+
+        # 有効なクイズデータが見つからなかった場合
+        logger.warning("No valid quiz data found from any source")
+        return None
@@ -0,0 +1,66 @@
+import logging
+
+from langchain_text_splitters import (
+    CharacterTextSplitter,
+    RecursiveCharacterTextSplitter,
+    TextSplitter,
+)
+
+from src.infrastructure.llm.token_counter import count_tokens
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# 段落、改行、文末の順に区切り、日本語の文章も文の途中で分割しにくくする
+SEPARATORS = ["\n\n", "\n", "。", "．", ". ", "！", "？", "、", " ", ""]
+
+# インデックスを再利用しやすいよう、チャンクサイズはこの単位で丸める
+CHUNK_TOKENS_STEP = 128
+
+
+def create_text_splitter(chunk_tokens: int | None = None) -> TextSplitter:
+    """
+    トークン数でチャンクを区切るテキストスプリッターを生成する
+
+    TOKEN_CHUNKINGが無効な場合は、文字数で区切る従来のスプリッターを返す。
+    """
+    if not settings.text_splitter.TOKEN_CHUNKING:
+        return CharacterTextSplitter(
+            chunk_size=settings.text_splitter.CHUNK_SIZE,
+            chunk_overlap=settings.text_splitter.CHUNK_OVERLAP,
+        )
+
+    chunk_tokens = chunk_tokens or settings.text_splitter.CHUNK_TOKENS
+    return RecursiveCharacterTextSplitter(
+        separators=SEPARATORS,
+        keep_separator="end",
+        chunk_size=chunk_tokens,
+        chunk_overlap=int(chunk_tokens * settings.text_splitter.CHUNK_OVERLAP_RATIO),
+        length_function=count_tokens,
+    )
+
+
+def choose_chunk_tokens(total_tokens: int, question_count: int) -> int:
+    """
+    ドキュメントのトークン数と問題数からチャンクのトークン数を決める
+
+    1問あたり2チャンク程度に分かれる大きさを基準とし、検索で取得するチャンクが
+    コンテキストの上限に収まるよう、SEARCH_KWARGS個で上限を超えない大きさに抑える。
+    """
+    chunk_tokens = total_tokens // max(question_count * 2, 1)
+
+    context_max_tokens = settings.embeddings.CONTEXT_MAX_TOKENS
+    if context_max_tokens > 0:
+        chunk_tokens = min(
+            chunk_tokens, context_max_tokens // settings.embeddings.SEARCH_KWARGS
+        )
+
+    chunk_tokens = max(
+        settings.text_splitter.CHUNK_MIN_TOKENS,
+        min(chunk_tokens, settings.text_splitter.CHUNK_MAX_TOKENS),
+    )
+    chunk_tokens -= chunk_tokens % CHUNK_TOKENS_STEP
+    return max(chunk_tokens, CHUNK_TOKENS_STEP)
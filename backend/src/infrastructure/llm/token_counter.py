@@ -0,0 +1,53 @@
+import logging
+from functools import lru_cache
+from typing import Iterable
+
+import tiktoken
+from langchain_core.documents import Document
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str | None) -> tiktoken.Encoding | None:
+    """モデルに対応するトークナイザーを返す。取得できない場合はNone"""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        # オフライン環境などでエンコーディングを取得できない場合は概算で数える
+        logger.warning(f"Tokenizer is unavailable, estimating token counts: {e}")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    トークナイザーを使わずにトークン数を概算する
+
+    英数字は約4文字で1トークン、日本語などそれ以外の文字は1文字で約1トークンとして数える。
+    """
+    ascii_chars = sum(1 for char in text if char.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    """テキストのトークン数を返す"""
+    encoding = _get_encoding(model or settings.model.GPT_MODEL)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_document_tokens(
+    documents: Iterable[Document], model: str | None = None
+) -> int:
+    """ドキュメントの本文の合計トークン数を返す"""
+    return sum(count_tokens(document.page_content, model) for document in documents)
@@ -0,0 +1,218 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from src.infrastructure.monitoring.metrics import (
+    EMBEDDING_TOKENS,
+    LLM_CALLS,
+    LLM_TOKENS,
+    QUIZ_LLM_CALLS,
+    QUIZ_TOKENS,
+)
+
+
+# グラフの外（Chainの直接実行）で呼び出されたLLMの役割
+DEFAULT_ROLE = "generator"
+
+
+class RoleUsage(BaseModel):
+    """役割ごとのLLMの呼び出し回数とトークン数"""
+
+    calls: int = Field(default=0, description="LLMの呼び出し回数")
+    errors: int = Field(default=0, description="失敗したLLMの呼び出し回数")
+    prompt_tokens: int = Field(default=0, description="入力トークン数")
+    completion_tokens: int = Field(default=0, description="出力トークン数")
+    cached_tokens: int = Field(
+        default=0, description="入力のうちプロンプトキャッシュから読まれたトークン数"
+    )
+
+
+class UsageReport(BaseModel):
+    """1回のクイズ生成で消費したLLMと埋め込みの使用量"""
+
+    roles: Dict[str, RoleUsage] = Field(
+        default_factory=dict, description="役割ごとのLLMの使用量"
+    )
+    embedding_calls: int = Field(default=0, description="埋め込みの問い合わせ回数")
+    embedding_tokens: int = Field(default=0, description="埋め込んだトークン数")
+
+    @property
+    def llm_calls(self) -> int:
+        return sum(usage.calls for usage in self.roles.values())
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(
+            usage.prompt_tokens + usage.completion_tokens
+            for usage in self.roles.values()
+        )
+
+
+def resolve_role(metadata: Dict[str, Any] | None) -> str:
+    """
+    LLMの呼び出しのメタデータから、呼び出し元の役割を返す
+
+    LangGraphのグラフ内では、名前空間のノード名を繋げたもの
+    （例: supervisor, rag_quiz_agent/tools）を役割とする。
+    グラフの外ではメタデータのllm_roleを使い、なければDEFAULT_ROLEとする。
+    """
+    metadata = metadata or {}
+    namespace = metadata.get("langgraph_checkpoint_ns") or ""
+    names = [segment.split(":")[0] for segment in namespace.split("|") if segment]
+    if names:
+        return "/".join(names)
+    return metadata.get("llm_role") or DEFAULT_ROLE
+
+
+def _extract_tokens(response: LLMResult) -> Tuple[int, int, int]:
+    """LLMの応答から（入力、出力、キャッシュされた入力）のトークン数を取り出す"""
+    prompt_tokens = completion_tokens = cached_tokens = 0
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage = getattr(message, "usage_metadata", None)
+            if not usage:
+                continue
+            found = True
+            prompt_tokens += usage.get("input_tokens", 0)
+            completion_tokens += usage.get("output_tokens", 0)
+            details = usage.get("input_token_details") or {}
+            cached_tokens += details.get("cache_read", 0) or 0
+
+    if not found:
+        # usage_metadataに対応していないモデルはllm_outputから取得する
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = token_usage.get("prompt_tokens", 0) or 0
+        completion_tokens = token_usage.get("completion_tokens", 0) or 0
+        details = token_usage.get("prompt_tokens_details") or {}
+        cached_tokens = details.get("cached_tokens", 0) or 0
+
+    return prompt_tokens, completion_tokens, cached_tokens
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """LLMの呼び出し回数とトークン数を役割ごとに集計するコールバック"""
+
+    # 非同期の呼び出しでもスレッドプールを経由せずに集計する
+    run_inline = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._runs: Dict[UUID, str] = {}
+        self._report = UsageReport()
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id, metadata)
+
+    def on_llm_start(
+        self,
+        serialized: Dict[str, Any],
+        prompts: Any,
+        *,
+        run_id: UUID,
+        metadata: Dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id, metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens, completion_tokens, cached_tokens = _extract_tokens(response)
+        with self._lock:
+            usage = self._pop_run(run_id)
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            usage.cached_tokens += cached_tokens
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        with self._lock:
+            self._pop_run(run_id).errors += 1
+
+    def record_embeddings(self, calls: int, tokens: int) -> None:
+        """プロバイダーに問い合わせた埋め込みの使用量を追加する"""
+        with self._lock:
+            self._report.embedding_calls += calls
+            self._report.embedding_tokens += tokens
+
+    def report(self) -> UsageReport:
+        """これまでの使用量のコピーを返す"""
+        with self._lock:
+            return self._report.model_copy(deep=True)
+
+    def _start(self, run_id: UUID, metadata: Dict[str, Any] | None) -> None:
+        role = resolve_role(metadata)
+        with self._lock:
+            self._runs[run_id] = role
+            self._report.roles.setdefault(role, RoleUsage()).calls += 1
+
+    def _pop_run(self, run_id: UUID) -> RoleUsage:
+        role = self._runs.pop(run_id, DEFAULT_ROLE)
+        return self._report.roles.setdefault(role, RoleUsage())
+
+
+# 実行中のリクエストの集計先。設定されている間は全てのLLMの呼び出しに自動で渡される
+_usage_handler: ContextVar[UsageCallbackHandler | None] = ContextVar(
+    "usage_handler", default=None
+)
+register_configure_hook(_usage_handler, inheritable=True)
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageCallbackHandler]:
+    """
+    ブロック内のLLMの呼び出しと埋め込みの使用量を集計する
+
+    既に集計中の場合は、同じリクエストの使用量として同じ集計先を返す。
+    """
+    handler = _usage_handler.get()
+    if handler is not None:
+        yield handler
+        return
+
+    handler = UsageCallbackHandler()
+    token = _usage_handler.set(handler)
+    try:
+        yield handler
+    finally:
+        _usage_handler.reset(token)
+
+
+def record_usage_metrics(report: UsageReport, difficulty: str) -> None:
+    """1回のクイズ生成の使用量をメトリクスに加算する"""
+    for role, usage in report.roles.items():
+        LLM_CALLS.inc(usage.calls - usage.errors, role=role, outcome="success")
+        LLM_CALLS.inc(usage.errors, role=role, outcome="error")
+        LLM_TOKENS.inc(usage.prompt_tokens, role=role, kind="prompt")
+        LLM_TOKENS.inc(usage.completion_tokens, role=role, kind="completion")
+        LLM_TOKENS.inc(usage.cached_tokens, role=role, kind="cached")
+    EMBEDDING_TOKENS.inc(report.embedding_tokens)
+    # キャッシュから返した場合など、LLMを呼び出さなかったクイズは分布に含めない
+    if report.llm_calls:
+        QUIZ_LLM_CALLS.observe(report.llm_calls, difficulty=difficulty)
+        QUIZ_TOKENS.observe(report.total_tokens, difficulty=difficulty)
+
+
+def record_embedding_usage(calls: int, tokens: int) -> None:
+    """集計中のリクエストがあれば、埋め込みの使用量を追加する"""
+    handler = _usage_handler.get()
+    if handler is not None:
+        handler.record_embeddings(calls, tokens)
@@ -0,0 +1,298 @@
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+
+# 処理時間のヒストグラムのバケット（秒）。スクレイピングやLLMの呼び出しは数十秒かかる
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric(ABC, BaseModel):
+    """Prometheusのテキスト形式で出力するメトリクスの基底クラス"""
+
+    name: str = Field(..., description="メトリクス名")
+    documentation: str = Field(..., description="メトリクスの説明")
+    label_names: Tuple[str, ...] = Field(default=(), description="ラベル名")
+
+    model_config = ConfigDict(frozen=True)
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _label_values(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"Labels {sorted(labels)} do not match {list(self.label_names)}"
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Prometheusのテキスト形式の行を返す"""
+        pass
+
+
+class Counter(Metric):
+    """単調に増加する回数を数えるメトリクス"""
+
+    _values: Dict[Tuple[str, ...], float] = PrivateAttr(default_factory=dict)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                labels = _format_labels(self.label_names, key)
+                lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    """値の分布をバケットごとに数えるメトリクス"""
+
+    buckets: Tuple[float, ...] = Field(
+        default=DEFAULT_BUCKETS, description="バケットの上限値（昇順）"
+    )
+
+    # ラベルの値ごとの（バケットごとの件数、合計値、件数）
+    _values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            if index < len(counts):
+                counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def get_count(self, **labels: str) -> int:
+        with self._lock:
+            return self._values.get(self._label_values(labels), ([], 0.0, 0))[2]
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Tuple[float, int]]:
+        """ラベルの値ごとの（合計値、件数）を返す"""
+        with self._lock:
+            return {
+                key: (total, count) for key, (_, total, count) in self._values.items()
+            }
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bucket_names = self.label_names + ("le",)
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for upper, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(bucket_names, key + (_format_value(upper),))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(bucket_names, key + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+
+                labels = _format_labels(self.label_names, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry(BaseModel):
+    """メトリクスをまとめ、Prometheusのテキスト形式で出力するレジストリ"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    _metrics: Dict[str, Metric] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+QUIZ_STAGE_DURATION: Histogram = registry.register(
+    Histogram(
+        name="readum_quiz_stage_duration_seconds",
+        documentation="Time spent in each stage of quiz creation.",
+        label_names=("stage", "outcome", "difficulty"),
+    )
+)
+QUIZ_REQUESTS: Counter = registry.register(
+    Counter(
+        name="readum_quiz_requests_total",
+        documentation="Quiz creation requests by outcome.",
+        label_names=("outcome", "difficulty"),
+    )
+)
+QUIZ_CACHE_LOOKUPS: Counter = registry.register(
+    Counter(
+        name="readum_quiz_cache_lookups_total",
+        documentation="Quiz result cache lookups by result.",
+        label_names=("result",),
+    )
+)
+RESULT_CACHE_LOOKUPS: Counter = registry.register(
+    Counter(
+        name="readum_result_cache_lookups_total",
+        documentation="Submitted result cache lookups by tier that served them.",
+        label_names=("result",),
+    )
+)
+# ストレージの操作名。保存先によらず同じラベルで比較できるよう、各バックエンドで共通に使う
+STORAGE_SAVE_QUIZ = "save_quiz"
+STORAGE_GET_RESULT = "get_result"
+STORAGE_DURATION: Histogram = registry.register(
+    Histogram(
+        name="readum_storage_operation_duration_seconds",
+        documentation="Time spent in result storage operations.",
+        label_names=("operation", "outcome"),
+    )
+)
+LLM_CALLS: Counter = registry.register(
+    Counter(
+        name="readum_llm_calls_total",
+        documentation="LLM calls by agent role and outcome.",
+        label_names=("role", "outcome"),
+    )
+)
+LLM_TOKENS: Counter = registry.register(
+    Counter(
+        name="readum_llm_tokens_total",
+        documentation="LLM tokens by agent role and kind.",
+        label_names=("role", "kind"),
+    )
+)
+EMBEDDING_TOKENS: Counter = registry.register(
+    Counter(
+        name="readum_embedding_tokens_total",
+        documentation="Tokens sent to the embedding provider.",
+    )
+)
+QUIZ_LLM_CALLS: Histogram = registry.register(
+    Histogram(
+        name="readum_quiz_llm_calls",
+        documentation="LLM calls made to create one quiz.",
+        label_names=("difficulty",),
+        buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+    )
+)
+QUIZ_TOKENS: Histogram = registry.register(
+    Histogram(
+        name="readum_quiz_tokens",
+        documentation="LLM tokens consumed to create one quiz.",
+        label_names=("difficulty",),
+        buckets=(1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000),
+    )
+)
+
+
+# 実行中のクイズ生成の難易度（各段階のメトリクスのラベルに使う）
+_difficulty: ContextVar[str] = ContextVar("metrics_difficulty", default="")
+
+
+@contextmanager
+def bind_difficulty(difficulty: str) -> Iterator[None]:
+    """ブロック内で記録する段階のメトリクスに難易度のラベルを付ける"""
+    token = _difficulty.set(difficulty)
+    try:
+        yield
+    finally:
+        _difficulty.reset(token)
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """ブロックの処理時間を、クイズ生成の段階ごとに成否のラベルを付けて記録する"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        QUIZ_STAGE_DURATION.observe(
+            time.perf_counter() - started,
+            stage=stage,
+            outcome=outcome,
+            difficulty=_difficulty.get(),
+        )
+
+
+@contextmanager
+def track_storage(operation: str) -> Iterator[None]:
+    """ブロックの処理時間を、ストレージの操作ごとに成否のラベルを付けて記録する"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        STORAGE_DURATION.observe(
+            time.perf_counter() - started, operation=operation, outcome=outcome
+        )
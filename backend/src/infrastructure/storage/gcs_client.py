@@ -1,10 +1,16 @@
 import json
 import logging
 from typing import Any, Dict
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from google.cloud import storage
 
 from src.domain.repositories.storage_repository import StorageService
 from src.domain.entities.results import UserAnswer
+from src.infrastructure.monitoring.metrics import (
+    STORAGE_GET_RESULT,
+    STORAGE_SAVE_QUIZ,
+    track_storage,
+)
 
 from config.settings import settings
 
@@ -60,10 +66,19 @@ class GCSClient(StorageService):
             blob = self.bucket.blob(blob_name)
 
             # データをJSON形式で保存
-            blob.upload_from_string(
-                json.dumps(data_dict, ensure_ascii=False, indent=2),
-                content_type="application/json",
-            )
+            # 保存済みの回答を上書きしないよう、オブジェクトが存在しない場合のみ作成する
+            with track_storage(STORAGE_SAVE_QUIZ):
+                try:
+                    blob.upload_from_string(
+                        json.dumps(data_dict, ensure_ascii=False, indent=2),
+                        content_type="application/json",
+                        if_generation_match=0,
+                    )
+                except PreconditionFailed:
+                    logger.warning(
+                        f"Quiz submission already exists, kept it: {blob_name}"
+                    )
+                    return blob_name
 
             logger.info(f"Saved quiz submission to gs://{self.bucket_name}/{blob_name}")
             return blob_name
@@ -86,11 +101,17 @@ class GCSClient(StorageService):
             blob_name = f"{self.prefix}{quiz_id}.json"
             blob = self.bucket.blob(blob_name)
 
-            if not blob.exists():
+            # 存在確認を挟まず、1回の通信で取得する
+            # 見つからない場合も、SQLiteと同様に成功した取得として記録する
+            with track_storage(STORAGE_GET_RESULT):
+                try:
+                    content = blob.download_as_text()
+                except NotFound:
+                    content = None
+            if content is None:
                 logger.warning(f"No submission found for quiz_id: {quiz_id}")
                 return None
 
-            content = blob.download_as_text()
             submission_data = json.loads(content)
 
             logger.info(f"Retrieved quiz submission from {blob_name}")
@@ -99,3 +120,7 @@ class GCSClient(StorageService):
         except Exception as e:
             logger.error(f"Failed to retrieve quiz submission: {str(e)}")
             raise
+
+    def close(self) -> None:
+        """Cloud Storageクライアントの接続を閉じる"""
+        self.storage_client.close()
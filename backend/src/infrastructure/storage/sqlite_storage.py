@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict
+
+from pydantic import Field, PrivateAttr
+
+from src.domain.repositories.storage_repository import StorageService
+from src.domain.entities.results import UserAnswer
+from src.infrastructure.monitoring.metrics import (
+    STORAGE_GET_RESULT,
+    STORAGE_SAVE_QUIZ,
+    track_storage,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteStorageClient(StorageService):
+    """
+    ユーザーの回答をローカルのSQLiteに保存するストレージ
+
+    GCSClientと同じキー（{env}/results/{quiz_id}.json）とJSONで保存する。
+    単一ノードの構成やローカルでの開発・負荷試験で、GCSの代わりに使う。
+    """
+
+    path: str = Field(..., description="SQLiteファイルのパス")
+    prefix: str = Field(..., description="保存するキーの接頭辞")
+
+    _conn: sqlite3.Connection = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context) -> None:
+        dir_path = os.path.dirname(self.path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        # 読み込みが書き込みを待たないようWALを使い、WALで安全な範囲で同期を減らす
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS quiz_results ("
+            "key TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.commit()
+        self._conn = conn
+
+    def save_quiz(self, quiz_id: str, data_dict: Dict[str, Any]) -> str:
+        """
+        クイズの回答をSQLiteに保存し、保存先のキーを返す
+
+        同じIDの回答が保存済みの場合は上書きしない。
+
+        Args:
+            quiz_id (str): クイズのID
+            data_dict (Dict[str, Any]): 保存するデータ
+
+        Returns:
+            str: 保存したデータのキー
+        """
+        try:
+            key = f"{self.prefix}{quiz_id}.json"
+            data = json.dumps(data_dict, ensure_ascii=False, indent=2)
+
+            with track_storage(STORAGE_SAVE_QUIZ), self._lock:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO quiz_results (key, data, updated_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, data, time.time()),
+                )
+                self._conn.commit()
+
+            if cursor.rowcount == 0:
+                logger.warning(f"Quiz submission already exists, kept it: {key}")
+            else:
+                logger.info(f"Saved quiz submission to sqlite://{self.path}/{key}")
+            return key
+
+        except Exception as e:
+            logger.error(f"Error saving quiz object to SQLite: {str(e)}")
+            raise
+
+    def get_result(self, quiz_id: str) -> UserAnswer | None:
+        """
+        uuidをもとにSQLiteからユーザーの回答を取得する
+
+        Args:
+          quiz_id(str): クイズのID
+
+        Returns:
+          UserAnswer: UserAnswer型のデータ。見つからない場合はNone
+        """
+        try:
+            key = f"{self.prefix}{quiz_id}.json"
+
+            with track_storage(STORAGE_GET_RESULT), self._lock:
+                row = self._conn.execute(
+                    "SELECT data FROM quiz_results WHERE key = ?", (key,)
+                ).fetchone()
+
+            if row is None:
+                logger.warning(f"No submission found for quiz_id: {quiz_id}")
+                return None
+
+            logger.info(f"Retrieved quiz submission from {key}")
+            return json.loads(row[0])
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve quiz submission: {str(e)}")
+            raise
+
+    def close(self) -> None:
+        """SQLiteへの接続を閉じる"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,26 @@
+import logging
+
+from src.domain.repositories.storage_repository import StorageService
+from src.infrastructure.storage.gcs_client import GCSClient
+from src.infrastructure.storage.sqlite_storage import SQLiteStorageClient
+
+from config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def create_storage_client() -> StorageService:
+    """設定に応じたユーザーの回答の保存先を生成する"""
+    backend = settings.storage.STORAGE_BACKEND
+    if backend == "sqlite":
+        logger.info(f"Using SQLite result storage: {settings.storage.STORAGE_DB_PATH}")
+        return SQLiteStorageClient(
+            path=settings.storage.STORAGE_DB_PATH,
+            prefix=f"{settings.app.ENV}/results/",
+        )
+
+    if backend != "gcs":
+        raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+    return GCSClient()
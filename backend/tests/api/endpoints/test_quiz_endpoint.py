@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import LOCAL_PROMPT, FakeChatModel, generate_document
+from src.api.dependencies import get_quiz_creator
+from src.api.endpoints.quiz import _format_sse, router
+from src.api.models.quiz import QuizResponse
+from src.application.service.prompt_cache import PromptCache
+from src.application.usecase.quiz_creator import QuizCreator
+from src.domain.entities.quiz_event import QuizEvent, QuizEventType
+from src.infrastructure.llm.hashing_embeddings import HashingEmbeddings
+
+
+def parse_sse(body: str) -> list:
+    """Server-Sent Eventsの本文を（イベント名、データ）のリストに変換する"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def prompt_loader():
+    """hubの代わりにローカルのプロンプトを返す関数"""
+    return lambda: LOCAL_PROMPT
+
+
+@pytest.fixture
+def client(mocker, prompt_loader):
+    """外部サービスを使わないQuizCreatorでエンドポイントを呼び出すクライアント"""
+    mocker.patch(
+        "src.application.usecase.quiz_creator.get_system_prompt_cache",
+        return_value=PromptCache(loader=prompt_loader, ttl_seconds=3600),
+    )
+    mocker.patch(
+        "src.application.usecase.quiz_creator.get_vector_index_store",
+        return_value=None,
+    )
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/quiz")
+    app.dependency_overrides[get_quiz_creator] = lambda: QuizCreator(
+        llm=FakeChatModel(), embeddings=HashingEmbeddings()
+    )
+    return TestClient(app)
+
+
+class TestCreateQuiz:
+    @pytest.mark.parametrize("strategy", ["chain", "validated_chain", "supervisor"])
+    def test_create_quiz(self, client, strategy):
+        """ストリームを使わない呼び出しでも、各生成方式でクイズを返すことをテスト"""
+        response = client.post(
+            "/api/v1/quiz/create_quiz",
+            json={
+                "type": "text",
+                "content": generate_document(2_000),
+                "difficulty": "beginner",
+                "questionCount": 3,
+                "strategy": strategy,
+            },
+        )
+
+        assert response.status_code == 200
+        assert len(QuizResponse.model_validate(response.json()).preview.questions) == 3
+
+
+class TestCreateQuizStream:
+    def request(self, client: TestClient, strategy: str) -> list:
+        response = client.post(
+            "/api/v1/quiz/create_quiz/stream",
+            json={
+                "type": "text",
+                "content": generate_document(2_000),
+                "difficulty": "beginner",
+                "questionCount": 3,
+                "strategy": strategy,
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return parse_sse(response.text)
+
+    def test_chain_event_order(self, client):
+        """Chainの直接実行で、各段階のイベントが順に返されることをテスト"""
+        events = self.request(client, "chain")
+
+        assert [name for name, _ in events] == [
+            "loaded",
+            "embedded",
+            "retrieved",
+            "generated",
+            "question",
+            "question",
+            "question",
+            "completed",
+        ]
+        completed = QuizResponse.model_validate(events[-1][1])
+        assert len(completed.preview.questions) == 3
+        assert [data["attempt"] for name, data in events if name == "question"] == [
+            1,
+            1,
+            1,
+        ]
+
+    @pytest.mark.parametrize("strategy", ["validated_chain", "supervisor"])
+    def test_evaluated_event_order(self, client, strategy):
+        """評価を行う生成方式では、問題の後に評価のイベントが返されることをテスト"""
+        events = self.request(client, strategy)
+
+        names = [name for name, _ in events]
+        assert names[:4] == ["loaded", "embedded", "retrieved", "generated"]
+        assert names.count("question") == 3
+        assert names[-2:] == ["evaluated", "completed"]
+
+    def test_error_event(self, mocker, client):
+        """生成中にエラーが発生した場合、errorイベントで終わることをテスト"""
+
+        def failing_loader():
+            raise RuntimeError("hub is down")
+
+        mocker.patch(
+            "src.application.usecase.quiz_creator.get_system_prompt_cache",
+            return_value=PromptCache(loader=failing_loader, ttl_seconds=3600),
+        )
+
+        events = self.request(client, "chain")
+
+        name, data = events[-1]
+        assert name == "error"
+        assert data["status"] == 500
+        assert "completed" not in [name for name, _ in events]
+
+
+class TestFormatSSE:
+    def test_format_sse(self):
+        """イベントをSSEの形式に変換し、日本語をエスケープしないことをテスト"""
+        event = QuizEvent(type=QuizEventType.LOADED, data={"title": "読書メモ"})
+
+        assert _format_sse(event) == 'event: loaded\ndata: {"title": "読書メモ"}\n\n'
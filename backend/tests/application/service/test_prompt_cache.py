@@ -0,0 +1,107 @@
+import pytest
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.application.service.prompt_cache import PromptCache
+
+
+class TestPromptCache:
+    @pytest.fixture
+    def prompt(self):
+        """テスト用のプロンプトを作成するフィクスチャ"""
+        return ChatPromptTemplate.from_messages([("system", "context: {context}")])
+
+    @pytest.fixture
+    def clock(self, mocker):
+        """時刻を固定するフィクスチャ"""
+        clock = mocker.patch("src.application.service.prompt_cache.time.time")
+        clock.return_value = 0.0
+        return clock
+
+    @pytest.fixture
+    def executor(self, mocker):
+        """バックグラウンドの処理をその場で実行するフィクスチャ"""
+        executor = mocker.patch(
+            "src.application.service.prompt_cache.get_blocking_executor"
+        ).return_value
+        executor.submit.side_effect = lambda func: func()
+        return executor
+
+    def test_get_uses_cache_within_ttl(self, prompt, clock, mocker):
+        """有効期限内はhubに問い合わせないことをテスト"""
+        loader = mocker.Mock(return_value=prompt)
+        cache = PromptCache(loader=loader, ttl_seconds=60)
+
+        assert cache.get() is prompt
+        clock.return_value = 30.0
+        assert cache.get() is prompt
+
+        loader.assert_called_once()
+
+    def test_get_refreshes_in_background_after_ttl(
+        self, prompt, clock, executor, mocker
+    ):
+        """有効期限を過ぎた場合、古いプロンプトを返しつつ再取得することをテスト"""
+        new_prompt = ChatPromptTemplate.from_messages([("system", "new {context}")])
+        loader = mocker.Mock(side_effect=[prompt, new_prompt])
+        cache = PromptCache(loader=loader, ttl_seconds=60)
+        executor.submit.side_effect = None
+
+        cache.get()
+        clock.return_value = 61.0
+
+        assert cache.get() is prompt
+        executor.submit.assert_called_once()
+
+        # バックグラウンドの再取得が完了すると新しいプロンプトを返す
+        executor.submit.call_args.args[0]()
+        assert cache.get() is new_prompt
+
+    def test_failed_refresh_keeps_cached_prompt(self, prompt, clock, executor, mocker):
+        """再取得に失敗した場合、キャッシュしたプロンプトを使い続けることをテスト"""
+        loader = mocker.Mock(side_effect=[prompt, Exception("hub is down")])
+        cache = PromptCache(loader=loader, ttl_seconds=60)
+
+        cache.get()
+        clock.return_value = 61.0
+
+        assert cache.get() is prompt
+        assert cache.get() is prompt
+        assert loader.call_count == 2
+
+    def test_falls_back_to_disk_copy(self, prompt, tmp_path, mocker):
+        """hubに接続できない場合、ディスクに保存したコピーを使うことをテスト"""
+        fallback_path = str(tmp_path / "prompt.json")
+        PromptCache(
+            loader=mocker.Mock(return_value=prompt),
+            ttl_seconds=60,
+            fallback_path=fallback_path,
+        ).get()
+
+        cache = PromptCache(
+            loader=mocker.Mock(side_effect=Exception("hub is down")),
+            ttl_seconds=60,
+            fallback_path=fallback_path,
+        )
+
+        assert cache.get() == prompt
+
+    def test_raises_without_fallback(self, tmp_path, mocker):
+        """hubに接続できず、ディスクのコピーもない場合はエラーになることをテスト"""
+        cache = PromptCache(
+            loader=mocker.Mock(side_effect=Exception("hub is down")),
+            ttl_seconds=60,
+            fallback_path=str(tmp_path / "missing.json"),
+        )
+
+        with pytest.raises(Exception, match="hub is down"):
+            cache.get()
+
+    def test_prefetch_does_not_raise(self, mocker):
+        """起動時の取得に失敗してもエラーにならないことをテスト"""
+        loader = mocker.Mock(side_effect=Exception("hub is down"))
+        cache = PromptCache(loader=loader, ttl_seconds=60)
+
+        cache.prefetch()
+
+        loader.assert_called_once()
@@ -1,10 +1,16 @@
+import asyncio
 import os
 import re
 import uuid
 import pytest
 
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_openai import OpenAIEmbeddings
+
 from src.application.usecase.quiz_creator import QuizCreator
 from src.api.models.quiz import QuizType, Difficulty, QuizResponse
+from src.domain.entities.question import Question, QuizOption
 from src.domain.entities.quiz import Quiz
 from src.application.exceptions.quiz_creation_exceptions import (
     RAGProcessingError,
@@ -17,6 +23,7 @@ from src.infrastructure.exceptions.llm_exceptions import (
 from src.infrastructure.exceptions.vectordb_exceptions import (
     VectorStoreLoadError,
 )
+from config.settings import settings
 
 # テスト用の環境変数設定
 os.environ["ENV"] = "test"
@@ -91,21 +98,22 @@ class TestQuizCreator:
         # _process_documentの実行
         splitted_doc = quiz_creator._process_document(QuizType.TEXT, content)
 
-        # _setup_vector_storeの実行
-        vector_store_handler, directory_path = quiz_creator._setup_vector_store(
-            splitted_doc, db_file_handler, temp_uuid
+        # _asetup_vector_storeの実行
+        vector_store_handler, directory_path = asyncio.run(
+            quiz_creator._asetup_vector_store(splitted_doc, db_file_handler, temp_uuid)
         )
 
         try:
-            # _process_ragの実行
+            # _aprocess_ragの実行
             question_count = 5
             difficulty = Difficulty.INTERMEDIATE
-            response = quiz_creator._process_rag(
-                vector_store_handler,
-                directory_path,
-                question_count,
-                difficulty,
-                temp_uuid,
+            response = asyncio.run(
+                quiz_creator._aprocess_rag(
+                    vector_store_handler.as_retriever(),
+                    question_count,
+                    difficulty,
+                    temp_uuid,
+                )
             )
 
             # 返り値の検証
@@ -243,3 +251,166 @@ class TestQuizCreator:
             re.IGNORECASE,
         )
         return bool(uuid_pattern.match(uuid_string))
+
+
+class TestQuizCreatorSingleFlight:
+    CONTENT = "読書メモ" * 50
+
+    @pytest.fixture
+    def sample_quiz(self):
+        """テスト用のクイズを作成するフィクスチャ"""
+        return Quiz(
+            questions=[
+                Question(
+                    question=f"question {i}",
+                    options=QuizOption(A="a", B="b", C="c", D="d"),
+                    answer="A",
+                    explanation="Aが正解です",
+                )
+                for i in range(3)
+            ]
+        )
+
+    @pytest.fixture
+    def pipeline(self, mocker, sample_quiz):
+        """外部APIを呼ぶ処理をモックし、呼び出し回数を記録するフィクスチャ"""
+        calls = {"document": 0, "index": 0}
+
+        async def process_document(quiz_type, content, *args):
+            calls["document"] += 1
+            await asyncio.sleep(0.01)
+            return ["chunk"]
+
+        async def build_index(splitted_doc, embeddings):
+            calls["index"] += 1
+            await asyncio.sleep(0.01)
+            return mocker.MagicMock(spec=FAISS)
+
+        async def process_rag(
+            retriever, question_count, difficulty, uuid, *args
+        ):
+            return QuizResponse(
+                id=uuid, preview=sample_quiz, difficulty_value=difficulty.value
+            )
+
+        mocker.patch.object(
+            QuizCreator, "_aprocess_document", side_effect=process_document
+        )
+        mocker.patch.object(QuizCreator, "_aprocess_rag", side_effect=process_rag)
+        mocker.patch.object(QuizCreator, "_fits_full_context", return_value=False)
+        mocker.patch(
+            "src.application.usecase.quiz_creator.aget_faiss_index",
+            side_effect=build_index,
+        )
+        mocker.patch(
+            "src.application.usecase.quiz_creator.get_quiz_result_cache",
+            return_value=None,
+        )
+        mocker.patch(
+            "src.application.usecase.quiz_creator.get_vector_index_store",
+            return_value=None,
+        )
+        return calls
+
+    def _create_quizzes(self, contents, question_counts=None, models=None):
+        question_counts = question_counts or [3] * len(contents)
+        models = models or ["text-embedding-3-small"] * len(contents)
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    QuizCreator(
+                        embeddings=OpenAIEmbeddings(api_key="test-api-key", model=model)
+                    ).acreate_quiz(
+                        QuizType.TEXT, content, question_count, Difficulty.BEGINNER
+                    )
+                    for content, question_count, model in zip(
+                        contents, question_counts, models
+                    )
+                )
+            )
+
+        return asyncio.run(run())
+
+    def test_concurrent_requests_share_artifacts(self, pipeline):
+        """同じ入力の同時リクエストでドキュメントとインデックスの作成が1回になることをテスト"""
+        responses = self._create_quizzes(
+            [self.CONTENT, self.CONTENT, f"  {self.CONTENT}\n"]
+        )
+
+        assert pipeline == {"document": 1, "index": 1}
+        # レスポンスのIDはリクエストごとに異なる
+        assert len({response.id for response in responses}) == 3
+
+    def test_different_requests_are_not_shared(self, pipeline):
+        """異なる入力のリクエストはそれぞれ処理されることをテスト"""
+        self._create_quizzes([self.CONTENT, self.CONTENT + "追記"])
+
+        assert pipeline == {"document": 2, "index": 2}
+
+    def test_different_question_counts_are_not_shared(self, pipeline):
+        """問題数が異なるリクエストは、分割後のチャンクからインデックスを作り直すことをテスト"""
+        self._create_quizzes([self.CONTENT, self.CONTENT], question_counts=[3, 5])
+
+        assert pipeline == {"document": 2, "index": 2}
+
+    def test_different_embeddings_models_are_not_shared(self, pipeline):
+        """埋め込みモデルが異なるリクエストは、インデックスを共有しないことをテスト"""
+        self._create_quizzes(
+            [self.CONTENT, self.CONTENT],
+            models=["text-embedding-3-small", "text-embedding-3-large"],
+        )
+
+        assert pipeline == {"document": 1, "index": 2}
+
+
+class TestQuizCreatorFullContext:
+    @pytest.fixture
+    def pipeline(self, mocker):
+        """外部APIを呼ぶ処理をモックするフィクスチャ"""
+        build_index = mocker.patch(
+            "src.application.usecase.quiz_creator.aget_faiss_index"
+        )
+        process_rag = mocker.patch.object(QuizCreator, "_aprocess_rag")
+        mocker.patch(
+            "src.application.usecase.quiz_creator.get_quiz_result_cache",
+            return_value=None,
+        )
+        return build_index, process_rag
+
+    def test_short_document_skips_embeddings(self, pipeline):
+        """短いドキュメントでは埋め込みを行わず、全文をコンテキストとして使うことをテスト"""
+        build_index, process_rag = pipeline
+        content = "短い読書メモです。" * 20
+        events = []
+
+        asyncio.run(
+            QuizCreator().acreate_quiz(
+                QuizType.TEXT,
+                content,
+                3,
+                Difficulty.BEGINNER,
+                on_event=events.append,
+            )
+        )
+
+        build_index.assert_not_called()
+        retriever = process_rag.call_args.args[0]
+        documents = retriever.invoke("any query")
+        assert "".join(document.page_content for document in documents) == content
+        assert events[1].data["full_context"] is True
+
+    def test_fits_full_context(self, mocker):
+        """トークン数の上限と比較して全文を使うかどうかを判定することをテスト"""
+        mocker.patch(
+            "src.application.usecase.quiz_creator.count_document_tokens",
+            side_effect=lambda documents: 100 * len(documents),
+        )
+        mocker.patch.object(
+            type(settings.embeddings), "FULL_CONTEXT_MAX_TOKENS", 200
+        )
+        documents = [Document(page_content="chunk")] * 2
+
+        assert QuizCreator._fits_full_context(documents)
+        assert not QuizCreator._fits_full_context(documents * 2)
+        assert not QuizCreator._fits_full_context([])
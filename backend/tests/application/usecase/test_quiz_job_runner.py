@@ -0,0 +1,260 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.api.models.quiz import Difficulty, QuizResponse, QuizType
+from src.application.exceptions.quiz_job_exceptions import (
+    QuizJobNotFoundError,
+    QuizJobQueueFullError,
+)
+from src.application.usecase.quiz_job_runner import INTERRUPTED_ERROR, QuizJobRunner
+from src.domain.entities.question import Question, QuizOption
+from src.domain.entities.quiz import Quiz
+from src.domain.entities.quiz_event import QuizEvent, QuizEventType
+from src.domain.entities.quiz_job import QuizJob, QuizJobStatus
+from src.infrastructure.db.quiz_job_repository import InMemoryQuizJobRepository
+
+
+CONTENT = "テスト用の読書メモです。" * 10
+
+
+class TestQuizJobRunner:
+    @pytest.fixture
+    def sample_response(self):
+        """テスト用のQuizResponseを作成するフィクスチャ"""
+        options = QuizOption(A="選択肢A", B="選択肢B", C="選択肢C", D="選択肢D")
+        quiz = Quiz(
+            questions=[
+                Question(
+                    question=f"テスト質問{i}",
+                    options=options,
+                    answer="A",
+                    explanation=f"テスト解説{i}",
+                )
+                for i in range(1, 4)
+            ]
+        )
+        return QuizResponse(id="quiz-id", preview=quiz, difficulty_value="beginner")
+
+    @pytest.fixture
+    def job_runner(self):
+        """ジョブランナーを作成するフィクスチャ"""
+        return QuizJobRunner(
+            repository=InMemoryQuizJobRepository(ttl_seconds=60),
+            max_workers=1,
+            max_pending=1,
+        )
+
+    def test_job_succeeds(self, job_runner, sample_response, mocker):
+        """ジョブが完了すると結果と進捗が保存されることをテスト"""
+
+        async def fake_create_quiz(*args, on_event=None, **kwargs):
+            on_event(QuizEvent(type=QuizEventType.LOADED))
+            on_event(QuizEvent(type=QuizEventType.QUESTION))
+            return sample_response
+
+        mocker.patch(
+            "src.application.usecase.quiz_job_runner.QuizCreator.acreate_quiz",
+            side_effect=fake_create_quiz,
+        )
+
+        async def run():
+            job = await job_runner.asubmit(
+                QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER
+            )
+            assert job.status == QuizJobStatus.PENDING
+            await asyncio.gather(*job_runner._tasks)
+            return await job_runner.aget(job.id)
+
+        job = asyncio.run(run())
+
+        assert job.status == QuizJobStatus.SUCCEEDED
+        assert job.stage == QuizEventType.LOADED.value
+        assert QuizResponse.model_validate(job.result) == sample_response
+
+    def test_job_fails(self, job_runner, mocker):
+        """クイズ生成に失敗した場合、エラー内容が保存されることをテスト"""
+        mocker.patch(
+            "src.application.usecase.quiz_job_runner.QuizCreator.acreate_quiz",
+            side_effect=Exception("Generation failed"),
+        )
+
+        async def run():
+            job = await job_runner.asubmit(
+                QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER
+            )
+            await asyncio.gather(*job_runner._tasks)
+            return await job_runner.aget(job.id)
+
+        job = asyncio.run(run())
+
+        assert job.status == QuizJobStatus.FAILED
+        assert "Generation failed" in job.error
+
+    def test_submit_rejects_when_queue_is_full(self, job_runner, mocker):
+        """実行中・実行待ちのジョブが上限に達した場合に登録を拒否することをテスト"""
+
+        async def slow_create_quiz(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        mocker.patch(
+            "src.application.usecase.quiz_job_runner.QuizCreator.acreate_quiz",
+            side_effect=slow_create_quiz,
+        )
+
+        async def run():
+            await job_runner.asubmit(QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER)
+            await job_runner.asubmit(QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER)
+            try:
+                with pytest.raises(QuizJobQueueFullError):
+                    await job_runner.asubmit(
+                        QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER
+                    )
+            finally:
+                for task in job_runner._tasks:
+                    task.cancel()
+
+        asyncio.run(run())
+
+    def test_concurrent_submits_respect_limit(self, job_runner, mocker):
+        """同時に登録した場合も、上限を超えて受け付けないことをテスト"""
+
+        async def slow_create_quiz(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        mocker.patch(
+            "src.application.usecase.quiz_job_runner.QuizCreator.acreate_quiz",
+            side_effect=slow_create_quiz,
+        )
+
+        async def run():
+            results = await asyncio.gather(
+                *(
+                    job_runner.asubmit(QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER)
+                    for _ in range(3)
+                ),
+                return_exceptions=True,
+            )
+            for task in job_runner._tasks:
+                task.cancel()
+            return results
+
+        results = asyncio.run(run())
+
+        assert sum(isinstance(r, QuizJobQueueFullError) for r in results) == 1
+
+    def test_shutdown_marks_running_job_failed(self, job_runner, mocker):
+        """シャットダウンで中断したジョブが実行中のまま残らないことをテスト"""
+        started = asyncio.Event()
+
+        async def slow_create_quiz(*args, **kwargs):
+            started.set()
+            await asyncio.sleep(10)
+
+        mocker.patch(
+            "src.application.usecase.quiz_job_runner.QuizCreator.acreate_quiz",
+            side_effect=slow_create_quiz,
+        )
+
+        async def run():
+            running = await job_runner.asubmit(
+                QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER
+            )
+            pending = await job_runner.asubmit(
+                QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER
+            )
+            await started.wait()
+            await job_runner.ashutdown()
+            return await job_runner.aget(running.id), await job_runner.aget(pending.id)
+
+        for job in asyncio.run(run()):
+            assert job.status == QuizJobStatus.FAILED
+            assert job.error == INTERRUPTED_ERROR
+
+    def test_job_fails_when_progress_cannot_be_saved(
+        self, job_runner, sample_response, mocker
+    ):
+        """進捗の保存に失敗した場合、ジョブを失敗として記録することをテスト"""
+
+        async def fake_create_quiz(*args, on_event=None, **kwargs):
+            on_event(QuizEvent(type=QuizEventType.LOADED))
+            return sample_response
+
+        mocker.patch(
+            "src.application.usecase.quiz_job_runner.QuizCreator.acreate_quiz",
+            side_effect=fake_create_quiz,
+        )
+        save = job_runner.repository.save
+
+        def failing_save(job):
+            if job.stage is not None and not job.is_finished:
+                raise RuntimeError("Disk is full")
+            save(job)
+
+        mocker.patch.object(
+            type(job_runner.repository), "save", side_effect=failing_save
+        )
+
+        async def run():
+            job = await job_runner.asubmit(
+                QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER
+            )
+            await asyncio.gather(*job_runner._tasks)
+            return await job_runner.aget(job.id)
+
+        job = asyncio.run(run())
+
+        assert job.status == QuizJobStatus.FAILED
+        assert "Disk is full" in job.error
+
+    def test_recover_marks_orphaned_jobs_failed(self, job_runner):
+        """起動時に、前回のプロセスで残ったジョブを失敗にすることをテスト"""
+        job_runner.repository.save(
+            QuizJob(id="orphan").update(status=QuizJobStatus.RUNNING)
+        )
+
+        assert job_runner.recover() == 1
+        job = asyncio.run(job_runner.aget("orphan"))
+        assert job.status == QuizJobStatus.FAILED
+
+    def test_get_not_found(self, job_runner):
+        """存在しないジョブを取得しようとした場合のエラーをテスト"""
+        with pytest.raises(QuizJobNotFoundError):
+            asyncio.run(job_runner.aget("missing"))
+
+    def test_repository_is_called_off_the_event_loop(
+        self, job_runner, sample_response, mocker
+    ):
+        """ジョブの登録・取得・保存で、リポジトリをスレッドプールから呼び出すことをテスト"""
+        mocker.patch(
+            "src.application.usecase.quiz_job_runner.QuizCreator.acreate_quiz",
+            return_value=sample_response,
+        )
+        threads = []
+        save = job_runner.repository.save
+        get = job_runner.repository.get
+
+        def record(func):
+            def wrapper(*args):
+                threads.append(threading.current_thread())
+                return func(*args)
+
+            return wrapper
+
+        mocker.patch.object(
+            type(job_runner.repository), "save", side_effect=record(save)
+        )
+        mocker.patch.object(type(job_runner.repository), "get", side_effect=record(get))
+
+        async def run():
+            job = await job_runner.asubmit(
+                QuizType.TEXT, CONTENT, 3, Difficulty.BEGINNER
+            )
+            await asyncio.gather(*job_runner._tasks)
+            return await job_runner.aget(job.id)
+
+        assert asyncio.run(run()).status == QuizJobStatus.SUCCEEDED
+        # 登録、実行開始、完了の保存と、取得の4回
+        assert len(threads) == 4
+        assert threading.main_thread() not in threads
@@ -0,0 +1,93 @@
+import pytest
+
+from src.domain.entities.question import Question, QuizOption
+from src.domain.service.quiz_validator import QuizValidator
+
+
+def make_question(text: str, answer: str = "A") -> Question:
+    return Question(
+        question=text,
+        options=QuizOption(A="Option A", B="Option B", C="Option C", D="Option D"),
+        answer=answer,
+        explanation=f"{answer.upper()} is correct",
+    )
+
+
+class TestQuizValidator:
+    @pytest.fixture
+    def validator(self):
+        """テスト用のバリデーターを作成するフィクスチャ"""
+        return QuizValidator()
+
+    def test_valid_quiz(self, validator):
+        """問題がないクイズでは空のリストを返すことを確認"""
+        questions = [make_question(f"Question {i}") for i in range(3)]
+
+        assert validator.find_issues(questions, 3) == []
+
+    def test_question_count_mismatch(self, validator):
+        """問題数が指定と異なる場合、クイズ全体の問題点を返すことを確認"""
+        questions = [make_question(f"Question {i}") for i in range(4)]
+
+        issues = validator.find_issues(questions, 3)
+
+        assert len(issues) == 1
+        assert issues[0].index is None
+
+    def test_invalid_answer(self, validator):
+        """正解がA〜D以外の場合、その問題の問題点を返すことを確認"""
+        questions = [
+            make_question("Question 0"),
+            make_question("Question 1", answer="E"),
+            make_question("Question 2", answer="b"),
+        ]
+
+        issues = validator.find_issues(questions, 3)
+
+        assert [issue.index for issue in issues] == [1]
+
+    def test_duplicate_question(self, validator):
+        """重複した問題は後から出てきた方を問題点として返すことを確認"""
+        questions = [
+            make_question("What is  RAG?"),
+            make_question("Question 1"),
+            make_question("what is rag?"),
+        ]
+
+        issues = validator.find_issues(questions, 3)
+
+        assert [issue.index for issue in issues] == [2]
+
+    def test_explanation_not_mentioning_answer_needs_review(self, validator):
+        """解説が正解に触れていない場合、LLMによる確認が必要な問題点を返すことを確認"""
+        questions = [make_question(f"Question {i}") for i in range(3)]
+        questions[0] = questions[0].model_copy(
+            update={"explanation": "Because of the reason above."}
+        )
+        questions[1] = questions[1].model_copy(
+            update={"explanation": "The answer is option a."}
+        )
+
+        issues = validator.find_issues(questions, 3)
+
+        assert [(issue.index, issue.needs_review) for issue in issues] == [(0, True)]
+
+    def test_duplicate_options(self, validator):
+        """選択肢が重複している場合、その問題の問題点を返すことを確認"""
+        questions = [make_question(f"Question {i}") for i in range(3)]
+        questions[2] = questions[2].model_copy(
+            update={
+                "options": QuizOption(A="Same", B="same ", C="Option C", D="Option D")
+            }
+        )
+
+        issues = validator.find_issues(questions, 3)
+
+        assert [(issue.index, issue.needs_review) for issue in issues] == [(2, False)]
+
+    def test_deduplicate(self, validator):
+        """問題文が重複している問題を除き、最初のものを残すことを確認"""
+        first = make_question("What is RAG?")
+        questions = [first, make_question("Question 1"), make_question("what is  RAG?")]
+
+        assert validator.deduplicate(questions) == [first, questions[1]]
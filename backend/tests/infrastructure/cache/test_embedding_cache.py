@@ -0,0 +1,182 @@
+import asyncio
+import threading
+from typing import List
+
+import pytest
+
+from langchain_core.embeddings import Embeddings
+
+from src.infrastructure.cache.embedding_cache import CachedEmbeddings
+from src.infrastructure.cache.sqlite_store import SQLiteKVStore
+
+
+class CountingEmbeddings(Embeddings):
+    """呼び出された本文を記録する埋め込みモデル"""
+
+    def __init__(self, model: str = "test-embedding-model"):
+        self.model = model
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float(len(text)), 1.0, 0.5]
+
+
+class TestSQLiteKVStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        """テスト用のストアを作成するフィクスチャ"""
+        return SQLiteKVStore(path=str(tmp_path / "kv.sqlite3"), max_bytes=100)
+
+    def test_set_and_get(self, store):
+        """保存した値を取得できることをテスト"""
+        store.set("key", b"value")
+
+        assert store.get("key") == b"value"
+        assert store.get("missing") is None
+
+    def test_evicts_least_recently_used(self, store, mocker):
+        """上限を超えた場合、最も参照されていないエントリから削除されることをテスト"""
+        clock = mocker.patch("src.infrastructure.cache.sqlite_store.time.time")
+
+        clock.return_value = 100.0
+        store.set("old", b"x" * 40)
+        clock.return_value = 200.0
+        store.set("recent", b"x" * 40)
+        # oldを参照して最終アクセス時刻を更新する
+        clock.return_value = 300.0
+        assert store.get("old") is not None
+
+        clock.return_value = 400.0
+        store.set("new", b"x" * 40)
+
+        assert store.get("recent") is None
+        assert store.get("old") is not None
+        assert store.get("new") is not None
+        assert store.total_bytes() <= 100
+
+    def test_recent_reads_do_not_write(self, store, mocker):
+        """最終アクセス時刻を更新して間もないエントリの読み込みでは、書き込まないことをテスト"""
+        clock = mocker.patch("src.infrastructure.cache.sqlite_store.time.time")
+        clock.return_value = 100.0
+        store.set("key", b"value")
+        changes = store._conn.total_changes
+
+        clock.return_value = 100.0 + store.touch_interval_seconds / 2
+        assert store.get("key") == b"value"
+        assert store._conn.total_changes == changes
+
+        clock.return_value = 100.0 + store.touch_interval_seconds
+        assert store.get("key") == b"value"
+        assert store._conn.total_changes == changes + 1
+
+    def test_evicts_only_what_is_needed(self, tmp_path):
+        """上限の9割に収まるまで、古い順に必要な分だけ削除することをテスト"""
+        store = SQLiteKVStore(path=str(tmp_path / "kv.sqlite3"), max_bytes=100)
+        for i in range(5):
+            store.set(f"key-{i}", b"x" * 20)
+            # 同じ時刻に保存しても、古い順に並ぶよう最終アクセス時刻をずらす
+            store._conn.execute(
+                "UPDATE kv SET last_access = ? WHERE key = ?", (i, f"key-{i}")
+            )
+        store._conn.commit()
+
+        store.set("key-5", b"x" * 20)
+
+        assert store.get("key-0") is None
+        assert store.get("key-1") is None
+        assert all(store.get(f"key-{i}") is not None for i in range(2, 6))
+        assert store.total_bytes() == 80
+
+    def test_ttl_expiration(self, tmp_path, mocker):
+        """有効期限を過ぎたエントリが返されないことをテスト"""
+        clock = mocker.patch("src.infrastructure.cache.sqlite_store.time.time")
+        store = SQLiteKVStore(
+            path=str(tmp_path / "kv.sqlite3"), max_bytes=100, ttl_seconds=10
+        )
+
+        clock.return_value = 0.0
+        store.set("key", b"value")
+        clock.return_value = 11.0
+
+        assert store.get("key") is None
+
+
+class TestCachedEmbeddings:
+    @pytest.fixture
+    def store(self, tmp_path):
+        """テスト用のストアを作成するフィクスチャ"""
+        return SQLiteKVStore(path=str(tmp_path / "embeddings.sqlite3"), max_bytes=10**6)
+
+    def test_embed_documents_uses_cache(self, store):
+        """一度埋め込んだチャンクは再度プロバイダに問い合わせないことをテスト"""
+        provider = CountingEmbeddings()
+        embeddings = CachedEmbeddings(embeddings=provider, store=store)
+
+        first = embeddings.embed_documents(["chunk-1", "chunk-22"])
+        second = embeddings.embed_documents(["chunk-22", "chunk-333", "chunk-1"])
+
+        assert first == [[7.0, 1.0, 0.5], [8.0, 1.0, 0.5]]
+        assert second == [[8.0, 1.0, 0.5], [9.0, 1.0, 0.5], [7.0, 1.0, 0.5]]
+        assert provider.calls == [["chunk-1", "chunk-22"], ["chunk-333"]]
+
+    def test_cache_key_includes_model(self, store):
+        """埋め込みモデルが異なる場合はキャッシュを共有しないことをテスト"""
+        provider_a = CountingEmbeddings(model="model-a")
+        provider_b = CountingEmbeddings(model="model-b")
+
+        CachedEmbeddings(embeddings=provider_a, store=store).embed_documents(["chunk"])
+        CachedEmbeddings(embeddings=provider_b, store=store).embed_documents(["chunk"])
+
+        assert provider_a.calls == [["chunk"]]
+        assert provider_b.calls == [["chunk"]]
+
+    def test_duplicate_texts_are_embedded_once(self, store):
+        """同じリクエスト内の重複したチャンクは一度だけ埋め込むことをテスト"""
+        provider = CountingEmbeddings()
+        embeddings = CachedEmbeddings(embeddings=provider, store=store)
+
+        result = embeddings.embed_documents(["same", "same"])
+
+        assert len(result) == 2
+        assert provider.calls == [["same"]]
+
+    def test_aembed_documents_uses_cache(self, store):
+        """非同期の埋め込みでもキャッシュを共有することをテスト"""
+        provider = CountingEmbeddings()
+        embeddings = CachedEmbeddings(embeddings=provider, store=store)
+
+        embeddings.embed_documents(["chunk-1"])
+        result = asyncio.run(embeddings.aembed_documents(["chunk-1", "chunk-22"]))
+
+        assert result == [[7.0, 1.0, 0.5], [8.0, 1.0, 0.5]]
+        assert provider.calls == [["chunk-1"], ["chunk-22"]]
+
+    def test_aembed_documents_offloads_store(self, store, mocker):
+        """非同期の埋め込みでは、ストアの読み書きをイベントループの外で行うことをテスト"""
+        threads = []
+        get_many = SQLiteKVStore.get_many
+        set_many = SQLiteKVStore.set_many
+
+        def record(func):
+            def wrapper(*args):
+                threads.append(threading.current_thread())
+                return func(*args)
+
+            return wrapper
+
+        mocker.patch.object(
+            SQLiteKVStore, "get_many", autospec=True, side_effect=record(get_many)
+        )
+        mocker.patch.object(
+            SQLiteKVStore, "set_many", autospec=True, side_effect=record(set_many)
+        )
+        embeddings = CachedEmbeddings(embeddings=CountingEmbeddings(), store=store)
+
+        asyncio.run(embeddings.aembed_documents(["chunk"]))
+
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from typing import Iterator
+
+import pytest
+
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+from src.infrastructure.cache.cache_key import canonicalize_url
+from src.infrastructure.cache.page_cache import CachedPageLoader, ScrapedPageCache
+from src.infrastructure.cache.sqlite_store import SQLiteKVStore
+
+
+class CountingLoader(BaseLoader):
+    """読み込んだ回数を記録するローダー"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def lazy_load(self) -> Iterator[Document]:
+        self.calls += 1
+        time.sleep(self.delay)
+        yield Document(page_content="# Page", metadata={"sourceURL": "x"})
+
+
+class TestScrapedPageCache:
+    URL = "https://Example.com/article/?utm_source=news#section"
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """テスト用のキャッシュを作成するフィクスチャ"""
+        store = SQLiteKVStore(path=str(tmp_path / "pages.sqlite3"), max_bytes=10**6)
+        return ScrapedPageCache(store=store, ttl_seconds=60)
+
+    def test_returns_cached_page_within_ttl(self, cache):
+        """有効期限内は正規化したURLが同じであればスクレイピングしないことをテスト"""
+        loader = CountingLoader()
+
+        first = cache.load(self.URL, loader)
+        second = cache.load("https://example.com/article", loader)
+
+        assert first == second
+        assert first[0].page_content == "# Page"
+        assert loader.calls == 1
+
+    def test_scrapes_again_after_ttl(self, cache, mocker):
+        """有効期限が切れたページは、URLへ直接問い合わせずに取得し直すことをテスト"""
+        loader = CountingLoader()
+        cache.load(self.URL, loader)
+
+        mocker.patch(
+            "src.infrastructure.cache.page_cache.time.time",
+            return_value=time.time() + 120,
+        )
+        cache.load(self.URL, loader)
+
+        assert loader.calls == 2
+
+    def test_coalesces_concurrent_requests(self, cache):
+        """同じURLへの同時リクエストが1回のスクレイピングにまとめられることをテスト"""
+        loader = CountingLoader(delay=0.05)
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    CachedPageLoader(url=url, loader=loader, cache=cache).aload()
+                    for url in (self.URL, "https://example.com/article")
+                )
+            )
+
+        results = asyncio.run(run())
+
+        assert results[0] == results[1]
+        assert loader.calls == 1
+        assert cache.store.get(canonicalize_url(self.URL)) is not None
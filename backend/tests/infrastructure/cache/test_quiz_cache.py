@@ -0,0 +1,158 @@
+import pytest
+
+from src.api.models.quiz import Difficulty, QuizType
+from src.domain.entities.question import Question, QuizOption
+from src.domain.entities.quiz import Quiz
+from src.infrastructure.cache.quiz_cache import QuizResultCache
+from src.infrastructure.cache.sqlite_store import SQLiteKVStore
+
+
+def make_quiz(label: str) -> Quiz:
+    """ラベルで区別できるテスト用のクイズを作成する"""
+    return Quiz(
+        questions=[
+            Question(
+                question=f"{label} question {i}",
+                options=QuizOption(A="a", B="b", C="c", D="d"),
+                answer="A",
+                explanation="Aが正解です",
+            )
+            for i in range(3)
+        ]
+    )
+
+
+class TestQuizResultCache:
+    @pytest.fixture
+    def store(self, tmp_path):
+        """テスト用のディスクストアを作成するフィクスチャ"""
+        return SQLiteKVStore(path=str(tmp_path / "quizzes.sqlite3"), max_bytes=10**6)
+
+    @pytest.fixture
+    def cache(self, store):
+        """テスト用のキャッシュを作成するフィクスチャ"""
+        return QuizResultCache(
+            variants=2, ttl_seconds=60, memory_entries=8, store=store
+        )
+
+    def test_build_key_normalizes_content(self):
+        """表記の違いだけの入力が同じキーになることをテスト"""
+        text_key = QuizResultCache.build_key(
+            QuizType.TEXT, "読書  メモ\n", Difficulty.BEGINNER, 5, "v1"
+        )
+        assert text_key == QuizResultCache.build_key(
+            QuizType.TEXT, " 読書 メモ", Difficulty.BEGINNER, 5, "v1"
+        )
+
+        url_key = QuizResultCache.build_key(
+            QuizType.URL,
+            "HTTPS://Example.com:443/page/?b=2&a=1&utm_source=x#top",
+            Difficulty.BEGINNER,
+            5,
+            "v1",
+        )
+        assert url_key == QuizResultCache.build_key(
+            QuizType.URL,
+            "https://example.com/page?a=1&b=2",
+            Difficulty.BEGINNER,
+            5,
+            "v1",
+        )
+
+    def test_build_key_distinguishes_parameters(self):
+        """難易度・問題数・プロンプトのバージョンが異なる場合は別のキーになることをテスト"""
+        base = QuizResultCache.build_key(
+            QuizType.TEXT, "memo", Difficulty.BEGINNER, 5, "v1"
+        )
+
+        assert base != QuizResultCache.build_key(
+            QuizType.TEXT, "memo", Difficulty.ADVANCED, 5, "v1"
+        )
+        assert base != QuizResultCache.build_key(
+            QuizType.TEXT, "memo", Difficulty.BEGINNER, 3, "v1"
+        )
+        assert base != QuizResultCache.build_key(
+            QuizType.TEXT, "memo", Difficulty.BEGINNER, 5, "v2"
+        )
+
+    def test_serves_only_after_pool_is_full(self, cache):
+        """保持しているクイズがvariants個揃うまではNoneを返すことをテスト"""
+        cache.add("key", make_quiz("first"))
+        assert cache.get("key") is None
+
+        cache.add("key", make_quiz("second"))
+        assert cache.get("key") in (make_quiz("first"), make_quiz("second"))
+
+    def test_keeps_latest_variants(self, cache, mocker):
+        """variants個を超えた場合に古いクイズから削除されることをテスト"""
+        mocker.patch(
+            "src.infrastructure.cache.quiz_cache.random.choice",
+            side_effect=lambda variants: variants[0],
+        )
+        for label in ("first", "second", "third"):
+            cache.add("key", make_quiz(label))
+
+        assert cache.get("key") == make_quiz("second")
+
+    def test_ttl_expiration(self, cache, mocker):
+        """有効期限を過ぎたクイズが返されないことをテスト"""
+        clock = mocker.patch("src.infrastructure.cache.quiz_cache.time.time")
+        clock.return_value = 1000.0
+        cache.add("key", make_quiz("first"))
+        cache.add("key", make_quiz("second"))
+        assert cache.get("key") is not None
+
+        clock.return_value = 1061.0
+        assert cache.get("key") is None
+
+    def test_disk_tier_survives_new_instance(self, cache, store):
+        """ディスクに保存したクイズを別のインスタンスから取得できることをテスト"""
+        cache.add("key", make_quiz("first"))
+        cache.add("key", make_quiz("second"))
+
+        reloaded = QuizResultCache(
+            variants=2, ttl_seconds=60, memory_entries=8, store=store
+        )
+
+        assert reloaded.get("key") is not None
+
+    def test_sees_variants_added_by_other_workers(self, cache, store):
+        """他のワーカーがディスクに追加したクイズを、参照済みの入力でも取得できることをテスト"""
+        other = QuizResultCache(
+            variants=2, ttl_seconds=60, memory_entries=8, store=store
+        )
+        cache.add("key", make_quiz("first"))
+        assert cache.get("key") is None
+
+        other.add("key", make_quiz("second"))
+
+        assert cache.get("key") in (make_quiz("first"), make_quiz("second"))
+
+    def test_add_keeps_variants_from_other_workers(self, cache, store, mocker):
+        """追加の際に、他のワーカーが追加したクイズを上書きしないことをテスト"""
+        mocker.patch(
+            "src.infrastructure.cache.quiz_cache.random.choice",
+            side_effect=lambda variants: variants[0],
+        )
+        other = QuizResultCache(
+            variants=2, ttl_seconds=60, memory_entries=8, store=store
+        )
+        cache.add("key", make_quiz("first"))
+        other.add("key", make_quiz("second"))
+
+        cache.add("key", make_quiz("third"))
+
+        assert other.get("key") == make_quiz("second")
+
+    def test_memory_tier_is_bounded(self):
+        """メモリのみの場合、上限を超えた入力から削除されることをテスト"""
+        cache = QuizResultCache(variants=1, ttl_seconds=60, memory_entries=2)
+        cache.add("a", make_quiz("a"))
+        cache.add("b", make_quiz("b"))
+        # aを参照して最近使ったものにする
+        assert cache.get("a") is not None
+        cache.add("c", make_quiz("c"))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
@@ -0,0 +1,125 @@
+import pytest
+
+from src.domain.repositories.storage_repository import StorageService
+from src.infrastructure.cache.result_cache import (
+    CachedStorageService,
+    with_result_cache,
+)
+from src.infrastructure.cache.sqlite_store import SQLiteKVStore
+
+from config.settings import settings
+
+
+def make_answer(quiz_id: str) -> dict:
+    """テスト用の回答を作成する"""
+    return {"id": quiz_id, "selectedOptions": ["A"], "difficultyValue": "beginner"}
+
+
+class TestCachedStorageService:
+    @pytest.fixture
+    def storage(self, mocker):
+        """元のストレージのモックを作成するフィクスチャ"""
+        storage = mocker.MagicMock(spec=StorageService)
+        storage.save_quiz.side_effect = lambda quiz_id, data: f"{quiz_id}.json"
+        storage.get_result.side_effect = make_answer
+        return storage
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """テスト用のディスクストアを作成するフィクスチャ"""
+        return SQLiteKVStore(path=str(tmp_path / "results.sqlite3"), max_bytes=10**6)
+
+    def test_get_result_reads_storage_once(self, storage):
+        """同じ回答の2回目以降はストレージに問い合わせないことをテスト"""
+        cache = CachedStorageService(storage=storage, memory_entries=8)
+
+        first = cache.get_result("quiz-1")
+        second = cache.get_result("quiz-1")
+
+        assert first == second == make_answer("quiz-1")
+        storage.get_result.assert_called_once_with("quiz-1")
+
+    def test_save_quiz_caches_stored_result(self, storage):
+        """保存時のデータではなく、実際に保存されている回答をキャッシュすることをテスト"""
+        cache = CachedStorageService(storage=storage, memory_entries=8)
+        # 保存済みのIDへの保存は無視され、最初の回答が残る
+        resubmitted = {**make_answer("quiz-1"), "selectedOptions": ["B"]}
+
+        path = cache.save_quiz("quiz-1", resubmitted)
+
+        assert path == "quiz-1.json"
+        storage.save_quiz.assert_called_once_with("quiz-1", resubmitted)
+        assert cache.get_result("quiz-1") == make_answer("quiz-1")
+        assert cache.get_result("quiz-1") == make_answer("quiz-1")
+        storage.get_result.assert_called_once_with("quiz-1")
+
+    def test_missing_result_is_not_cached(self, storage):
+        """存在しない回答はキャッシュせず、次回もストレージに問い合わせることをテスト"""
+        storage.get_result.side_effect = None
+        storage.get_result.return_value = None
+        cache = CachedStorageService(storage=storage, memory_entries=8)
+
+        assert cache.get_result("quiz-1") is None
+        assert cache.get_result("quiz-1") is None
+        assert storage.get_result.call_count == 2
+
+    def test_returned_result_is_a_copy(self, storage):
+        """返した回答を変更してもキャッシュに影響しないことをテスト"""
+        cache = CachedStorageService(storage=storage, memory_entries=8)
+
+        cache.get_result("quiz-1")["selectedOptions"].append("B")
+
+        assert cache.get_result("quiz-1") == make_answer("quiz-1")
+
+    def test_memory_evicts_least_recently_used(self, storage):
+        """メモリの上限を超えた場合は最も長く参照されていない回答から削除することをテスト"""
+        cache = CachedStorageService(storage=storage, memory_entries=2)
+
+        cache.get_result("quiz-1")
+        cache.get_result("quiz-2")
+        cache.get_result("quiz-1")
+        cache.get_result("quiz-3")
+        storage.get_result.reset_mock()
+
+        cache.get_result("quiz-1")
+        storage.get_result.assert_not_called()
+        cache.get_result("quiz-2")
+        storage.get_result.assert_called_once_with("quiz-2")
+
+    def test_disk_shared_between_instances(self, storage, store):
+        """ディスクに保存した回答を別のインスタンスから取得できることをテスト"""
+        CachedStorageService(storage=storage, memory_entries=8, store=store).get_result(
+            "quiz-1"
+        )
+
+        other = CachedStorageService(storage=storage, memory_entries=8, store=store)
+
+        assert other.get_result("quiz-1") == make_answer("quiz-1")
+        storage.get_result.assert_called_once_with("quiz-1")
+
+    def test_close_closes_storage(self, storage):
+        """閉じる際に元のストレージの接続を閉じることをテスト"""
+        CachedStorageService(storage=storage, memory_entries=8).close()
+
+        storage.close.assert_called_once()
+
+
+class TestWithResultCache:
+    def test_wraps_storage(self, mocker):
+        """有効な場合はキャッシュ付きのストレージに包むことをテスト"""
+        mocker.patch.object(type(settings.storage), "RESULT_CACHE_ENABLED", True)
+        mocker.patch.object(type(settings.storage), "RESULT_CACHE_PATH", "")
+        storage = mocker.MagicMock(spec=StorageService)
+
+        cached = with_result_cache(storage)
+
+        assert isinstance(cached, CachedStorageService)
+        assert cached.store is None
+        assert with_result_cache(cached) is cached
+
+    def test_disabled(self, mocker):
+        """無効な場合は元のストレージをそのまま返すことをテスト"""
+        mocker.patch.object(type(settings.storage), "RESULT_CACHE_ENABLED", False)
+        storage = mocker.MagicMock(spec=StorageService)
+
+        assert with_result_cache(storage) is storage
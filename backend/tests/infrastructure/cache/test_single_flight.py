@@ -0,0 +1,97 @@
+import asyncio
+import gc
+import logging
+
+import pytest
+
+from src.infrastructure.cache.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_coalesces_concurrent_calls(self):
+        """同じキーへの同時呼び出しが1回の実行にまとめられることをテスト"""
+        single_flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            return await asyncio.gather(
+                *(single_flight.do("key", work) for _ in range(5))
+            )
+
+        assert asyncio.run(run()) == ["result"] * 5
+        assert len(calls) == 1
+        assert not single_flight.in_flight("key")
+
+    def test_different_keys_run_separately(self):
+        """異なるキーの呼び出しはそれぞれ実行されることをテスト"""
+        single_flight = SingleFlight()
+        calls = []
+
+        async def work(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        async def run():
+            return await asyncio.gather(
+                single_flight.do("a", lambda: work("a")),
+                single_flight.do("b", lambda: work("b")),
+            )
+
+        assert asyncio.run(run()) == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    def test_shares_exception_and_releases_key(self):
+        """例外が待機中の全呼び出しに共有され、次の呼び出しでは再実行されることをテスト"""
+        single_flight = SingleFlight()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("failed")
+
+        async def run():
+            return await asyncio.gather(
+                single_flight.do("key", failing),
+                single_flight.do("key", failing),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(calls) == 1
+
+        with pytest.raises(ValueError):
+            asyncio.run(single_flight.do("key", failing))
+        assert len(calls) == 2
+
+    def test_exception_is_retrieved_after_waiters_cancelled(self, caplog):
+        """待機中の呼び出しが全てキャンセルされた後の例外も、未取得のまま残らないことをテスト"""
+        single_flight = SingleFlight()
+        unhandled = []
+
+        async def failing():
+            await asyncio.sleep(0.02)
+            raise ValueError("failed")
+
+        async def run():
+            asyncio.get_running_loop().set_exception_handler(
+                lambda loop, context: unhandled.append(context)
+            )
+            waiter = asyncio.create_task(single_flight.do("key", failing))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.sleep(0.05)
+            gc.collect()
+
+        with caplog.at_level(logging.WARNING):
+            asyncio.run(run())
+
+        assert unhandled == []
+        assert "In-flight call failed: key" in caplog.text
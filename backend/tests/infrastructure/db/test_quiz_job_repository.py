@@ -0,0 +1,88 @@
+import pytest
+
+from src.domain.entities.quiz_job import QuizJob, QuizJobStatus
+from src.infrastructure.db.quiz_job_repository import (
+    InMemoryQuizJobRepository,
+    SQLiteQuizJobRepository,
+)
+
+
+class TestQuizJobRepository:
+    @pytest.fixture(params=["memory", "sqlite"])
+    def repository(self, request, tmp_path):
+        """メモリとSQLiteの両方のリポジトリを作成するフィクスチャ"""
+        if request.param == "memory":
+            return InMemoryQuizJobRepository(ttl_seconds=60)
+        return SQLiteQuizJobRepository(
+            path=str(tmp_path / "jobs.sqlite3"), ttl_seconds=60
+        )
+
+    def test_save_and_get(self, repository):
+        """保存したジョブを取得できることをテスト"""
+        job = QuizJob(id="job-1")
+        repository.save(job)
+
+        result = repository.get("job-1")
+
+        assert result == job
+        assert result.status == QuizJobStatus.PENDING
+
+    def test_save_overwrites_job(self, repository):
+        """同じIDのジョブを保存すると上書きされることをテスト"""
+        job = QuizJob(id="job-1")
+        repository.save(job)
+        repository.save(
+            job.update(status=QuizJobStatus.SUCCEEDED, result={"id": "quiz-id"})
+        )
+
+        result = repository.get("job-1")
+
+        assert result.status == QuizJobStatus.SUCCEEDED
+        assert result.result == {"id": "quiz-id"}
+
+    def test_get_not_found(self, repository):
+        """存在しないジョブに対してNoneを返すことをテスト"""
+        assert repository.get("missing") is None
+
+    def test_expired_finished_jobs_are_purged(self, repository):
+        """保持期限を過ぎた完了済みのジョブが削除されることをテスト"""
+        finished = QuizJob(id="finished", status=QuizJobStatus.FAILED, updated_at=0)
+        running = QuizJob(id="running", status=QuizJobStatus.RUNNING, updated_at=0)
+        repository.save(finished)
+        repository.save(running)
+
+        repository.save(QuizJob(id="new"))
+
+        assert repository.get("finished") is None
+        assert repository.get("running") is not None
+
+    def test_fail_unfinished(self, repository):
+        """実行中・実行待ちのまま残ったジョブだけを失敗にすることをテスト"""
+        repository.save(QuizJob(id="pending"))
+        repository.save(QuizJob(id="running").update(status=QuizJobStatus.RUNNING))
+        repository.save(QuizJob(id="done").update(status=QuizJobStatus.SUCCEEDED))
+
+        count = repository.fail_unfinished("interrupted")
+
+        assert count == 2
+        for job_id in ("pending", "running"):
+            job = repository.get(job_id)
+            assert job.status == QuizJobStatus.FAILED
+            assert job.error == "interrupted"
+        assert repository.get("done").status == QuizJobStatus.SUCCEEDED
+
+
+class TestSQLiteQuizJobRepository:
+    def test_fail_unfinished_skips_live_workers(self, tmp_path, mocker):
+        """実行中の他のワーカープロセスのジョブは失敗にしないことをテスト"""
+        repository = SQLiteQuizJobRepository(
+            path=str(tmp_path / "jobs.sqlite3"), ttl_seconds=60
+        )
+        repository.save(QuizJob(id="running").update(status=QuizJobStatus.RUNNING))
+        mocker.patch(
+            "src.infrastructure.db.quiz_job_repository._is_process_alive",
+            return_value=True,
+        )
+
+        assert repository.fail_unfinished("interrupted") == 0
+        assert repository.get("running").status == QuizJobStatus.RUNNING
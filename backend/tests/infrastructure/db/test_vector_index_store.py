@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.infrastructure.db.vector_index_store import FAISSIndexStoreImpl
+
+
+class TestFAISSIndexStoreImpl:
+    @pytest.fixture
+    def embeddings(self):
+        """ネットワークを使わない埋め込みモデルを作成するフィクスチャ"""
+        return DeterministicFakeEmbedding(size=8)
+
+    @pytest.fixture
+    def documents(self):
+        """テスト用の分割済みドキュメントを作成するフィクスチャ"""
+        return [
+            Document(page_content="テスト文書1", metadata={"source": "text"}),
+            Document(page_content="テスト文書2", metadata={"source": "text"}),
+        ]
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """テスト用のストアを作成するフィクスチャ"""
+        return FAISSIndexStoreImpl(
+            root_path=str(tmp_path / "indexes"), max_bytes=10**7, memory_entries=2
+        )
+
+    def test_build_key(self, store, documents, embeddings):
+        """内容が同じドキュメントは同じキーに、異なる場合は別のキーになることをテスト"""
+        key = store.build_key(documents, embeddings)
+
+        assert key == store.build_key(list(documents), embeddings)
+        assert key != store.build_key(documents[:1], embeddings)
+        assert key != store.build_key(
+            [Document(page_content="テスト文書1", metadata={"source": "url"})],
+            embeddings,
+        )
+
+    def test_get_missing_returns_none(self, store, embeddings):
+        """保存されていないキーに対してNoneを返すことをテスト"""
+        assert store.get("missing", embeddings) is None
+
+    def test_reload_from_disk(self, store, documents, embeddings, tmp_path):
+        """保存したインデックスを別のインスタンスからメモリマップで読み込めることをテスト"""
+        vectorstore = FAISS.from_documents(documents, embeddings)
+        key = store.build_key(documents, embeddings)
+        store.put(key, vectorstore)
+
+        reloaded_store = FAISSIndexStoreImpl(
+            root_path=str(tmp_path / "indexes"), max_bytes=10**7
+        )
+        reloaded = reloaded_store.get(key, embeddings)
+
+        assert reloaded is not None
+        assert reloaded.index.ntotal == 2
+        result = reloaded.similarity_search("テスト文書1", k=1)
+        assert result[0].page_content == "テスト文書1"
+
+    def test_memory_hit_uses_callers_embeddings(self, store, documents, embeddings):
+        """メモリから返すインデックスは、呼び出し元の埋め込みモデルで検索することをテスト"""
+        vectorstore = FAISS.from_documents(documents, embeddings)
+        key = store.build_key(documents, embeddings)
+        store.put(key, vectorstore)
+        other_embeddings = DeterministicFakeEmbedding(size=8)
+
+        hit = store.get(key, other_embeddings)
+
+        assert hit.embedding_function is other_embeddings
+        assert hit.index is vectorstore.index
+        assert hit.docstore is vectorstore.docstore
+        # 保持しているインデックスは書き換えない
+        assert vectorstore.embedding_function is embeddings
+
+    def test_evicts_least_recently_used(self, tmp_path, embeddings):
+        """上限を超えた場合、最も長く使われていないインデックスから削除されることをテスト"""
+        root_path = str(tmp_path / "indexes")
+        probe = FAISSIndexStoreImpl(root_path=root_path, max_bytes=10**7)
+        vectorstores = {
+            key: FAISS.from_texts([f"文書{key}"], embeddings) for key in "abc"
+        }
+        probe.put("a", vectorstores["a"])
+        entry_size = probe.total_bytes()
+
+        store = FAISSIndexStoreImpl(
+            root_path=root_path, max_bytes=int(entry_size * 2.5)
+        )
+        store.put("b", vectorstores["b"])
+        os.utime(os.path.join(root_path, "a"), (1, 1))
+        os.utime(os.path.join(root_path, "b"), (2, 2))
+        # aを参照して最終利用時刻を更新する
+        assert store.get("a", embeddings) is not None
+
+        store.put("c", vectorstores["c"])
+
+        assert sorted(os.listdir(root_path)) == ["a", "c"]
+        assert store.total_bytes() <= store.max_bytes
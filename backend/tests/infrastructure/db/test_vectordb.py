@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_openai import OpenAIEmbeddings
+
+from src.infrastructure.db.token_budget_retriever import TokenBudgetRetriever
+from src.infrastructure.db.vectordb import (
+    VectorStoreHandlerImpl,
+    aget_faiss_index,
+    create_retriever,
+)
+from src.infrastructure.exceptions.vectordb_exceptions import (
+    InvalidDocumentError,
+    VectorStoreLoadError,
+    VectorStoreNotInitializedError,
+)
+from config.settings import settings
+
+
+class TestVectorStoreHandlerImpl:
+    @pytest.fixture
+    def fake_embeddings(self):
+        """ネットワークを使わない埋め込みモデルを作成するフィクスチャ"""
+        return DeterministicFakeEmbedding(size=8)
+
+    @pytest.fixture
+    def mock_embeddings_model(self):
+        """APIを呼び出さないOpenAIEmbeddingsのインスタンスを作成するフィクスチャ"""
+        return OpenAIEmbeddings(api_key="test-api-key")
+
+    @pytest.fixture
+    def vectorstore(self, fake_embeddings):
+        """テスト用のFAISSインデックスを作成するフィクスチャ"""
+        return FAISS.from_texts(["テスト文書1", "テスト文書2"], fake_embeddings)
+
+    def test_as_retriever_in_memory(self, mock_embeddings_model, vectorstore, mocker):
+        """dir_pathを指定しない場合、ディスクを読まずにメモリ上のインデックスを使うことをテスト"""
+        load_local = mocker.patch.object(FAISS, "load_local")
+        handler = VectorStoreHandlerImpl(
+            embeddings_model=mock_embeddings_model, vectorstore=vectorstore
+        )
+
+        retriever = handler.as_retriever()
+
+        assert retriever.vectorstore is vectorstore
+        assert retriever.search_kwargs == {"k": settings.embeddings.SEARCH_KWARGS}
+        load_local.assert_not_called()
+
+    def test_as_retriever_in_memory_not_initialized(self, mock_embeddings_model):
+        """ベクトルストアが未設定の場合にエラーとなることをテスト"""
+        handler = VectorStoreHandlerImpl(embeddings_model=mock_embeddings_model)
+
+        with pytest.raises(VectorStoreNotInitializedError):
+            handler.as_retriever()
+
+    def test_as_retriever_from_missing_directory(
+        self, mock_embeddings_model, vectorstore, tmp_path
+    ):
+        """存在しないディレクトリを指定した場合にエラーとなることをテスト"""
+        handler = VectorStoreHandlerImpl(
+            embeddings_model=mock_embeddings_model, vectorstore=vectorstore
+        )
+
+        with pytest.raises(VectorStoreLoadError):
+            handler.as_retriever(str(tmp_path / "missing"))
+
+
+class TestTokenBudgetRetriever:
+    @pytest.fixture
+    def vectorstore(self):
+        """本文の長さが異なるドキュメントのFAISSインデックスを作成するフィクスチャ"""
+        texts = ["a" * 40, "b" * 40, "c" * 40, "d" * 40]
+        return FAISS.from_texts(texts, DeterministicFakeEmbedding(size=8))
+
+    @pytest.fixture(autouse=True)
+    def estimate_tokens(self, mocker):
+        """トークナイザーを使わず、1文字を1トークンとして数えるフィクスチャ"""
+        mocker.patch(
+            "src.infrastructure.db.token_budget_retriever.count_tokens", side_effect=len
+        )
+
+    def test_fits_budget(self, vectorstore):
+        """検索結果の合計トークン数が上限に収まるように返すことをテスト"""
+        retriever = TokenBudgetRetriever(
+            vectorstore=vectorstore, search_kwargs={"k": 4}, max_tokens=100
+        )
+
+        documents = retriever.invoke("query")
+
+        assert len(documents) == 2
+
+    def test_returns_top_document_over_budget(self, vectorstore):
+        """上限を超える場合でも最も関連度の高いドキュメントを返すことをテスト"""
+        retriever = TokenBudgetRetriever(
+            vectorstore=vectorstore, search_kwargs={"k": 4}, max_tokens=10
+        )
+
+        documents = asyncio.run(retriever.ainvoke("query"))
+
+        assert len(documents) == 1
+
+    def test_create_retriever_without_budget(self, vectorstore, mocker):
+        """上限が0の場合は通常のリトリーバーを返すことをテスト"""
+        mocker.patch.object(type(settings.embeddings), "CONTEXT_MAX_TOKENS", 0)
+
+        retriever = create_retriever(vectorstore)
+
+        assert not isinstance(retriever, TokenBudgetRetriever)
+        assert retriever.search_kwargs == {"k": settings.embeddings.SEARCH_KWARGS}
+
+
+class TestAgetFaissIndex:
+    @pytest.fixture(autouse=True)
+    def disable_embedding_cache(self, mocker):
+        """埋め込みキャッシュを使わないようにするフィクスチャ"""
+        mocker.patch(
+            "src.infrastructure.db.vectordb.with_embedding_cache",
+            side_effect=lambda embeddings: embeddings,
+        )
+
+    def test_builds_index_from_generator_in_batches(self, mocker):
+        """ジェネレーターから受け取ったチャンクをバッチごとに埋め込むことをテスト"""
+        mocker.patch.object(type(settings.embeddings), "EMBEDDING_BATCH_SIZE", 2)
+        embeddings = DeterministicFakeEmbedding(size=8)
+        aembed_documents = mocker.spy(DeterministicFakeEmbedding, "aembed_documents")
+        chunks = (
+            Document(page_content=f"チャンク{i}", metadata={"index": i}) for i in range(5)
+        )
+
+        vectorstore = asyncio.run(aget_faiss_index(chunks, embeddings))
+
+        assert vectorstore.index.ntotal == 5
+        assert [len(call.args[1]) for call in aembed_documents.call_args_list] == [
+            2,
+            2,
+            1,
+        ]
+        result = vectorstore.similarity_search("チャンク3", k=1)
+        assert result[0].metadata == {"index": 3}
+
+    def test_empty_documents(self):
+        """空のドキュメントを渡した場合にエラーとなることをテスト"""
+        with pytest.raises(InvalidDocumentError):
+            asyncio.run(aget_faiss_index(iter([]), DeterministicFakeEmbedding(size=8)))
@@ -0,0 +1,35 @@
+from langchain_core.documents import Document
+from langchain_text_splitters import CharacterTextSplitter
+
+from src.infrastructure.llm.doc_translate import DocumentTranslateImpl
+
+
+class TestDocumentTranslateImpl:
+    def test_iter_text_chunks_splits_once(self, mocker):
+        """文字列からチャンクを生成する際に、分割が1回だけ行われることをテスト"""
+        splitter = CharacterTextSplitter(separator="。", chunk_size=10, chunk_overlap=0)
+        split_text = mocker.spy(splitter, "split_text")
+        translator = DocumentTranslateImpl(text_splitter=splitter)
+
+        chunks = translator.iter_text_chunks("一文目です。二文目です。三文目です。")
+
+        # 取り出すまで分割は行われない
+        assert split_text.call_count == 0
+        documents = list(chunks)
+        assert split_text.call_count == 1
+        assert len(documents) == 3
+        assert all(doc.metadata == {"source": "text"} for doc in documents)
+
+    def test_iter_chunks_keeps_metadata(self):
+        """ドキュメントを分割したチャンクが元のメタデータを引き継ぐことをテスト"""
+        splitter = CharacterTextSplitter(separator="。", chunk_size=10, chunk_overlap=0)
+        translator = DocumentTranslateImpl(text_splitter=splitter)
+        document = Document(
+            page_content="一文目です。二文目です。", metadata={"source": "url"}
+        )
+
+        chunks = list(translator.iter_chunks([document]))
+
+        assert [chunk.page_content for chunk in chunks] == ["一文目です", "二文目です"]
+        assert all(chunk.metadata == {"source": "url"} for chunk in chunks)
+        assert translator.split_document([document]) == chunks
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from langchain_core.embeddings import Embeddings
+
+from src.infrastructure.llm.embedding_scheduler import (
+    EmbeddingScheduler,
+    ScheduledEmbeddings,
+    is_rate_limited,
+)
+from src.infrastructure.llm.usage_tracker import track_usage
+
+
+class RateLimitError(Exception):
+    """HTTP 429を表すテスト用のエラー"""
+
+    status_code = 429
+
+
+class RecordingEmbeddings(Embeddings):
+    """問い合わせたバッチを記録し、指定回数だけ429を返す埋め込みモデル"""
+
+    def __init__(self, rate_limited: int = 0):
+        self.batches: List[List[str]] = []
+        self.rate_limited = rate_limited
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.rate_limited > 0:
+            self.rate_limited -= 1
+            raise RateLimitError("rate limited")
+        self.batches.append(list(texts))
+        await asyncio.sleep(0.01)
+        return self.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float(len(text)), 1.0]
+
+
+class TestEmbeddingScheduler:
+    @pytest.fixture(autouse=True)
+    def estimate_tokens(self, mocker):
+        """トークナイザーを使わず、1文字を1トークンとして数えるフィクスチャ"""
+        mocker.patch(
+            "src.infrastructure.llm.embedding_scheduler.count_tokens", side_effect=len
+        )
+
+    def test_batches_concurrent_requests(self):
+        """同時に届いた複数のリクエストが1回の問い合わせにまとめられることをテスト"""
+        embeddings = RecordingEmbeddings()
+        scheduler = EmbeddingScheduler(embeddings=embeddings, batch_wait_seconds=0.01)
+
+        async def run():
+            return await asyncio.gather(
+                scheduler.aembed(["a", "bb"]),
+                scheduler.aembed(["ccc"]),
+                scheduler.aembed(["dddd", "e"]),
+            )
+
+        results = asyncio.run(run())
+
+        assert results == [
+            [[1.0, 1.0], [2.0, 1.0]],
+            [[3.0, 1.0]],
+            [[4.0, 1.0], [1.0, 1.0]],
+        ]
+        assert embeddings.batches == [["a", "bb", "ccc", "dddd", "e"]]
+
+    def test_respects_max_batch_size(self):
+        """1回の問い合わせのチャンク数がmax_batch_sizeを超えないことをテスト"""
+        embeddings = RecordingEmbeddings()
+        scheduler = EmbeddingScheduler(
+            embeddings=embeddings, max_batch_size=2, batch_wait_seconds=0.01
+        )
+
+        result = asyncio.run(scheduler.aembed(["a", "b", "c", "d", "e"]))
+
+        assert len(result) == 5
+        assert all(len(batch) <= 2 for batch in embeddings.batches)
+        assert sorted(t for batch in embeddings.batches for t in batch) == list("abcde")
+
+    def test_retries_on_rate_limit(self):
+        """429が返された場合に間隔を空けて再試行することをテスト"""
+        embeddings = RecordingEmbeddings(rate_limited=2)
+        scheduler = EmbeddingScheduler(
+            embeddings=embeddings, initial_backoff_seconds=0.001
+        )
+
+        result = asyncio.run(scheduler.aembed(["a"]))
+
+        assert result == [[1.0, 1.0]]
+        assert embeddings.batches == [["a"]]
+
+    def test_raises_after_max_retries(self):
+        """再試行回数を超えた場合は呼び出し元にエラーを返すことをテスト"""
+        embeddings = RecordingEmbeddings(rate_limited=10)
+        scheduler = EmbeddingScheduler(
+            embeddings=embeddings, max_retries=1, initial_backoff_seconds=0.001
+        )
+
+        with pytest.raises(RateLimitError):
+            asyncio.run(scheduler.aembed(["a"]))
+
+    def test_waits_for_token_budget(self):
+        """直近1分間のトークン数が上限を超える場合は、古い使用分が外れるまで待つことをテスト"""
+        embeddings = RecordingEmbeddings()
+        scheduler = EmbeddingScheduler(
+            embeddings=embeddings, tokens_per_minute=5, batch_wait_seconds=0
+        )
+        # 0.05秒後に1分の枠から外れる使用分を記録しておく
+        scheduler._usage.append((time.monotonic() - 59.95, 4))
+
+        started = time.monotonic()
+        asyncio.run(scheduler.aembed(["bbbb"]))
+
+        assert time.monotonic() - started >= 0.04
+        assert embeddings.batches == [["bbbb"]]
+
+    def test_records_usage_for_caller(self):
+        """まとめられたバッチでも、呼び出し元のリクエストごとに使用量を記録することをテスト"""
+        scheduler = EmbeddingScheduler(embeddings=RecordingEmbeddings())
+
+        async def embed(texts: List[str]):
+            with track_usage() as usage:
+                await scheduler.aembed(texts)
+            return usage.report()
+
+        async def run():
+            return await asyncio.gather(embed(["a", "bb"]), embed(["ccc"]))
+
+        first, second = asyncio.run(run())
+
+        assert (first.embedding_calls, first.embedding_tokens) == (1, 3)
+        assert (second.embedding_calls, second.embedding_tokens) == (1, 3)
+
+    def test_counts_tokens_off_the_event_loop(self, mocker):
+        """トークン数の計算をイベントループの外で行うことをテスト"""
+        threads = []
+
+        def count_tokens(text):
+            threads.append(threading.current_thread())
+            return len(text)
+
+        mocker.patch(
+            "src.infrastructure.llm.embedding_scheduler.count_tokens",
+            side_effect=count_tokens,
+        )
+        scheduler = EmbeddingScheduler(embeddings=RecordingEmbeddings())
+
+        asyncio.run(scheduler.aembed(["a", "bb"]))
+
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+
+    def test_is_rate_limited(self):
+        """429のエラーのみをレート制限として判定することをテスト"""
+        assert is_rate_limited(RateLimitError())
+        assert not is_rate_limited(ValueError())
+
+
+class TestScheduledEmbeddings:
+    def test_model_name_and_sync_path(self):
+        """同期の埋め込みはスケジューラーを経由せず、元のモデル名を返すことをテスト"""
+        embeddings = RecordingEmbeddings()
+        scheduled = ScheduledEmbeddings(
+            scheduler=EmbeddingScheduler(embeddings=embeddings)
+        )
+
+        assert scheduled.model == "RecordingEmbeddings"
+        assert scheduled.embed_documents(["ab"]) == [[2.0, 1.0]]
+        assert embeddings.batches == []
@@ -0,0 +1,53 @@
+import pytest
+
+from langchain_openai import OpenAIEmbeddings
+
+from src.infrastructure.cache.embedding_cache import with_embedding_cache
+from src.infrastructure.llm.embedding_scheduler import with_embedding_scheduler
+from src.infrastructure.llm.embeddings_provider import (
+    create_embeddings,
+    is_local_embeddings,
+)
+from src.infrastructure.llm.hashing_embeddings import HashingEmbeddings
+
+from config.settings import settings
+
+
+class TestCreateEmbeddings:
+    def test_local_provider(self, mocker):
+        """localを指定した場合はハッシュベクトルの埋め込みモデルを返すことをテスト"""
+        mocker.patch.object(type(settings.model), "EMBEDDINGS_PROVIDER", "local")
+        mocker.patch.object(type(settings.model), "LOCAL_EMBEDDINGS_SIZE", 128)
+
+        embeddings = create_embeddings()
+
+        assert isinstance(embeddings, HashingEmbeddings)
+        assert embeddings.size == 128
+        assert is_local_embeddings(embeddings)
+
+    def test_openai_provider(self, mocker):
+        """openaiを指定した場合はOpenAIの埋め込みモデルを返すことをテスト"""
+        mocker.patch.object(type(settings.model), "EMBEDDINGS_PROVIDER", "openai")
+        mocker.patch.object(
+            type(settings.model), "TEXT_EMBEDDINGS_MODEL", "text-embedding-3-small"
+        )
+        mocker.patch.dict("os.environ", {"OPENAI_API_KEY": "test-api-key"})
+
+        embeddings = create_embeddings()
+
+        assert isinstance(embeddings, OpenAIEmbeddings)
+        assert not is_local_embeddings(embeddings)
+
+    def test_unknown_provider(self, mocker):
+        """未知の提供元を指定した場合はValueErrorを送出することをテスト"""
+        mocker.patch.object(type(settings.model), "EMBEDDINGS_PROVIDER", "unknown")
+
+        with pytest.raises(ValueError):
+            create_embeddings()
+
+    def test_local_embeddings_are_not_wrapped(self):
+        """ローカルの埋め込みモデルはキャッシュやスケジューラーで包まないことをテスト"""
+        embeddings = HashingEmbeddings(size=16)
+
+        assert with_embedding_cache(embeddings) is embeddings
+        assert with_embedding_scheduler(embeddings) is embeddings
@@ -0,0 +1,56 @@
+import asyncio
+
+import numpy as np
+
+from src.infrastructure.llm.hashing_embeddings import HashingEmbeddings
+
+
+def _cosine(a, b) -> float:
+    return float(np.dot(a, b))
+
+
+class TestHashingEmbeddings:
+    def test_embed_documents(self):
+        """指定した次元の正規化されたベクトルを、同じ入力に同じ値で返すことをテスト"""
+        embeddings = HashingEmbeddings(size=64)
+
+        vectors = embeddings.embed_documents(["読書メモ", "reading notes"])
+
+        assert len(vectors) == 2
+        assert all(len(vector) == 64 for vector in vectors)
+        assert all(np.isclose(np.linalg.norm(vector), 1.0) for vector in vectors)
+        assert embeddings.embed_query("読書メモ") == vectors[0]
+
+    def test_similar_texts_are_closer(self):
+        """表記の近いテキストほど類似度が高くなることをテスト"""
+        embeddings = HashingEmbeddings()
+        query = embeddings.embed_query("機械学習の基礎を学ぶ")
+
+        similar = embeddings.embed_query("機械学習の基礎について")
+        different = embeddings.embed_query("今日の天気は晴れです")
+
+        assert _cosine(query, similar) > _cosine(query, different)
+
+    def test_normalizes_text(self):
+        """全角・半角や大文字・小文字の違いを同一視することをテスト"""
+        embeddings = HashingEmbeddings()
+
+        assert embeddings.embed_query("ＡＢＣ  Def") == embeddings.embed_query(
+            "abc def"
+        )
+
+    def test_short_and_empty_text(self):
+        """n-gramより短いテキストもベクトル化し、空文字は零ベクトルを返すことをテスト"""
+        embeddings = HashingEmbeddings(size=16)
+
+        assert np.isclose(np.linalg.norm(embeddings.embed_query("a")), 1.0)
+        assert embeddings.embed_query("") == [0.0] * 16
+
+    def test_async_embed(self):
+        """非同期の埋め込みも同期の結果と一致することをテスト"""
+        embeddings = HashingEmbeddings(size=32)
+
+        vectors = asyncio.run(embeddings.aembed_documents(["読書メモ"]))
+
+        assert vectors == embeddings.embed_documents(["読書メモ"])
+        assert embeddings.model == "hashing-32-2-3"
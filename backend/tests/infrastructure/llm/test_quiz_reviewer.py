@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from langchain_openai import ChatOpenAI
+
+from src.domain.entities.question import Question, QuizOption
+from src.domain.service.quiz_validator import QuizIssue
+from src.infrastructure.llm.quiz_reviewer import (
+    QuizReviewerImpl,
+    ReviewedIssue,
+    ReviewResult,
+)
+
+
+class TestQuizReviewerImpl:
+    @pytest.fixture
+    def reviewer(self):
+        """通信を行わないLLMを使うレビューアを作成するフィクスチャ"""
+        return QuizReviewerImpl(llm=ChatOpenAI(api_key="test-api-key"))
+
+    @pytest.fixture
+    def questions(self):
+        """テスト用の問題を作成するフィクスチャ"""
+        options = QuizOption(A="Option A", B="Option B", C="Option C", D="Option D")
+        return [
+            Question(
+                question=f"Question {i}",
+                options=options,
+                answer="A",
+                explanation="A is correct",
+            )
+            for i in range(3)
+        ]
+
+    def test_confirm_skips_llm_without_suspicious_issues(
+        self, reviewer, questions, mocker
+    ):
+        """確認が必要な問題点がない場合、LLMを呼び出さないことをテスト"""
+        review = mocker.patch.object(QuizReviewerImpl, "areview")
+        issues = [QuizIssue(index=1, message="Invalid answer")]
+
+        result = asyncio.run(reviewer.aconfirm(questions, issues))
+
+        assert result == issues
+        review.assert_not_called()
+
+    def test_confirm_keeps_only_confirmed_issues(self, reviewer, questions, mocker):
+        """LLMが問題ありと判断した問題点だけを残すことをテスト"""
+        chain = mocker.MagicMock()
+        chain.ainvoke = mocker.AsyncMock(
+            return_value=ReviewResult(
+                issues=[
+                    ReviewedIssue(index=2, message="The explanation contradicts A."),
+                    # 確認を依頼していない問題は無視する
+                    ReviewedIssue(index=0, message="Unrelated"),
+                ]
+            )
+        )
+        mocker.patch.object(
+            QuizReviewerImpl, "_create_review_chain", return_value=chain
+        )
+        definite = QuizIssue(index=None, message="Wrong question count")
+        suspicious = [
+            QuizIssue(index=1, message="Check 1", needs_review=True),
+            QuizIssue(index=2, message="Check 2", needs_review=True),
+        ]
+
+        result = asyncio.run(reviewer.aconfirm(questions, [definite, *suspicious]))
+
+        assert result == [
+            definite,
+            QuizIssue(index=2, message="The explanation contradicts A."),
+        ]
+        chain.ainvoke.assert_awaited_once()
@@ -1,12 +1,18 @@
+import asyncio
+
 import pytest
 
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
 from langchain_core.vectorstores import VectorStoreRetriever
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
 
-from src.domain.entities.quiz import Quiz
+from src.domain.entities.quiz import QuestionBatch, Quiz
 from src.domain.entities.question import Question, QuizOption
-from src.infrastructure.llm.rag_agent import RAGAgentModelImpl
+from src.infrastructure.llm.rag_agent import RAGAgentModelImpl, _notify_retrieved
 from src.infrastructure.exceptions.llm_exceptions import (
     LLMResponseParsingError,
     RAGChainExecutionError,
@@ -145,3 +151,378 @@ class TestRAGAgentModelImpl:
 
         assert "Error while invoking RAG Chain" in str(exc_info.value)
         assert "Chain execution failed" in str(exc_info.value)
+
+    @pytest.fixture
+    def llm(self):
+        """通信を行わないLLMモデルを作成するフィクスチャ"""
+        return ChatOpenAI(api_key="test-api-key")
+
+    def test_graph_is_shared_between_instances(
+        self, llm, mock_prompt, mock_retriever, mocker
+    ):
+        """同じLLMを使うインスタンス間でグラフを一度だけ構築することをテスト"""
+        # Arrange
+        mock_graph = mocker.MagicMock()
+        create_graph = mocker.patch.object(
+            RAGAgentModelImpl, "_create_graph", return_value=mock_graph
+        )
+        first = RAGAgentModelImpl(llm=llm, prompt=mock_prompt, retriever=mock_retriever)
+        second = RAGAgentModelImpl(
+            llm=llm, prompt=mock_prompt, retriever=mock_retriever
+        )
+
+        # Act & Assert
+        create_graph.assert_not_called()
+        assert first._get_graph() is mock_graph
+        assert second._get_graph() is mock_graph
+        create_graph.assert_called_once_with(llm)
+
+    def test_graph_config_contains_rag_chain(
+        self, llm, mock_prompt, mock_retriever, mocker
+    ):
+        """グラフの実行時にリクエストごとのRAG Chainをconfigで渡すことをテスト"""
+        # Arrange
+        rag_agent = RAGAgentModelImpl(
+            llm=llm, prompt=mock_prompt, retriever=mock_retriever
+        )
+        mock_graph = mocker.MagicMock()
+        mock_graph.invoke.return_value = {"messages": []}
+        rag_agent.graph = mock_graph
+
+        # Act
+        rag_agent.graph_run(question_count=3, difficulty="intermediate")
+
+        # Assert
+        config = mock_graph.invoke.call_args.kwargs["config"]
+        assert config["configurable"]["rag_chain"] is rag_agent.rag_chain
+
+    def test_validated_chain_regenerates_only_failed_questions(
+        self, llm, mock_prompt, mock_retriever, sample_quiz, mocker
+    ):
+        """検証に失敗した問題だけを生成し直すことをテスト"""
+        # Arrange
+        rag_agent = RAGAgentModelImpl(
+            llm=llm, prompt=mock_prompt, retriever=mock_retriever
+        )
+        # 解説が正解に触れていない問題のLLMによる確認は、問題なしとする
+        mocker.patch(
+            "src.infrastructure.llm.rag_agent.QuizReviewerImpl.areview",
+            return_value=[],
+        )
+        questions = list(sample_quiz.questions)
+        invalid = questions[1].model_copy(update={"answer": "E"})
+        regenerated = questions[1].model_copy(update={"question": "New question"})
+        rag_agent.batch_chain = mocker.MagicMock()
+        rag_agent.batch_chain.ainvoke = mocker.AsyncMock(
+            side_effect=[
+                QuestionBatch(questions=[questions[0], invalid, questions[2]]),
+                QuestionBatch(questions=[regenerated]),
+            ]
+        )
+
+        # Act
+        result = asyncio.run(
+            rag_agent.ainvoke_validated_chain(
+                question_count=3, difficulty="intermediate", max_retries=2
+            )
+        )
+
+        # Assert
+        assert result.questions == [questions[0], questions[2], regenerated]
+        assert rag_agent.batch_chain.ainvoke.await_count == 2
+        retry_input = rag_agent.batch_chain.ainvoke.call_args.args[0]
+        assert retry_input["question_count"] == 1
+
+    def test_validated_chain_stops_after_max_retries(
+        self, llm, mock_prompt, mock_retriever, sample_quiz, mocker
+    ):
+        """再生成の上限に達した場合、その時点のクイズを返すことをテスト"""
+        # Arrange
+        rag_agent = RAGAgentModelImpl(
+            llm=llm, prompt=mock_prompt, retriever=mock_retriever
+        )
+        # 解説が正解に触れていない問題のLLMによる確認は、問題なしとする
+        mocker.patch(
+            "src.infrastructure.llm.rag_agent.QuizReviewerImpl.areview",
+            return_value=[],
+        )
+        questions = list(sample_quiz.questions)
+        invalid = questions[0].model_copy(update={"answer": "E"})
+        rag_agent.batch_chain = mocker.MagicMock()
+        rag_agent.batch_chain.ainvoke = mocker.AsyncMock(
+            side_effect=[
+                QuestionBatch(questions=[invalid, questions[1], questions[2]]),
+                QuestionBatch(questions=[invalid]),
+            ]
+        )
+
+        # Act
+        result = asyncio.run(
+            rag_agent.ainvoke_validated_chain(
+                question_count=3, difficulty="intermediate", max_retries=1
+            )
+        )
+
+        # Assert
+        assert len(result.questions) == 3
+        assert rag_agent.batch_chain.ainvoke.await_count == 2
+
+    def test_validated_chain_fills_missing_questions(
+        self, llm, mock_prompt, mock_retriever, sample_quiz, mocker
+    ):
+        """最初の生成がクイズの最小問題数に満たない場合も、不足分を生成し直すことをテスト"""
+        # Arrange
+        rag_agent = RAGAgentModelImpl(
+            llm=llm, prompt=mock_prompt, retriever=mock_retriever
+        )
+        mocker.patch(
+            "src.infrastructure.llm.rag_agent.QuizReviewerImpl.areview",
+            return_value=[],
+        )
+        questions = list(sample_quiz.questions)
+        rag_agent.batch_chain = mocker.MagicMock()
+        rag_agent.batch_chain.ainvoke = mocker.AsyncMock(
+            side_effect=[
+                QuestionBatch(questions=questions[:2]),
+                QuestionBatch(questions=[questions[2]]),
+            ]
+        )
+
+        # Act
+        result = asyncio.run(
+            rag_agent.ainvoke_validated_chain(
+                question_count=3, difficulty="intermediate", max_retries=1
+            )
+        )
+
+        # Assert
+        assert result.questions == questions
+        retry_input = rag_agent.batch_chain.ainvoke.call_args.args[0]
+        assert retry_input["question_count"] == 1
+
+    def test_validated_chain_raises_when_questions_are_missing(
+        self, llm, mock_prompt, mock_retriever, sample_quiz, mocker
+    ):
+        """再生成の上限に達しても問題数が足りない場合、解析エラーを送出することをテスト"""
+        # Arrange
+        rag_agent = RAGAgentModelImpl(
+            llm=llm, prompt=mock_prompt, retriever=mock_retriever
+        )
+        mocker.patch(
+            "src.infrastructure.llm.rag_agent.QuizReviewerImpl.areview",
+            return_value=[],
+        )
+        rag_agent.batch_chain = mocker.MagicMock()
+        rag_agent.batch_chain.ainvoke = mocker.AsyncMock(
+            return_value=QuestionBatch(questions=[sample_quiz.questions[0]])
+        )
+
+        # Act & Assert
+        with pytest.raises(LLMResponseParsingError) as exc_info:
+            asyncio.run(
+                rag_agent.ainvoke_validated_chain(
+                    question_count=3, difficulty="intermediate", max_retries=1
+                )
+            )
+
+        assert "of 3 questions were generated" in str(exc_info.value)
+
+    @pytest.mark.parametrize(
+        "output",
+        [
+            '{"questions": [QUESTION]}',
+            '{"quiz": {"questions": [QUESTION]}}',
+            '{"quiz": [QUESTION]}',
+        ],
+    )
+    def test_parse_questions(self, sample_quiz, output):
+        """エージェントの出力からQuestionのリストを解析できることをテスト"""
+        question = sample_quiz.questions[0]
+        output = output.replace("QUESTION", question.model_dump_json())
+
+        assert RAGAgentModelImpl._parse_questions(output) == [question]
+
+    def test_parse_questions_invalid_output(self):
+        """クイズとして解釈できない出力ではNoneを返すことをテスト"""
+        assert RAGAgentModelImpl._parse_questions("The quiz is below.") is None
+        assert RAGAgentModelImpl._parse_questions('{"questions": [{}]}') is None
+
+    def test_evaluate_agent_checks_locally(self, llm, sample_quiz, mocker):
+        """構造的な問題がないクイズは、LLMを呼び出さずに評価することをテスト"""
+        # Arrange
+        review_output = mocker.patch(
+            "src.infrastructure.llm.rag_agent.QuizReviewerImpl.areview_output"
+        )
+        review = mocker.patch(
+            "src.infrastructure.llm.rag_agent.QuizReviewerImpl.areview"
+        )
+        evaluate_agent = RAGAgentModelImpl._create_evaluate_agent(llm)
+        quiz = Quiz(
+            questions=[
+                q.model_copy(update={"explanation": "A is correct."})
+                for q in sample_quiz.questions
+            ]
+        )
+        output = AIMessage(content=quiz.model_dump_json(), name="rag_quiz_agent")
+
+        # Act
+        result = asyncio.run(
+            evaluate_agent.ainvoke(
+                {"messages": [output]},
+                config={"configurable": {"question_count": 4}},
+            )
+        )
+
+        # Assert
+        feedback = result["messages"][-1]
+        assert feedback.name == "evaluate_agent"
+        assert "3 questions, but 4 were requested" in feedback.content
+        review_output.assert_not_called()
+        review.assert_not_called()
+
+    def test_split_context(self):
+        """検索結果を分割し、問題数を均等に割り当てることをテスト"""
+        documents = [Document(page_content=f"chunk {i}") for i in range(5)]
+
+        slices = RAGAgentModelImpl._split_context(documents, question_count=7)
+
+        assert [count for _, count in slices] == [2, 2, 1, 1, 1]
+        assert [doc for context, _ in slices for doc in context] == documents
+
+    def test_split_context_with_fewer_questions(self):
+        """問題数が検索結果より少ない場合、問題数と同じ数に分割することをテスト"""
+        documents = [Document(page_content=f"chunk {i}") for i in range(8)]
+
+        slices = RAGAgentModelImpl._split_context(documents, question_count=3)
+
+        assert [len(context) for context, _ in slices] == [2, 3, 3]
+        assert [count for _, count in slices] == [1, 1, 1]
+
+    def test_parallel_chain_merges_slices(
+        self, llm, mock_prompt, mock_retriever, sample_quiz, mocker
+    ):
+        """分割ごとに並列に生成した問題を、重複を除いてまとめることをテスト"""
+        # Arrange
+        rag_agent = RAGAgentModelImpl(
+            llm=llm, prompt=mock_prompt, retriever=mock_retriever
+        )
+        mocker.patch(
+            "src.infrastructure.llm.rag_agent.QuizReviewerImpl.areview",
+            return_value=[],
+        )
+        questions = list(sample_quiz.questions)
+        documents = [Document(page_content=f"chunk {i}") for i in range(3)]
+        rag_agent.retriever = mocker.MagicMock()
+        rag_agent.retriever.ainvoke = mocker.AsyncMock(return_value=documents)
+        rag_agent.slice_chain = mocker.MagicMock()
+        rag_agent.slice_chain.abatch = mocker.AsyncMock(
+            return_value=[
+                QuestionBatch(questions=[questions[0]]),
+                QuestionBatch(questions=[questions[1], questions[0]]),
+                QuestionBatch(questions=[questions[2]]),
+            ]
+        )
+
+        # Act
+        result = asyncio.run(
+            rag_agent.ainvoke_parallel_chain(
+                question_count=3,
+                difficulty="advanced",
+                max_retries=1,
+                max_concurrency=2,
+            )
+        )
+
+        # Assert
+        assert result.questions == questions
+        batch_inputs = rag_agent.slice_chain.abatch.call_args.args[0]
+        assert [i["context"] for i in batch_inputs] == [[d] for d in documents]
+        config = rag_agent.slice_chain.abatch.call_args.kwargs["config"]
+        assert config["max_concurrency"] == 2
+
+    def test_parallel_chain_regenerates_failed_slices(
+        self, llm, mock_prompt, mock_retriever, sample_quiz, mocker
+    ):
+        """生成に失敗した分割の問題を、再生成で補うことをテスト"""
+        # Arrange
+        rag_agent = RAGAgentModelImpl(
+            llm=llm, prompt=mock_prompt, retriever=mock_retriever
+        )
+        mocker.patch(
+            "src.infrastructure.llm.rag_agent.QuizReviewerImpl.areview",
+            return_value=[],
+        )
+        questions = list(sample_quiz.questions)
+        rag_agent.retriever = mocker.MagicMock()
+        rag_agent.retriever.ainvoke = mocker.AsyncMock(
+            return_value=[Document(page_content=f"chunk {i}") for i in range(3)]
+        )
+        rag_agent.slice_chain = mocker.MagicMock()
+        rag_agent.slice_chain.abatch = mocker.AsyncMock(
+            return_value=[
+                QuestionBatch(questions=[questions[0]]),
+                Exception("rate limited"),
+                QuestionBatch(questions=[questions[2]]),
+            ]
+        )
+        rag_agent.batch_chain = mocker.MagicMock()
+        rag_agent.batch_chain.ainvoke = mocker.AsyncMock(
+            return_value=QuestionBatch(questions=[questions[1]])
+        )
+
+        # Act
+        result = asyncio.run(
+            rag_agent.ainvoke_parallel_chain(
+                question_count=3,
+                difficulty="advanced",
+                max_retries=1,
+                max_concurrency=2,
+            )
+        )
+
+        # Assert
+        assert result.questions == [questions[0], questions[2], questions[1]]
+        assert rag_agent.batch_chain.ainvoke.call_args.args[0]["question_count"] == 1
+
+
+class TestOutsideGraph:
+    def test_notify_retrieved_without_callback(self):
+        """グラフ外でコールバックがない場合も、検索結果をそのまま返すことをテスト"""
+        documents = [Document(page_content="読書メモ")]
+
+        assert _notify_retrieved(documents, {}) == documents
+
+    def test_ainvoke_chain_without_on_event(self, mocker):
+        """グラフ外でon_eventを渡さずにChainを実行できることをテスト"""
+        # Arrange
+        options = QuizOption(A="Option A", B="Option B", C="Option C", D="Option D")
+        quiz = Quiz(
+            questions=[
+                Question(
+                    question=f"Test question {i}",
+                    options=options,
+                    answer="A",
+                    explanation=f"Test explanation {i}",
+                )
+                for i in range(1, 4)
+            ]
+        )
+        llm = FakeListChatModel(responses=[])
+        mocker.patch.object(
+            FakeListChatModel,
+            "with_structured_output",
+            return_value=RunnableLambda(lambda _: quiz),
+        )
+        rag_agent = RAGAgentModelImpl(
+            llm=llm,
+            prompt=RunnableLambda(lambda inputs: inputs),
+            retriever=RunnableLambda(lambda _: [Document(page_content="読書メモ")]),
+        )
+
+        # Act
+        result = asyncio.run(
+            rag_agent.ainvoke_chain(question_count=3, difficulty="intermediate")
+        )
+
+        # Assert
+        assert result == quiz
@@ -0,0 +1,56 @@
+import pytest
+
+from langchain_text_splitters import CharacterTextSplitter
+
+from src.infrastructure.llm.text_splitter import (
+    choose_chunk_tokens,
+    create_text_splitter,
+)
+from config.settings import settings
+
+
+class TestTextSplitter:
+    @pytest.fixture(autouse=True)
+    def estimate_tokens(self, mocker):
+        """トークナイザーを使わず、1文字を1トークンとして数えるフィクスチャ"""
+        mocker.patch(
+            "src.infrastructure.llm.text_splitter.count_tokens", side_effect=len
+        )
+
+    def test_splits_by_tokens_at_sentence_end(self):
+        """トークン数の上限に収まるよう、文末で区切ることをテスト"""
+        splitter = create_text_splitter(chunk_tokens=20)
+        text = "これは一文目です。" * 3 + "これは二文目です。" * 3
+
+        chunks = splitter.split_text(text)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 20 for chunk in chunks)
+        assert all(chunk.endswith("。") for chunk in chunks)
+
+    def test_character_splitter_when_disabled(self, mocker):
+        """TOKEN_CHUNKINGが無効な場合は文字数で区切るスプリッターを返すことをテスト"""
+        mocker.patch.object(type(settings.text_splitter), "TOKEN_CHUNKING", False)
+
+        assert isinstance(create_text_splitter(), CharacterTextSplitter)
+
+    @pytest.mark.parametrize(
+        "total_tokens, question_count, expected",
+        [
+            # 長いドキュメントは、検索結果がコンテキストの上限に収まる大きさになる
+            (100000, 3, 384),
+            # 問題数が多いほど細かく区切る
+            (3000, 3, 384),
+            (3000, 6, 256),
+            # 短いドキュメントでも下限より小さくしない
+            (1000, 10, 256),
+        ],
+    )
+    def test_choose_chunk_tokens(self, mocker, total_tokens, question_count, expected):
+        """ドキュメントの長さと問題数からチャンクの大きさを決めることをテスト"""
+        mocker.patch.object(type(settings.embeddings), "CONTEXT_MAX_TOKENS", 4000)
+        mocker.patch.object(type(settings.embeddings), "SEARCH_KWARGS", 8)
+        mocker.patch.object(type(settings.text_splitter), "CHUNK_MIN_TOKENS", 256)
+        mocker.patch.object(type(settings.text_splitter), "CHUNK_MAX_TOKENS", 1024)
+
+        assert choose_chunk_tokens(total_tokens, question_count) == expected
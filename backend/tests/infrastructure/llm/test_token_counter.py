@@ -0,0 +1,33 @@
+from langchain_core.documents import Document
+
+from src.infrastructure.llm.token_counter import (
+    count_document_tokens,
+    count_tokens,
+    estimate_tokens,
+)
+
+
+class TestTokenCounter:
+    def test_estimate_tokens(self):
+        """英数字は約4文字、日本語は1文字ごとに1トークンとして概算することをテスト"""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("読書メモ") == 4
+        assert estimate_tokens("abcd読書") == 3
+
+    def test_count_tokens_falls_back_to_estimate(self, mocker):
+        """トークナイザーを取得できない場合は概算値を返すことをテスト"""
+        mocker.patch(
+            "src.infrastructure.llm.token_counter._get_encoding", return_value=None
+        )
+
+        assert count_tokens("読書メモ abcd") == estimate_tokens("読書メモ abcd")
+
+    def test_count_document_tokens(self, mocker):
+        """ドキュメントの本文の合計トークン数を返すことをテスト"""
+        mocker.patch(
+            "src.infrastructure.llm.token_counter._get_encoding", return_value=None
+        )
+        documents = [Document(page_content="abcd"), Document(page_content="読書")]
+
+        assert count_document_tokens(documents) == 3
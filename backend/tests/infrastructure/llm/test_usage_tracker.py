@@ -0,0 +1,117 @@
+import asyncio
+from uuid import uuid4
+
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import LLMResult
+
+from src.infrastructure.llm.usage_tracker import (
+    DEFAULT_ROLE,
+    UsageCallbackHandler,
+    record_embedding_usage,
+    resolve_role,
+    track_usage,
+)
+
+
+def _fake_llm(count: int = 1) -> FakeMessagesListChatModel:
+    message = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": 100,
+            "output_tokens": 20,
+            "total_tokens": 120,
+            "input_token_details": {"cache_read": 30},
+        },
+    )
+    return FakeMessagesListChatModel(responses=[message] * count)
+
+
+class TestUsageTracker:
+    def test_resolve_role(self):
+        """グラフ内ではノード名、グラフ外ではllm_roleを役割とすることをテスト"""
+        assert resolve_role({"langgraph_checkpoint_ns": "supervisor:1"}) == "supervisor"
+        assert (
+            resolve_role({"langgraph_checkpoint_ns": "rag_quiz_agent:1|tools:2"})
+            == "rag_quiz_agent/tools"
+        )
+        assert resolve_role({"llm_role": "reviewer"}) == "reviewer"
+        assert resolve_role(None) == DEFAULT_ROLE
+
+    def test_track_usage_counts_llm_calls(self):
+        """ブロック内のLLMの呼び出し回数とトークン数を役割ごとに集計することをテスト"""
+        llm = _fake_llm(3)
+
+        async def run():
+            with track_usage() as usage:
+                await llm.ainvoke("hello")
+                await llm.with_config(metadata={"llm_role": "reviewer"}).ainvoke("hi")
+                llm.invoke("hello")
+            return usage.report()
+
+        report = asyncio.run(run())
+
+        assert report.roles[DEFAULT_ROLE].calls == 2
+        assert report.roles[DEFAULT_ROLE].prompt_tokens == 200
+        assert report.roles[DEFAULT_ROLE].completion_tokens == 40
+        assert report.roles[DEFAULT_ROLE].cached_tokens == 60
+        assert report.roles["reviewer"].calls == 1
+        assert report.llm_calls == 3
+        assert report.total_tokens == 360
+
+    def test_track_usage_is_scoped(self):
+        """ブロックの外の呼び出しは集計せず、入れ子の場合は同じ集計先を使うことをテスト"""
+        llm = _fake_llm(2)
+
+        with track_usage() as outer:
+            with track_usage() as inner:
+                llm.invoke("hello")
+        llm.invoke("hello")
+
+        assert inner is outer
+        assert outer.report().llm_calls == 1
+
+    def test_record_embedding_usage(self):
+        """集計中のリクエストにのみ埋め込みの使用量を加算することをテスト"""
+        record_embedding_usage(1, 100)
+
+        with track_usage() as usage:
+            record_embedding_usage(2, 300)
+
+        report = usage.report()
+        assert report.embedding_calls == 2
+        assert report.embedding_tokens == 300
+
+    def test_token_usage_from_llm_output(self):
+        """usage_metadataがない場合はllm_outputのトークン数を使うことをテスト"""
+        handler = UsageCallbackHandler()
+        run_id = uuid4()
+
+        handler.on_llm_start({}, ["hello"], run_id=run_id)
+        handler.on_llm_end(
+            LLMResult(
+                generations=[[]],
+                llm_output={
+                    "token_usage": {
+                        "prompt_tokens": 50,
+                        "completion_tokens": 5,
+                        "prompt_tokens_details": {"cached_tokens": 10},
+                    }
+                },
+            ),
+            run_id=run_id,
+        )
+
+        usage = handler.report().roles[DEFAULT_ROLE]
+        assert (usage.calls, usage.prompt_tokens, usage.completion_tokens) == (1, 50, 5)
+        assert usage.cached_tokens == 10
+
+    def test_llm_error(self):
+        """失敗したLLMの呼び出しを役割ごとに数えることをテスト"""
+        handler = UsageCallbackHandler()
+        run_id = uuid4()
+
+        handler.on_llm_start({}, ["hello"], run_id=run_id, metadata={"llm_role": "x"})
+        handler.on_llm_error(RuntimeError("failed"), run_id=run_id)
+
+        assert handler.report().roles["x"].errors == 1
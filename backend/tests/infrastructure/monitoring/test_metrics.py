@@ -0,0 +1,89 @@
+import pytest
+
+from src.infrastructure.monitoring.metrics import (
+    QUIZ_STAGE_DURATION,
+    Counter,
+    Histogram,
+    Metric,
+    MetricsRegistry,
+    bind_difficulty,
+    track_stage,
+)
+
+
+class TestMetrics:
+    def test_counter_render(self):
+        """カウンターをラベルごとにPrometheusのテキスト形式で出力することをテスト"""
+        counter = Counter(
+            name="test_requests_total",
+            documentation="Test requests.",
+            label_names=("outcome",),
+        )
+        counter.inc(outcome="success")
+        counter.inc(2, outcome="success")
+        counter.inc(outcome="error")
+
+        lines = counter.render()
+
+        assert lines[:2] == [
+            "# HELP test_requests_total Test requests.",
+            "# TYPE test_requests_total counter",
+        ]
+        assert 'test_requests_total{outcome="error"} 1.0' in lines
+        assert 'test_requests_total{outcome="success"} 3.0' in lines
+
+    def test_histogram_render(self):
+        """ヒストグラムのバケットを累積値で出力し、合計と件数を出力することをテスト"""
+        histogram = Histogram(
+            name="test_duration_seconds",
+            documentation="Test duration.",
+            label_names=("stage",),
+            buckets=(0.1, 1.0),
+        )
+        histogram.observe(0.05, stage="load")
+        histogram.observe(0.5, stage="load")
+        histogram.observe(5.0, stage="load")
+
+        lines = histogram.render()
+
+        assert 'test_duration_seconds_bucket{stage="load",le="0.1"} 1' in lines
+        assert 'test_duration_seconds_bucket{stage="load",le="1.0"} 2' in lines
+        assert 'test_duration_seconds_bucket{stage="load",le="+Inf"} 3' in lines
+        assert 'test_duration_seconds_sum{stage="load"} 5.55' in lines
+        assert 'test_duration_seconds_count{stage="load"} 3' in lines
+
+    def test_labels_must_match(self):
+        """定義と異なるラベルで記録した場合はValueErrorを送出することをテスト"""
+        counter = Counter(name="test_total", documentation="Test.", label_names=("a",))
+
+        with pytest.raises(ValueError):
+            counter.inc(b="x")
+
+    def test_metric_is_abstract(self):
+        """出力形式を持たない基底クラスは生成できないことをテスト"""
+        with pytest.raises(TypeError):
+            Metric(name="test_total", documentation="Test.")
+
+    def test_registry_rejects_duplicates(self):
+        """同じ名前のメトリクスを重複して登録できないことをテスト"""
+        registry = MetricsRegistry()
+        registry.register(Counter(name="test_total", documentation="Test."))
+
+        with pytest.raises(ValueError):
+            registry.register(Counter(name="test_total", documentation="Test."))
+
+    def test_track_stage(self):
+        """段階の処理時間を成否と難易度のラベル付きで記録することをテスト"""
+        labels = {"stage": "test_stage", "difficulty": "beginner"}
+        success = QUIZ_STAGE_DURATION.get_count(outcome="success", **labels)
+        error = QUIZ_STAGE_DURATION.get_count(outcome="error", **labels)
+
+        with bind_difficulty("beginner"):
+            with track_stage("test_stage"):
+                pass
+            with pytest.raises(RuntimeError):
+                with track_stage("test_stage"):
+                    raise RuntimeError("failed")
+
+        assert QUIZ_STAGE_DURATION.get_count(outcome="success", **labels) == success + 1
+        assert QUIZ_STAGE_DURATION.get_count(outcome="error", **labels) == error + 1
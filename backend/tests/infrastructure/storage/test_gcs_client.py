@@ -1,8 +1,14 @@
 import json
 import pytest
 
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from google.cloud import storage
 
+from src.infrastructure.monitoring.metrics import (
+    STORAGE_DURATION,
+    STORAGE_GET_RESULT,
+    STORAGE_SAVE_QUIZ,
+)
 from src.infrastructure.storage.gcs_client import GCSClient
 from config.settings import settings
 
@@ -118,6 +124,21 @@ class TestGCSClient:
         upload_data = mock_blob.upload_from_string.call_args[0][0]
         assert json.loads(upload_data) == sample_user_answer
         assert result == expected_blob_name
+        # 保存済みの回答を上書きしないよう、存在しない場合のみ作成する
+        assert mock_blob.upload_from_string.call_args.kwargs["if_generation_match"] == 0
+
+    def test_save_quiz_keeps_existing(
+        self, mock_storage_client, mock_bucket, mock_blob, sample_user_answer
+    ):
+        """保存済みのクイズIDに保存した場合、上書きせずに保存先を返すことをテスト"""
+        mock_storage_client.get_bucket.return_value = mock_bucket
+        mock_bucket.blob.return_value = mock_blob
+        mock_blob.upload_from_string.side_effect = PreconditionFailed("exists")
+
+        gcs_client = GCSClient()
+        result = gcs_client.save_quiz("test-quiz-id", sample_user_answer)
+
+        assert result == f"{gcs_client.prefix}test-quiz-id.json"
 
     def test_save_quiz_failure(self, mock_storage_client, mock_bucket, mock_blob):
         """保存時にエラーが発生した場合の挙動をテスト"""
@@ -143,7 +164,6 @@ class TestGCSClient:
         # Arrange
         mock_storage_client.get_bucket.return_value = mock_bucket
         mock_bucket.blob.return_value = mock_blob
-        mock_blob.exists.return_value = True
 
         # JSONデータをモック
         mock_blob.download_as_text.return_value = json.dumps(sample_user_answer)
@@ -157,7 +177,8 @@ class TestGCSClient:
         # Assert
         expected_blob_name = f"{gcs_client.prefix}{quiz_id}.json"
         mock_bucket.blob.assert_called_once_with(expected_blob_name)
-        mock_blob.exists.assert_called_once()
+        # 存在確認を挟まず、1回の通信で取得する
+        mock_blob.exists.assert_not_called()
         mock_blob.download_as_text.assert_called_once()
         assert result == sample_user_answer
 
@@ -166,7 +187,7 @@ class TestGCSClient:
         # Arrange
         mock_storage_client.get_bucket.return_value = mock_bucket
         mock_bucket.blob.return_value = mock_blob
-        mock_blob.exists.return_value = False
+        mock_blob.download_as_text.side_effect = NotFound("No such object")
 
         gcs_client = GCSClient()
         quiz_id = "nonexistent-quiz-id"
@@ -175,7 +196,7 @@ class TestGCSClient:
         result = gcs_client.get_result(quiz_id)
 
         # Assert
-        mock_blob.download_as_text.assert_not_called()
+        mock_blob.download_as_text.assert_called_once()
         assert result is None
 
     def test_get_result_failure(self, mock_storage_client, mock_bucket, mock_blob):
@@ -183,7 +204,6 @@ class TestGCSClient:
         # Arrange
         mock_storage_client.get_bucket.return_value = mock_bucket
         mock_bucket.blob.return_value = mock_blob
-        mock_blob.exists.return_value = True
         mock_blob.download_as_text.side_effect = Exception("Download failed")
 
         gcs_client = GCSClient()
@@ -194,3 +214,39 @@ class TestGCSClient:
             gcs_client.get_result(quiz_id)
 
         assert "Download failed" in str(exc_info.value)
+
+    def test_close(self, mock_storage_client, mock_bucket):
+        """終了時にCloud Storageクライアントの接続を閉じることをテスト"""
+        mock_storage_client.get_bucket.return_value = mock_bucket
+        gcs_client = GCSClient()
+
+        gcs_client.close()
+
+        mock_storage_client.close.assert_called_once()
+
+    def test_records_shared_operation_names(
+        self, mock_storage_client, mock_bucket, mock_blob, sample_user_answer
+    ):
+        """SQLiteと共通の操作名で処理時間を記録し、未保存の取得も成功とすることをテスト"""
+        mock_storage_client.get_bucket.return_value = mock_bucket
+        mock_bucket.blob.return_value = mock_blob
+        mock_blob.download_as_text.side_effect = NotFound("No such object")
+        saved = STORAGE_DURATION.get_count(
+            operation=STORAGE_SAVE_QUIZ, outcome="success"
+        )
+        got = STORAGE_DURATION.get_count(
+            operation=STORAGE_GET_RESULT, outcome="success"
+        )
+
+        gcs_client = GCSClient()
+        gcs_client.save_quiz("test-quiz-id", sample_user_answer)
+        gcs_client.get_result("missing-id")
+
+        assert (
+            STORAGE_DURATION.get_count(operation=STORAGE_SAVE_QUIZ, outcome="success")
+            == saved + 1
+        )
+        assert (
+            STORAGE_DURATION.get_count(operation=STORAGE_GET_RESULT, outcome="success")
+            == got + 1
+        )
@@ -0,0 +1,155 @@
+import sqlite3
+
+import pytest
+
+from src.infrastructure.monitoring.metrics import (
+    STORAGE_DURATION,
+    STORAGE_GET_RESULT,
+    STORAGE_SAVE_QUIZ,
+)
+from src.infrastructure.storage.gcs_client import GCSClient
+from src.infrastructure.storage.sqlite_storage import SQLiteStorageClient
+from src.infrastructure.storage.storage_provider import create_storage_client
+
+from config.settings import settings
+
+
+class TestSQLiteStorageClient:
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return str(tmp_path / "results" / "results.sqlite3")
+
+    @pytest.fixture
+    def sample_user_answer(self):
+        """テスト用のUserAnswerデータを作成するフィクスチャ"""
+        return {
+            "id": "test-quiz-id",
+            "preview": {
+                "questions": [
+                    {
+                        "content": "テスト質問1",
+                        "options": {
+                            "A": "選択肢A",
+                            "B": "選択肢B",
+                            "C": "選択肢C",
+                            "D": "選択肢D",
+                        },
+                        "answer": "A",
+                        "explanation": "テスト解説1",
+                    }
+                ]
+            },
+            "selectedOptions": ["A"],
+            "difficultyValue": "intermediate",
+        }
+
+    def test_save_and_get_result(self, db_path, sample_user_answer):
+        """保存した回答をGCSClientと同じキーで取得できることをテスト"""
+        client = SQLiteStorageClient(path=db_path, prefix="test/results/")
+
+        key = client.save_quiz("test-quiz-id", sample_user_answer)
+
+        assert key == "test/results/test-quiz-id.json"
+        assert client.get_result("test-quiz-id") == sample_user_answer
+
+    def test_get_result_not_found(self, db_path):
+        """存在しない回答はNoneを返すことをテスト"""
+        client = SQLiteStorageClient(path=db_path, prefix="test/results/")
+
+        assert client.get_result("missing-id") is None
+
+    def test_save_keeps_first_submission(self, db_path, sample_user_answer):
+        """同じIDで保存した場合は上書きせず、最初の回答を残すことをテスト"""
+        client = SQLiteStorageClient(path=db_path, prefix="test/results/")
+        client.save_quiz("test-quiz-id", sample_user_answer)
+
+        updated = {**sample_user_answer, "selectedOptions": ["B"]}
+        key = client.save_quiz("test-quiz-id", updated)
+
+        assert key == "test/results/test-quiz-id.json"
+        assert client.get_result("test-quiz-id")["selectedOptions"] == ["A"]
+
+    def test_persists_across_instances(self, db_path, sample_user_answer):
+        """別のインスタンスからも保存した回答を取得できることをテスト"""
+        SQLiteStorageClient(path=db_path, prefix="test/results/").save_quiz(
+            "test-quiz-id", sample_user_answer
+        )
+
+        client = SQLiteStorageClient(path=db_path, prefix="test/results/")
+
+        assert client.get_result("test-quiz-id") == sample_user_answer
+
+    def test_prefix_isolation(self, db_path, sample_user_answer):
+        """接頭辞（環境）が異なる回答は取得できないことをテスト"""
+        SQLiteStorageClient(path=db_path, prefix="dev/results/").save_quiz(
+            "test-quiz-id", sample_user_answer
+        )
+
+        client = SQLiteStorageClient(path=db_path, prefix="prd/results/")
+
+        assert client.get_result("test-quiz-id") is None
+
+    def test_records_shared_operation_names(self, db_path, sample_user_answer):
+        """GCSClientと共通の操作名で処理時間を記録することをテスト"""
+        saved = STORAGE_DURATION.get_count(
+            operation=STORAGE_SAVE_QUIZ, outcome="success"
+        )
+        got = STORAGE_DURATION.get_count(
+            operation=STORAGE_GET_RESULT, outcome="success"
+        )
+        client = SQLiteStorageClient(path=db_path, prefix="test/results/")
+
+        client.save_quiz("test-quiz-id", sample_user_answer)
+        client.get_result("missing-id")
+
+        assert (
+            STORAGE_DURATION.get_count(operation=STORAGE_SAVE_QUIZ, outcome="success")
+            == saved + 1
+        )
+        assert (
+            STORAGE_DURATION.get_count(operation=STORAGE_GET_RESULT, outcome="success")
+            == got + 1
+        )
+
+    def test_close(self, db_path):
+        """閉じた後は接続を使えないことをテスト"""
+        client = SQLiteStorageClient(path=db_path, prefix="test/results/")
+
+        client.close()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            client.get_result("test-quiz-id")
+
+
+class TestCreateStorageClient:
+    def test_sqlite_backend(self, mocker, tmp_path):
+        """sqliteを指定した場合はSQLiteStorageClientを返すことをテスト"""
+        db_path = str(tmp_path / "results.sqlite3")
+        mocker.patch.object(type(settings.storage), "STORAGE_BACKEND", "sqlite")
+        mocker.patch.object(type(settings.storage), "STORAGE_DB_PATH", db_path)
+
+        client = create_storage_client()
+
+        assert isinstance(client, SQLiteStorageClient)
+        assert client.path == db_path
+        assert client.prefix == f"{settings.app.ENV}/results/"
+
+    def test_gcs_backend(self, mocker):
+        """gcsを指定した場合はGCSClientを返すことをテスト"""
+        mocker.patch.object(type(settings.storage), "STORAGE_BACKEND", "gcs")
+        mock_gcs = mocker.patch(
+            "src.infrastructure.storage.storage_provider.GCSClient",
+            return_value=mocker.MagicMock(spec=GCSClient),
+        )
+
+        client = create_storage_client()
+
+        mock_gcs.assert_called_once()
+        assert client is mock_gcs.return_value
+
+    def test_unknown_backend(self, mocker):
+        """未知の保存先を指定した場合はValueErrorを送出することをテスト"""
+        mocker.patch.object(type(settings.storage), "STORAGE_BACKEND", "s3")
+
+        with pytest.raises(ValueError):
+            create_storage_client()
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.domain.repositories.storage_repository import StorageService
+from src.infrastructure.client_registry import ClientRegistry
+from src.infrastructure.llm.hashing_embeddings import HashingEmbeddings
+
+
+class TestClientRegistry:
+    @pytest.fixture
+    def storage(self, mocker):
+        return mocker.MagicMock(spec=StorageService)
+
+    def test_aclose_without_http_clients(self, storage):
+        """HTTPクライアントを持たないモデルでも、ストレージの接続を閉じることをテスト"""
+        registry = ClientRegistry(
+            llm=FakeListChatModel(responses=["ok"]),
+            embeddings=HashingEmbeddings(),
+            storage_client=storage,
+        )
+
+        asyncio.run(registry.aclose())
+
+        storage.close.assert_called_once()
+
+    def test_aclose_ignores_errors(self, storage):
+        """接続を閉じる際のエラーで終了処理を中断しないことをテスト"""
+        storage.close.side_effect = RuntimeError("already closed")
+        registry = ClientRegistry(
+            llm=FakeListChatModel(responses=["ok"]),
+            embeddings=HashingEmbeddings(),
+            storage_client=storage,
+        )
+
+        asyncio.run(registry.aclose())
+
+        storage.close.assert_called_once()
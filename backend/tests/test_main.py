@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+import main
+from src.api.dependencies import get_quiz_creator, get_storage_client
+from src.infrastructure import client_registry as client_registry_module
+from src.infrastructure.storage.sqlite_storage import SQLiteStorageClient
+
+from config.settings import settings
+
+
+def make_answer(quiz_id: str) -> dict:
+    """テスト用の回答を作成する"""
+    return {
+        "id": quiz_id,
+        "preview": {
+            "questions": [
+                {
+                    "question": f"テスト質問{i}",
+                    "options": {"A": "A", "B": "B", "C": "C", "D": "D"},
+                    "answer": "A",
+                    "explanation": f"テスト解説{i}",
+                }
+                for i in range(3)
+            ]
+        },
+        "selectedOptions": ["A", "A", "A"],
+        "difficultyValue": "beginner",
+    }
+
+
+class TestLifespan:
+    @pytest.fixture
+    def create_registry(self, mocker, monkeypatch, tmp_path):
+        """外部サービスに接続しない設定で、共有クライアントの生成を記録するフィクスチャ"""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        mocker.patch.object(type(settings.model), "GPT_MODEL", "gpt-4o-mini")
+        mocker.patch.object(type(settings.model), "EMBEDDINGS_PROVIDER", "openai")
+        mocker.patch.object(
+            type(settings.model), "TEXT_EMBEDDINGS_MODEL", "text-embedding-3-small"
+        )
+        mocker.patch.object(type(settings.storage), "STORAGE_BACKEND", "sqlite")
+        mocker.patch.object(
+            type(settings.storage), "STORAGE_DB_PATH", str(tmp_path / "results.db")
+        )
+        mocker.patch.object(type(settings.storage), "RESULT_CACHE_ENABLED", False)
+        mocker.patch.object(type(settings.job), "JOB_STORE", "memory")
+        mocker.patch("main.get_system_prompt_cache")
+
+        return mocker.patch(
+            "main.create_client_registry",
+            side_effect=client_registry_module.create_client_registry,
+        )
+
+    def test_clients_created_once_and_shared(self, mocker, create_registry):
+        """共有クライアントは起動時に一度だけ生成され、全リクエストで使われることをテスト"""
+        create_storage = mocker.spy(client_registry_module, "create_storage_client")
+
+        with TestClient(main.app) as client:
+            registry = client.app.state.client_registry
+            registry.storage_client.save_quiz("quiz-1", make_answer("quiz-1"))
+            get_result = mocker.spy(SQLiteStorageClient, "get_result")
+
+            first = client.get("/api/v1/result/quiz-1")
+            second = client.get("/api/v1/result/quiz-1")
+
+            assert first.status_code == second.status_code == 200
+            assert get_result.call_count == 2
+            assert get_storage_client(registry) is registry.storage_client
+            assert get_quiz_creator(registry).llm is registry.llm
+
+        create_registry.assert_called_once()
+        create_storage.assert_called_once()
+
+    def test_clients_closed_on_shutdown(self, create_registry):
+        """終了時に共有クライアントの接続が閉じられることをテスト"""
+        with TestClient(main.app) as client:
+            registry = client.app.state.client_registry
+            assert registry.llm.root_client._client is registry.http_client
+            assert registry.embeddings.client._client._client is registry.http_client
+            assert not registry.http_client.is_closed
+
+        assert registry.http_client.is_closed
+        assert registry.http_async_client.is_closed
+        with pytest.raises(sqlite3.ProgrammingError):
+            registry.storage_client.get_result("quiz-1")
+
+    def test_new_clients_for_each_app_start(self, create_registry):
+        """アプリケーションを起動し直すたびにクライアントを生成し直すことをテスト"""
+        with TestClient(main.app) as client:
+            first = client.app.state.client_registry
+        with TestClient(main.app) as client:
+            second = client.app.state.client_registry
+
+        assert create_registry.call_count == 2
+        assert first is not second